@@ -0,0 +1,250 @@
+"""
+Benchmarks de escalabilidad de las HU
+Genera datasets de varios tamaños con generar_dataset (semilla fija, modo
+vectorizado), mide el tiempo y la memoria pico de la función central de cada
+análisis y guarda los resultados en JSON. Si se indica una línea base, marca
+como regresión todo lo que sea más lento o use más memoria que ella por
+encima de la tolerancia.
+
+Uso:
+    python benchmarks/benchmark_hu.py --tamanos 10k,100k,1M
+    python benchmarks/benchmark_hu.py --tamanos 10k,100k --guardar-baseline
+    python benchmarks/benchmark_hu.py --tamanos 10k,100k --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'scripts'))
+
+from carga_datos import cargar_notas, COLUMNA_PROMEDIO, importar_script  # noqa: E402
+
+# --- Constantes y Configuración ---
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_DATOS = os.path.join(DIRECTORIO, 'datos')
+SALIDA = os.path.join(DIRECTORIO, 'resultados.json')
+BASELINE = os.path.join(DIRECTORIO, 'baseline.json')
+TAMANOS = '10k,100k,1M'
+SEMILLA = 42
+REPETICIONES = 3
+TOLERANCIA = 0.25
+# 7 asignaturas x 3 periodos por estudiante
+FILAS_POR_ESTUDIANTE = 21
+
+
+def _cargar_generador():
+    """Importa data/generador-data.py (el nombre tiene guion)"""
+    ruta = os.path.join(RAIZ, 'data', 'generador-data.py')
+    spec = importlib.util.spec_from_file_location('generador_data', ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def interpretar_filas(texto):
+    """Convierte '10k', '1M' o '250000' en número de filas"""
+    texto = texto.strip().lower()
+    multiplicador = {'k': 1_000, 'm': 1_000_000}.get(texto[-1], 1)
+    return int(float(texto.rstrip('km')) * multiplicador)
+
+
+def preparar_dataset(filas, semilla=SEMILLA, directorio=DIRECTORIO_DATOS):
+    """
+    Genera (o reutiliza) el CSV de un tamaño dado.
+
+    Returns:
+        Ruta del CSV
+    """
+    num_estudiantes = math.ceil(filas / FILAS_POR_ESTUDIANTE)
+    ruta = os.path.join(directorio, f'notas-{num_estudiantes}-s{semilla}.csv')
+    if not os.path.exists(ruta):
+        generador = _cargar_generador()
+        generador.generar_dataset(num_estudiantes=num_estudiantes, seed=semilla,
+                                  output_path=ruta, modo='vectorizado')
+    return ruta
+
+
+def funciones_a_medir():
+    """
+    Función central de cada análisis. Todas reciben el DataFrame ya cargado,
+    salvo 'carga', que mide la lectura del CSV sin caché.
+    """
+    hu01 = importar_script('analisis_hu01.py')
+    hu03 = importar_script('hu03_estudiantes_riesgo.py')
+    hu04 = importar_script('hu04_mejor_estudiante.py')
+    hu05 = importar_script('promedio-asignatura-HU05.py')
+    hu06 = importar_script('cambios-rendimiento-HU06.py')
+    hu07 = importar_script('distribucion-notas-HU07.py')
+    hu08 = importar_script('reporte_general_hu08.py')
+
+    return {
+        'carga': lambda df, ruta: cargar_notas(ruta, usar_cache=False),
+        'hu01_promedios_periodos': lambda df, ruta: hu01.calcular_promedios_periodos(df),
+        'hu03_riesgo': lambda df, ruta: hu03.calcular_riesgo(df),
+        'hu04_ranking': lambda df, ruta: hu04.actualizar_ranking(hu04.crear_ranking(), df),
+        'hu05_promedios_asignatura': lambda df, ruta: hu05.calcular_promedios_por_asignatura(df),
+        'hu06_cambios_bruscos': lambda df, ruta: hu06.calcular_cambios_bruscos(df),
+        'hu07_distribucion': lambda df, ruta: hu07.calcular_estadisticas_notas(df),
+        'hu08_reporte': lambda df, ruta: hu08.calcular_reporte(df)
+    }
+
+
+def medir(funcion, df_base, ruta, repeticiones=REPETICIONES):
+    """
+    Mide una función: el mejor tiempo de `repeticiones` corridas y la memoria
+    pico (tracemalloc, que también registra los arreglos de numpy) de una
+    corrida aparte, para que el rastreo no altere el tiempo.
+
+    Cada corrida recibe una copia sin la columna de promedio, así ninguna
+    función aprovecha el trabajo de la anterior.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        df = df_base.copy()
+        inicio = time.perf_counter()
+        funcion(df, ruta)
+        tiempos.append(time.perf_counter() - inicio)
+
+    df = df_base.copy()
+    tracemalloc.start()
+    try:
+        funcion(df, ruta)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return min(tiempos), pico
+
+
+def ejecutar_benchmarks(tamanos, semilla=SEMILLA, repeticiones=REPETICIONES, solo=None):
+    """
+    Corre todas las mediciones.
+
+    Returns:
+        Diccionario con 'meta' (entorno) y 'resultados' (una entrada por tamaño y función)
+    """
+    funciones = funciones_a_medir()
+    if solo:
+        funciones = {nombre: f for nombre, f in funciones.items() if nombre in solo}
+
+    resultados = []
+    print(f"\n{'Filas':>10} {'Función':<28} {'Segundos':>10} {'ns/fila':>9} {'Pico MB':>9}")
+    for filas in tamanos:
+        ruta = preparar_dataset(filas, semilla)
+        df_base = cargar_notas(ruta, usar_cache=False)
+        if COLUMNA_PROMEDIO in df_base.columns:
+            df_base = df_base.drop(columns=COLUMNA_PROMEDIO)
+
+        for nombre, funcion in funciones.items():
+            segundos, pico = medir(funcion, df_base, ruta, repeticiones)
+            resultados.append({
+                'filas': len(df_base),
+                'funcion': nombre,
+                'segundos': segundos,
+                'memoria_pico_mb': pico / 2 ** 20
+            })
+            print(f"{len(df_base):>10} {nombre:<28} {segundos:>10.4f} "
+                  f"{segundos / len(df_base) * 1e9:>9.1f} {pico / 2 ** 20:>9.1f}")
+
+    meta = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'semilla': semilla,
+        'repeticiones': repeticiones
+    }
+    return {'meta': meta, 'resultados': resultados}
+
+
+def comparar_con_baseline(actual, baseline, tolerancia=TOLERANCIA):
+    """
+    Compara cada medición con la de la línea base del mismo tamaño y función.
+
+    Returns:
+        Lista de regresiones (diccionarios con la métrica, el valor base y el actual)
+    """
+    base = {(r['filas'], r['funcion']): r for r in baseline['resultados']}
+    regresiones = []
+
+    print(f"\n{'Filas':>10} {'Función':<28} {'Tiempo':>9} {'Memoria':>9}")
+    for r in actual['resultados']:
+        anterior = base.get((r['filas'], r['funcion']))
+        if anterior is None:
+            continue
+        cambio_tiempo = r['segundos'] / anterior['segundos'] - 1
+        cambio_memoria = r['memoria_pico_mb'] / max(anterior['memoria_pico_mb'], 1e-9) - 1
+        marca = ""
+        for metrica, cambio in (('segundos', cambio_tiempo), ('memoria_pico_mb', cambio_memoria)):
+            if cambio > tolerancia:
+                regresiones.append({'filas': r['filas'], 'funcion': r['funcion'], 'metrica': metrica,
+                                    'base': anterior[metrica], 'actual': r[metrica]})
+                marca = "  << REGRESIÓN"
+        print(f"{r['filas']:>10} {r['funcion']:<28} {cambio_tiempo:>+9.1%} {cambio_memoria:>+9.1%}{marca}")
+
+    return regresiones
+
+
+def guardar_json(datos, ruta):
+    """Guarda los resultados en JSON"""
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Benchmarks de escalabilidad de las HU")
+    parser.add_argument('--tamanos', default=TAMANOS,
+                        help="Filas de cada dataset, separadas por coma (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=SEMILLA, help="Semilla de los datasets (default: %(default)s)")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES,
+                        help="Corridas por medición; se guarda la más rápida (default: %(default)s)")
+    parser.add_argument('--solo', default=None, help="Funciones a medir, separadas por coma (default: todas)")
+    parser.add_argument('--salida', default=SALIDA, help="JSON de resultados (default: %(default)s)")
+    parser.add_argument('--baseline', default=None, help="JSON de línea base con el que comparar")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help="Aumento relativo permitido antes de marcar regresión (default: %(default)s)")
+    parser.add_argument('--guardar-baseline', action='store_true',
+                        help=f"Guarda también los resultados como línea base en {BASELINE}")
+    args = parser.parse_args()
+
+    tamanos = [interpretar_filas(t) for t in args.tamanos.split(',')]
+    solo = args.solo.split(',') if args.solo else None
+
+    resultados = ejecutar_benchmarks(tamanos, args.seed, args.repeticiones, solo)
+    guardar_json(resultados, args.salida)
+    print(f"\n Resultados guardados en: {args.salida}")
+
+    if args.guardar_baseline:
+        guardar_json(resultados, BASELINE)
+        print(f" Línea base guardada en: {BASELINE}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regresiones = comparar_con_baseline(resultados, baseline, args.tolerancia)
+        if regresiones:
+            print(f"\n {len(regresiones)} regresión(es) por encima del {args.tolerancia:.0%}.")
+            sys.exit(1)
+        print("\n Sin regresiones.")
+
+
+if __name__ == "__main__":
+    main()
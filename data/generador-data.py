@@ -8,8 +8,67 @@ import numpy as np
 import pandas as pd
 import argparse
 import os
+import time
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+# La instrumentación compartida vive en scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+from almacen_columnar import escribir_particionado, ruta_particionada
+from esquema_estrella import escribir_estrella, ruta_estrella
+from carga_datos import ESQUEMA
+
+# Modos de generación disponibles
+# - "bucle": una fila a la vez (modo original, útil para datasets pequeños)
+# - "vectorizado": todos los efectos se generan como arreglos en un solo lote
+MODOS_GENERACION = ("bucle", "vectorizado")
+
+# Formatos de salida: CSV plano, columnas .npy particionadas por periodo
+# (ver scripts/almacen_columnar.py) o tablas de estudiantes, asignaturas y
+# hechos numéricos (ver scripts/esquema_estrella.py)
+FORMATOS_SALIDA = ("csv", "particionado", "estrella")
+
+# Estudiantes por bloque en la generación fragmentada: cada bloque tiene su
+# propio generador derivado de (semilla, número de bloque)
+BLOQUE_ESTUDIANTES = 4096
+
+# Tendencias posibles de mejora/empeoramiento por periodo y sus probabilidades
+TENDENCIAS_PERIODO = [-0.15, -0.05, 0.0, 0.05, 0.15]
+PROBABILIDADES_TENDENCIA = [0.15, 0.20, 0.30, 0.20, 0.15]
+
+# Asignaturas por defecto
+ASIGNATURAS = [
+    "Programación",
+    "Matemáticas",
+    "Bases de Datos",
+    "Algoritmos",
+    "Sistemas",
+    "Redes",
+    "Ingeniería de Software"
+]
+
+# Listas ampliadas de nombres colombianos
+NOMBRES = [
+    "Catalina", "Juan", "Sofía", "Andrés", "Valentina", "Diego", "María", "Mateo",
+    "Laura", "Felipe", "Isabella", "Luis", "Camila", "Alejandro", "Gabriela", "Carlos",
+    "Daniela", "Sebastián", "Natalia", "Miguel", "Paula", "Santiago", "Alejandra", "José",
+    "Juliana", "Nicolás", "Valeria", "Samuel", "Ana", "David", "Carolina", "Sebastián",
+    "Mariana", "Daniel", "Lucía", "Tomás", "Sara", "Martín", "Emma", "Gabriel",
+    "Victoria", "Leonardo", "Manuela", "Emilio", "Valeria", "Maximiliano", "Antonella",
+    "Ricardo", "Julieta", "Eduardo", "Renata", "Fernando", "Adriana", "Joaquín"
+]
+
+APELLIDOS = [
+    "Rodríguez", "Gómez", "García", "Martínez", "López", "Pérez", "Sánchez", "Ramírez",
+    "Torres", "Vargas", "Rojas", "Muñoz", "Castro", "Herrera", "Moreno", "Jiménez",
+    "Ortiz", "Álvarez", "Romero", "Rincón", "Cárdenas", "Peña", "Mendoza", "Suárez",
+    "Zapata", "Vega", "Reyes", "Silva", "Medina", "Gutiérrez", "Ruiz", "Díaz",
+    "Parra", "Molina", "Ríos", "Mejía", "Salazar", "Bermúdez", "Pardo", "Valencia"
+]
+
 
 def generar_dataset(
         num_estudiantes=40,
@@ -18,7 +77,10 @@ def generar_dataset(
         nota_min=0.0,
         nota_max=5.0,
         seed=None,
-        output_path="data-generada.csv"
+        output_path="data-generada.csv",
+        modo="bucle",
+        formato="csv",
+        particionar_asignatura=False
 ):
     """
     Genera un dataset sintético de notas académicas.
@@ -30,47 +92,76 @@ def generar_dataset(
         nota_min: Nota mínima posible (default: 0.0)
         nota_max: Nota máxima posible (default: 5.0)
         seed: Semilla para reproducibilidad (None = aleatorio)
-        output_path: Ruta del archivo CSV de salida
+        output_path: Ruta del archivo CSV de salida (None = no guardar)
+        modo: "bucle" (fila por fila) o "vectorizado" (todo en arreglos).
+            Ambos modos usan el mismo modelo estadístico y son reproducibles
+            con la misma semilla, pero no producen los mismos valores entre sí.
+        formato: "csv", "particionado" (directorio <base>.particionado con
+            una carpeta por periodo y un .npy por columna) o "estrella"
+            (directorio <base>.estrella con las tablas normalizadas)
+        particionar_asignatura: En formato particionado, separa también por asignatura
 
     Returns:
         DataFrame con los datos generados y la ruta del archivo
     """
 
+    if modo not in MODOS_GENERACION:
+        raise ValueError(f"Modo desconocido: {modo!r} (opciones: {', '.join(MODOS_GENERACION)})")
+    if formato not in FORMATOS_SALIDA:
+        raise ValueError(f"Formato desconocido: {formato!r} (opciones: {', '.join(FORMATOS_SALIDA)})")
+
+    # Asignaturas por defecto
+    if asignaturas is None:
+        asignaturas = list(ASIGNATURAS)
+
+    with etapa('calculo', paso='generacion', modo=modo) as registro:
+        if modo == "vectorizado":
+            df = _generar_vectorizado(
+                num_estudiantes, asignaturas, num_periodos, nota_min, nota_max, seed
+            )
+        else:
+            df = _generar_bucle(
+                num_estudiantes, asignaturas, num_periodos, nota_min, nota_max, seed
+            )
+        registro['filas'] = len(df)
+
+    if output_path is not None:
+        # Asegurar que el directorio de salida existe
+        outdir = os.path.dirname(output_path)
+        if outdir and not os.path.exists(outdir):
+            os.makedirs(outdir, exist_ok=True)
+
+        if formato == "particionado":
+            output_path = ruta_particionada(output_path)
+            # Mismos valores (2 decimales) y tipos que se obtienen al leer el CSV
+            columnas_decimales = df.select_dtypes('float').columns
+            df_salida = df.assign(**{c: df[c].round(2) for c in columnas_decimales}).astype(
+                {c: t for c, t in ESQUEMA.items() if c in df.columns and t != 'category'}
+            )
+            with etapa('guardado', len(df), archivo=os.path.basename(output_path)):
+                escribir_particionado(df_salida, output_path, particionar_asignatura)
+        elif formato == "estrella":
+            output_path = ruta_estrella(output_path)
+            with etapa('guardado', len(df), archivo=os.path.basename(output_path)):
+                escribir_estrella(df, output_path)
+        else:
+            # Guardar CSV
+            with etapa('guardado', len(df), archivo=os.path.basename(output_path)):
+                df.to_csv(output_path, index=False, float_format="%.2f")
+
+    return df, output_path
+
+
+def _generar_bucle(num_estudiantes, asignaturas, num_periodos, nota_min, nota_max, seed):
+    """Genera el dataset fila por fila con el generador global de NumPy"""
+
     # Configurar semilla aleatoria
     if seed is not None:
         random.seed(seed)
         np.random.seed(seed)
 
-    # Asignaturas por defecto
-    if asignaturas is None:
-        asignaturas = [
-            "Programación",
-            "Matemáticas",
-            "Bases de Datos",
-            "Algoritmos",
-            "Sistemas",
-            "Redes",
-            "Ingeniería de Software"
-        ]
-
-    # Listas ampliadas de nombres colombianos
-    nombres = [
-        "Catalina", "Juan", "Sofía", "Andrés", "Valentina", "Diego", "María", "Mateo",
-        "Laura", "Felipe", "Isabella", "Luis", "Camila", "Alejandro", "Gabriela", "Carlos",
-        "Daniela", "Sebastián", "Natalia", "Miguel", "Paula", "Santiago", "Alejandra", "José",
-        "Juliana", "Nicolás", "Valeria", "Samuel", "Ana", "David", "Carolina", "Sebastián",
-        "Mariana", "Daniel", "Lucía", "Tomás", "Sara", "Martín", "Emma", "Gabriel",
-        "Victoria", "Leonardo", "Manuela", "Emilio", "Valeria", "Maximiliano", "Antonella",
-        "Ricardo", "Julieta", "Eduardo", "Renata", "Fernando", "Adriana", "Joaquín"
-    ]
-
-    apellidos = [
-        "Rodríguez", "Gómez", "García", "Martínez", "López", "Pérez", "Sánchez", "Ramírez",
-        "Torres", "Vargas", "Rojas", "Muñoz", "Castro", "Herrera", "Moreno", "Jiménez",
-        "Ortiz", "Álvarez", "Romero", "Rincón", "Cárdenas", "Peña", "Mendoza", "Suárez",
-        "Zapata", "Vega", "Reyes", "Silva", "Medina", "Gutiérrez", "Ruiz", "Díaz",
-        "Parra", "Molina", "Ríos", "Mejía", "Salazar", "Bermúdez", "Pardo", "Valencia"
-    ]
+    nombres = NOMBRES
+    apellidos = APELLIDOS
 
     # Generar nombres únicos de estudiantes
     estudiantes = []
@@ -120,8 +211,8 @@ def generar_dataset(
             for periodo in range(1, num_periodos + 1):
                 # Tendencia de mejora/empeoramiento a lo largo de los periodos
                 periodo_trend = np.random.choice(
-                    [-0.15, -0.05, 0.0, 0.05, 0.15],
-                    p=[0.15, 0.20, 0.30, 0.20, 0.15]
+                    TENDENCIAS_PERIODO,
+                    p=PROBABILIDADES_TENDENCIA
                 )
                 ajuste_periodo = periodo_trend * (periodo - 1)
 
@@ -173,15 +264,304 @@ def generar_dataset(
         by=["id_estudiante", "asignatura", "periodo"]
     ).reset_index(drop=True)
 
-    # Asegurar que el directorio de salida existe
+    return df
+
+
+def _generar_vectorizado(num_estudiantes, asignaturas, num_periodos, nota_min, nota_max, seed):
+    """
+    Genera el dataset completo con operaciones sobre arreglos.
+
+    Usa el mismo modelo que el modo bucle, pero cada efecto (rendimiento base,
+    sesgo del estudiante, sesgo por asignatura, tendencia por periodo, notas,
+    asistencia y participación) se genera de una vez para todo el curso con
+    forma (estudiantes, asignaturas, periodos). Las filas salen ya ordenadas
+    por estudiante, asignatura y periodo, sin necesidad de sort_values.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    ids = np.arange(1, num_estudiantes + 1)
+    return _construir_filas(
+        np.random.default_rng(seed), ids, _nombres_por_id(seed, ids),
+        asignaturas, num_periodos, nota_min, nota_max
+    )
+
+
+def _construir_filas(rng, ids, nombres, asignaturas, num_periodos, nota_min, nota_max):
+    """
+    Genera las filas de un grupo de estudiantes a partir de un generador dado.
+
+    Args:
+        rng: np.random.Generator del que salen todos los efectos
+        ids: Arreglo con los IDs de los estudiantes del grupo
+        nombres: Nombre de cada estudiante (mismo orden que ids)
+
+    Returns:
+        DataFrame ordenado por estudiante, asignatura y periodo
+    """
+    # Las asignaturas se recorren en orden alfabético para que el resultado
+    # quede ordenado igual que en el modo bucle
+    asignaturas = sorted(asignaturas)
+    num_estudiantes = len(ids)
+    num_asignaturas = len(asignaturas)
+    forma = (num_estudiantes, num_asignaturas, num_periodos)
+
+    # Efectos por estudiante: forma (estudiantes,)
+    base_rendimiento = np.clip(rng.normal(3.0, 0.8, num_estudiantes), nota_min, nota_max)
+    student_bias = np.clip(rng.normal(0.0, 0.25, num_estudiantes), -0.6, 0.6)
+
+    # Efectos por estudiante y asignatura: forma (estudiantes, asignaturas)
+    subj_bias = np.clip(rng.normal(0.0, 0.4, forma[:2]), -0.8, 0.8)
+
+    # Efectos por fila: forma (estudiantes, asignaturas, periodos)
+    periodo_trend = rng.choice(TENDENCIAS_PERIODO, size=forma, p=PROBABILIDADES_TENDENCIA)
+    ajuste_periodo = periodo_trend * np.arange(num_periodos)
+
+    media_notas = (
+        base_rendimiento[:, None, None]
+        + subj_bias[:, :, None]
+        + student_bias[:, None, None]
+        + ajuste_periodo
+    )
+
+    # Las 3 notas de cada fila: forma (estudiantes, asignaturas, periodos, 3)
+    notas = rng.normal(media_notas[..., None], 0.5, forma + (3,))
+    notas = np.round(np.clip(notas, nota_min, nota_max), 2)
+
+    asistencia_media = 70 + (base_rendimiento / nota_max) * 25
+    asistencia = rng.normal(asistencia_media[:, None, None], 10, forma)
+    asistencia = np.round(np.clip(asistencia, 50, 100), 1)
+
+    participacion_media = 0.4 + (base_rendimiento / nota_max) * 0.5
+    participacion = rng.normal(participacion_media[:, None, None], 0.2, forma)
+    participacion = np.round(np.clip(participacion, 0, 1), 2)
+
+    # Construir las columnas directamente (sin diccionarios por fila)
+    filas_por_estudiante = num_asignaturas * num_periodos
+    codigos_estudiante = np.repeat(np.arange(num_estudiantes), filas_por_estudiante)
+    codigos_asignatura = np.tile(np.repeat(np.arange(num_asignaturas), num_periodos), num_estudiantes)
+    notas = notas.reshape(-1, 3)
+
+    return pd.DataFrame({
+        "id_estudiante": np.asarray(ids)[codigos_estudiante],
+        "nombre": pd.Categorical.from_codes(codigos_estudiante, categories=nombres),
+        "asignatura": pd.Categorical.from_codes(codigos_asignatura, categories=asignaturas),
+        "periodo": np.tile(np.arange(1, num_periodos + 1), num_estudiantes * num_asignaturas),
+        "nota1": notas[:, 0],
+        "nota2": notas[:, 1],
+        "nota3": notas[:, 2],
+        "asistencia_%": asistencia.ravel(),
+        "participacion": participacion.ravel()
+    })
+
+
+def _nombres_por_id(seed, ids):
+    """
+    Asigna un nombre único a cada estudiante en O(1), sin reintentos.
+
+    Las combinaciones nombre-apellido se barajan una sola vez a partir de la
+    semilla; el estudiante con ID i recibe la combinación (i - 1) de esa
+    permutación. Cuando las combinaciones se agotan, se reutilizan agregando
+    el ID del estudiante, que por ser único mantiene el nombre único. El
+    nombre depende solo de la semilla y del ID, así que cualquier fragmento
+    puede calcularlo sin conocer a los estudiantes anteriores.
+    """
+    nombres = list(dict.fromkeys(NOMBRES))
+    apellidos = list(dict.fromkeys(APELLIDOS))
+    total_combinaciones = len(nombres) * len(apellidos)
+
+    permutacion = np.random.default_rng([seed, 0]).permutation(total_combinaciones)
+
+    posiciones = np.asarray(ids) - 1
+    idx_nombre, idx_apellido = np.divmod(permutacion[posiciones % total_combinaciones], len(apellidos))
+    return [
+        f"{nombres[n]} {apellidos[a]} {p + 1}" if p >= total_combinaciones else f"{nombres[n]} {apellidos[a]}"
+        for n, a, p in zip(idx_nombre.tolist(), idx_apellido.tolist(), posiciones.tolist())
+    ]
+
+
+def _generar_bloque(seed, bloque, num_estudiantes, asignaturas, num_periodos, nota_min, nota_max):
+    """
+    Genera un bloque de BLOQUE_ESTUDIANTES estudiantes con su propio generador.
+
+    El generador del bloque se deriva de (semilla, número de bloque), así que
+    cada bloque es independiente y reproducible sin generar los anteriores.
+    """
+    id_inicio = bloque * BLOQUE_ESTUDIANTES + 1
+    id_fin = min(id_inicio + BLOQUE_ESTUDIANTES, num_estudiantes + 1)
+    ids = np.arange(id_inicio, id_fin)
+
+    rng = np.random.default_rng([seed, 1, bloque])
+    return _construir_filas(
+        rng, ids, _nombres_por_id(seed, ids), asignaturas, num_periodos, nota_min, nota_max
+    )
+
+
+def _generar_rango(seed, id_inicio, id_fin, num_estudiantes, asignaturas, num_periodos,
+                   nota_min, nota_max):
+    """
+    Genera, bloque a bloque, las filas de los estudiantes con ID en [id_inicio, id_fin).
+
+    Yields:
+        DataFrames consecutivos (uno por bloque tocado por el rango)
+    """
+    filas_por_estudiante = len(asignaturas) * num_periodos
+    primer_bloque = (id_inicio - 1) // BLOQUE_ESTUDIANTES
+    ultimo_bloque = (id_fin - 2) // BLOQUE_ESTUDIANTES
+
+    for bloque in range(primer_bloque, ultimo_bloque + 1):
+        df = _generar_bloque(seed, bloque, num_estudiantes, asignaturas, num_periodos, nota_min, nota_max)
+
+        # Recortar los estudiantes del bloque que quedan fuera del rango
+        primer_id = bloque * BLOQUE_ESTUDIANTES + 1
+        desde = max(id_inicio - primer_id, 0) * filas_por_estudiante
+        hasta = (min(id_fin, primer_id + BLOQUE_ESTUDIANTES) - primer_id) * filas_por_estudiante
+        yield df.iloc[desde:hasta]
+
+
+def _escribir_fragmento(tarea):
+    """Genera y guarda un fragmento; se ejecuta dentro de un proceso del pool"""
+    ruta = tarea["archivo"]
+    filas = 0
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        for df in _generar_rango(**tarea["parametros"]):
+            df.to_csv(f, index=False, header=(filas == 0), float_format="%.2f")
+            filas += len(df)
+
+    return {
+        "archivo": os.path.basename(ruta),
+        "id_inicio": tarea["parametros"]["id_inicio"],
+        "id_fin": tarea["parametros"]["id_fin"] - 1,
+        "filas": filas
+    }
+
+
+def generar_dataset_fragmentado(
+        num_estudiantes=40,
+        num_fragmentos=4,
+        num_workers=None,
+        asignaturas=None,
+        num_periodos=3,
+        nota_min=0.0,
+        nota_max=5.0,
+        seed=None,
+        output_path="data-generada.csv"
+):
+    """
+    Genera el dataset en varios archivos (fragmentos) en paralelo.
+
+    Cada fragmento cubre un rango contiguo de estudiantes y se genera por
+    bloques con generadores derivados de la semilla y del número de bloque.
+    Por eso el contenido no depende del número de workers ni del número de
+    fragmentos: concatenar los fragmentos en orden siempre da el mismo CSV.
+
+    Los archivos se llaman <base>-fragmento-0000.csv, ... y se acompañan de
+    un manifiesto <base>-manifiesto.json con los rangos de IDs y filas.
+
+    Args:
+        num_fragmentos: Número de archivos de salida
+        num_workers: Procesos en paralelo (None = número de CPUs)
+        (el resto igual que generar_dataset)
+
+    Returns:
+        Diccionario con el manifiesto y la ruta del manifiesto
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    if asignaturas is None:
+        asignaturas = list(ASIGNATURAS)
+    num_fragmentos = max(1, min(num_fragmentos, num_estudiantes))
+
+    base, _ = os.path.splitext(output_path)
     outdir = os.path.dirname(output_path)
     if outdir and not os.path.exists(outdir):
         os.makedirs(outdir, exist_ok=True)
 
-    # Guardar CSV
-    df.to_csv(output_path, index=False, float_format="%.2f")
+    tareas = []
+    for k in range(num_fragmentos):
+        tareas.append({
+            "archivo": f"{base}-fragmento-{k:04d}.csv",
+            "parametros": {
+                "seed": seed,
+                "id_inicio": k * num_estudiantes // num_fragmentos + 1,
+                "id_fin": (k + 1) * num_estudiantes // num_fragmentos + 1,
+                "num_estudiantes": num_estudiantes,
+                "asignaturas": asignaturas,
+                "num_periodos": num_periodos,
+                "nota_min": nota_min,
+                "nota_max": nota_max
+            }
+        })
 
-    return df, output_path
+    with etapa('guardado', paso='fragmentos', fragmentos=num_fragmentos, workers=num_workers) as registro:
+        if num_workers == 1:
+            fragmentos = [_escribir_fragmento(tarea) for tarea in tareas]
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers) as pool:
+                fragmentos = list(pool.map(_escribir_fragmento, tareas))
+        registro['filas'] = sum(f["filas"] for f in fragmentos)
+
+    manifiesto = {
+        "semilla": seed,
+        "num_estudiantes": num_estudiantes,
+        "num_periodos": num_periodos,
+        "asignaturas": sorted(asignaturas),
+        "bloque_estudiantes": BLOQUE_ESTUDIANTES,
+        "filas": sum(f["filas"] for f in fragmentos),
+        "fragmentos": fragmentos
+    }
+    ruta_manifiesto = f"{base}-manifiesto.json"
+    with open(ruta_manifiesto, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+
+    return manifiesto, ruta_manifiesto
+
+
+def regenerar_estudiante(id_estudiante, seed, num_estudiantes, asignaturas=None, num_periodos=3,
+                         nota_min=0.0, nota_max=5.0):
+    """
+    Regenera solo las filas de un estudiante de un dataset fragmentado.
+
+    Genera únicamente el bloque que contiene al estudiante, sin recorrer
+    a los estudiantes anteriores.
+    """
+    if asignaturas is None:
+        asignaturas = list(ASIGNATURAS)
+    partes = _generar_rango(
+        seed, id_estudiante, id_estudiante + 1, num_estudiantes,
+        asignaturas, num_periodos, nota_min, nota_max
+    )
+    return next(partes).reset_index(drop=True)
+
+
+def comparar_modos(num_estudiantes=2000, num_periodos=3, seed=42):
+    """
+    Mide el tiempo de generación de ambos modos con los mismos parámetros.
+
+    No escribe ningún archivo: solo compara la construcción del DataFrame.
+
+    Returns:
+        Diccionario {modo: segundos}
+    """
+    tiempos = {}
+    for modo in MODOS_GENERACION:
+        inicio = time.perf_counter()
+        generar_dataset(
+            num_estudiantes=num_estudiantes,
+            num_periodos=num_periodos,
+            seed=seed,
+            output_path=None,
+            modo=modo
+        )
+        tiempos[modo] = time.perf_counter() - inicio
+
+    filas = num_estudiantes * len(ASIGNATURAS) * num_periodos
+    print(f"Comparación de modos ({num_estudiantes} estudiantes, {filas} filas):")
+    for modo, segundos in tiempos.items():
+        print(f"  {modo:<12} {segundos:>10.3f} s  ({filas / segundos:,.0f} filas/s)")
+    print(f"  Aceleración del modo vectorizado: {tiempos['bucle'] / tiempos['vectorizado']:.1f}x")
+
+    return tiempos
 
 
 def main():
@@ -214,18 +594,79 @@ def main():
         default=None,
         help="Semilla para reproducibilidad (default: aleatorio basado en tiempo)"
     )
+    parser.add_argument(
+        "--modo",
+        choices=MODOS_GENERACION,
+        default="bucle",
+        help="Modo de generación: fila por fila o vectorizado (default: bucle)"
+    )
+    parser.add_argument(
+        "--formato",
+        choices=FORMATOS_SALIDA,
+        default="csv",
+        help="csv, particionado (columnas .npy por periodo en <output>.particionado/) "
+             "o estrella (estudiantes, asignaturas y hechos numéricos en <output>.estrella/) (default: csv)"
+    )
+    parser.add_argument(
+        "--por-asignatura",
+        action="store_true",
+        help="Con --formato particionado, separa también por asignatura"
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Genera el dataset en N archivos fragmentados con manifiesto (default: un solo archivo)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Procesos en paralelo para --shards (default: número de CPUs)"
+    )
+    parser.add_argument(
+        "--comparar",
+        action="store_true",
+        help="Compara el tiempo de ambos modos en lugar de generar el archivo"
+    )
+    agregar_opcion(parser)
 
     args = parser.parse_args()
+    activar_desde_args(args)
 
     # Si no se especifica seed, usar timestamp
     seed_final = args.seed if args.seed is not None else int(datetime.now().timestamp())
 
+    if args.comparar:
+        comparar_modos(
+            num_estudiantes=args.estudiantes,
+            num_periodos=args.periodos,
+            seed=seed_final
+        )
+        return
+
+    if args.shards is not None:
+        if args.formato != "csv":
+            parser.error("--shards solo escribe CSV")
+        generar_dataset_fragmentado(
+            num_estudiantes=args.estudiantes,
+            num_fragmentos=args.shards,
+            num_workers=args.workers,
+            num_periodos=args.periodos,
+            seed=seed_final,
+            output_path=args.output
+        )
+        return
+
     # Generar dataset
     generar_dataset(
         num_estudiantes=args.estudiantes,
         num_periodos=args.periodos,
         seed=seed_final,
-        output_path=args.output
+        output_path=args.output,
+        modo=args.modo,
+        formato=args.formato,
+        particionar_asignatura=args.por_asignatura
     )
 
 
@@ -0,0 +1,388 @@
+"""
+Almacén incremental de agregados
+Guarda sumas, conteos y sumas de cuadrados de los promedios por fila, de modo
+que cuando el colegio agrega al CSV las notas de un nuevo periodo solo se leen
+las filas nuevas. Los promedios por periodo (HU01), por asignatura con su
+desviación (HU05) y acumulados por estudiante (HU08) salen de los agregados,
+sin volver a recorrer el historial.
+
+Estructura del almacén (por defecto <csv>.agregados/):
+    estado.json          posición ya procesada del CSV, huella de esos bytes, segmentos y resúmenes vigentes
+    resumenes-NNNN.npz   agregados por periodo, por asignatura y por estudiante de los primeros NNNN lotes
+    segmento-NNNN.npz    detalle (estudiante, asignatura, periodo) de cada lote
+
+Un lote se confirma al reemplazar estado.json: el segmento y los resúmenes
+nuevos se escriben antes con nombres que el estado vigente no usa. Si el
+proceso se interrumpe antes, el almacén sigue en el lote anterior y esos
+archivos huérfanos se borran en la siguiente actualización.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import ESQUEMA, COLUMNAS_NOTAS, RUTA_CSV, importar_script
+import politica_notas
+
+# --- Constantes y Configuración ---
+SUFIJO_ALMACEN = '.agregados'
+VERSION_ALMACEN = 3
+# Bytes del inicio y del final de la parte ya procesada que se comparan antes de leer filas nuevas
+BYTES_HUELLA = 64 * 1024
+COLUMNAS_SUMA = ['conteo', 'suma', 'suma_cuadrados']
+COLUMNAS_SUMA_NOTAS = [f'suma_{nota}' for nota in COLUMNAS_NOTAS]
+
+
+def ruta_almacen(ruta_csv):
+    """Directorio del almacén asociado a un CSV"""
+    return ruta_csv + SUFIJO_ALMACEN
+
+
+def _leer_estado(directorio):
+    ruta = os.path.join(directorio, 'estado.json')
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding='utf-8') as f:
+        estado = json.load(f)
+    return estado if estado.get('version') == VERSION_ALMACEN else None
+
+
+def _guardar_estado(directorio, estado):
+    temporal = os.path.join(directorio, 'estado.json.tmp')
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, os.path.join(directorio, 'estado.json'))
+
+
+def _archivos_de_datos(directorio):
+    """Segmentos, resúmenes y temporales del almacén (todo lo que no es estado.json)"""
+    return [a for a in os.listdir(directorio)
+            if a.startswith(('segmento-', 'resumenes')) or a.endswith('.tmp')]
+
+
+def _borrar_huerfanos(directorio, estado):
+    """Borra los archivos de un lote que no se llegó a confirmar en estado.json"""
+    vigentes = set(estado['segmentos']) | {estado['resumenes']}
+    for archivo in _archivos_de_datos(directorio):
+        if archivo not in vigentes:
+            os.remove(os.path.join(directorio, archivo))
+
+
+def _huella_prefijo(ruta_csv, posicion):
+    """
+    Hash de los primeros y los últimos BYTES_HUELLA bytes del CSV antes de `posicion`.
+
+    Si el archivo se reescribió (y no solo creció), esos bytes cambian: la
+    posición guardada ya no es un fin de línea de las filas procesadas. Leer
+    solo los extremos mantiene el costo independiente del tamaño del historial.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(ruta_csv, 'rb') as f:
+        h.update(f.read(min(posicion, BYTES_HUELLA)))
+        f.seek(max(posicion - BYTES_HUELLA, 0))
+        h.update(f.read(posicion - f.tell()))
+    return h.hexdigest()
+
+
+def _guardar_npz(ruta, tablas):
+    """Guarda varios DataFrames en un .npz (columna a columna) de forma atómica"""
+    arreglos = {}
+    for nombre, tabla in tablas.items():
+        tabla = tabla.reset_index()
+        for columna in tabla.columns:
+            valores = tabla[columna].to_numpy()
+            arreglos[f'{nombre}/{columna}'] = valores.astype(str) if valores.dtype == object else valores
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as f:
+        np.savez(f, **arreglos)
+    os.replace(temporal, ruta)
+
+
+def _leer_npz(ruta, indices):
+    """Lee los DataFrames guardados con _guardar_npz; `indices` indica la clave de cada tabla"""
+    tablas = {}
+    with np.load(ruta, allow_pickle=False) as datos:
+        for nombre, indice in indices.items():
+            columnas = {c.split('/', 1)[1]: datos[c] for c in datos.files if c.startswith(nombre + '/')}
+            tablas[nombre] = pd.DataFrame(columnas).set_index(indice)
+    return tablas
+
+
+def _resumenes_vacios():
+    """Agregados vacíos por periodo, asignatura y estudiante"""
+    return {
+        'por_periodo': pd.DataFrame(columns=COLUMNAS_SUMA, index=pd.Index([], name='periodo'), dtype='float64'),
+        'por_asignatura': pd.DataFrame(columns=COLUMNAS_SUMA + COLUMNAS_SUMA_NOTAS,
+                                       index=pd.Index([], name='asignatura'), dtype='float64'),
+        'por_estudiante': pd.DataFrame({'nombre': pd.Series(dtype=object), 'conteo': pd.Series(dtype='float64'),
+                                        'suma': pd.Series(dtype='float64')},
+                                       index=pd.Index([], name='id_estudiante'))
+    }
+
+
+def agregar_lote(df, con_detalle=True):
+    """
+    Agregados de un lote de filas.
+
+    Returns:
+        (detalle por estudiante/asignatura/periodo o None si con_detalle=False,
+        resúmenes por periodo, asignatura y estudiante)
+    """
+    # Notas con sus 2 decimales en float64 (como promedio_fila), no con los dígitos de float32
+    notas = np.round(df[COLUMNAS_NOTAS].to_numpy(dtype='float64'), 2)
+    promedio = politica_notas.promedio_fila(df)
+    lote = pd.DataFrame({
+        'id_estudiante': df['id_estudiante'].to_numpy(),
+        'asignatura': df['asignatura'].astype(str).to_numpy(),
+        'periodo': df['periodo'].to_numpy(),
+        'conteo': 1.0,
+        'suma': promedio,
+        'suma_cuadrados': promedio * promedio
+    })
+    for i, columna in enumerate(COLUMNAS_SUMA_NOTAS):
+        lote[columna] = notas[:, i]
+
+    detalle = lote.groupby(['id_estudiante', 'asignatura', 'periodo'])[COLUMNAS_SUMA].sum() if con_detalle else None
+
+    por_estudiante = lote.groupby('id_estudiante')[['conteo', 'suma']].sum()
+    por_estudiante.insert(0, 'nombre', df.groupby(df['id_estudiante'].to_numpy())['nombre'].first().astype(str))
+
+    resumenes = {
+        'por_periodo': lote.groupby('periodo')[COLUMNAS_SUMA].sum(),
+        'por_asignatura': lote.groupby('asignatura')[COLUMNAS_SUMA + COLUMNAS_SUMA_NOTAS].sum(),
+        'por_estudiante': por_estudiante
+    }
+    return detalle, resumenes
+
+
+def _combinar_resumenes(actuales, nuevos):
+    """Suma los agregados de un lote a los acumulados (solo toca las claves del lote y los totales)"""
+    combinados = {}
+    for nombre, nuevo in nuevos.items():
+        actual = actuales[nombre]
+        numericas = [c for c in nuevo.columns if c != 'nombre']
+        suma = actual[numericas].add(nuevo[numericas], fill_value=0)
+        if 'nombre' in nuevo.columns:
+            nombres = nuevo['nombre'].combine_first(actual['nombre'])
+            suma.insert(0, 'nombre', nombres.reindex(suma.index))
+        combinados[nombre] = suma
+    return combinados
+
+
+def _leer_filas_nuevas(ruta_csv, posicion, columnas):
+    """
+    Lee solo los bytes agregados al CSV desde `posicion`, hasta el último salto de línea.
+
+    Returns:
+        (DataFrame con las filas nuevas, nueva posición)
+    """
+    with open(ruta_csv, 'rb') as f:
+        f.seek(posicion)
+        datos = f.read()
+
+    fin = datos.rfind(b'\n') + 1
+    if fin == 0:
+        return None, posicion
+
+    df = pd.read_csv(io.BytesIO(datos[:fin]), header=None, names=columnas,
+                     dtype={c: t for c, t in ESQUEMA.items() if c in columnas})
+    return df, posicion + fin
+
+
+def actualizar_agregados(ruta_csv=RUTA_CSV, directorio=None, reconstruir=False):
+    """
+    Incorpora al almacén las filas agregadas al CSV desde la última actualización.
+
+    Si el CSV se acortó, cambió su encabezado o cambiaron los bytes ya
+    procesados (se reescribió en lugar de crecer), o si reconstruir=True, el
+    almacén se vuelve a construir desde cero. En otro caso, el costo depende
+    solo del tamaño del lote nuevo (más el tamaño de los resúmenes).
+
+    De los bytes ya procesados solo se comparan el inicio y el final
+    (BYTES_HUELLA de cada lado): un cambio solo en el medio del historial no
+    se detecta y requiere reconstruir=True.
+
+    Returns:
+        Número de filas nuevas incorporadas
+    """
+    directorio = directorio or ruta_almacen(ruta_csv)
+    os.makedirs(directorio, exist_ok=True)
+
+    with open(ruta_csv, 'rb') as f:
+        encabezado = f.readline()
+    columnas = encabezado.decode('utf-8').strip().split(',')
+    tamano = os.path.getsize(ruta_csv)
+
+    # Las sumas guardadas dependen de la nota por fila: otra política obliga a reconstruir
+    politica = politica_notas.politica_activa()
+    firma = None if politica_notas.es_simple(politica) else {'pesos': politica['pesos'], 'escalas': politica['escalas']}
+
+    estado = None if reconstruir else _leer_estado(directorio)
+    if estado is not None and (estado['encabezado'] != columnas or estado['posicion'] > tamano
+                               or _huella_prefijo(ruta_csv, estado['posicion']) != estado['huella']):
+        print(" El CSV cambió de forma no incremental: se reconstruye el almacén.")
+        estado = None
+    if estado is not None and estado.get('politica') != firma:
+        print(" Cambió la política de calificación: se reconstruye el almacén.")
+        estado = None
+
+    reconstruido = estado is None
+    if reconstruido:
+        # Primero se invalida el estado: si el borrado se interrumpe, la próxima vez se reconstruye
+        if os.path.exists(os.path.join(directorio, 'estado.json')):
+            os.remove(os.path.join(directorio, 'estado.json'))
+        for archivo in _archivos_de_datos(directorio):
+            os.remove(os.path.join(directorio, archivo))
+        estado = {'version': VERSION_ALMACEN, 'encabezado': columnas, 'posicion': len(encabezado),
+                  'huella': _huella_prefijo(ruta_csv, len(encabezado)), 'filas': 0, 'segmentos': [],
+                  'resumenes': None, 'politica': firma}
+        resumenes = _resumenes_vacios()
+    else:
+        _borrar_huerfanos(directorio, estado)
+        resumenes = cargar_resumenes(directorio, estado)
+
+    df_nuevo, posicion = _leer_filas_nuevas(ruta_csv, estado['posicion'], columnas)
+    if df_nuevo is None or df_nuevo.empty:
+        if reconstruido:
+            # Sin filas: el almacén queda vacío, no con el estado de antes de reconstruir
+            estado['resumenes'] = 'resumenes-0000.npz'
+            _guardar_npz(os.path.join(directorio, estado['resumenes']), resumenes)
+            _guardar_estado(directorio, estado)
+        return 0
+
+    detalle, resumenes_lote = agregar_lote(df_nuevo)
+    resumenes = _combinar_resumenes(resumenes, resumenes_lote)
+
+    # El detalle del lote se guarda como un segmento nuevo y los resúmenes con otro
+    # nombre: no se reescribe nada de lo que apunta el estado vigente
+    lotes = len(estado['segmentos'])
+    segmento = f"segmento-{lotes:04d}.npz"
+    anteriores = estado['resumenes']
+    _guardar_npz(os.path.join(directorio, segmento), {'detalle': detalle})
+    _guardar_npz(os.path.join(directorio, f"resumenes-{lotes + 1:04d}.npz"), resumenes)
+
+    estado['segmentos'].append(segmento)
+    estado['resumenes'] = f"resumenes-{lotes + 1:04d}.npz"
+    estado['posicion'] = posicion
+    estado['huella'] = _huella_prefijo(ruta_csv, posicion)
+    estado['filas'] += len(df_nuevo)
+    # Confirmación del lote
+    _guardar_estado(directorio, estado)
+    if anteriores is not None:
+        os.remove(os.path.join(directorio, anteriores))
+
+    return len(df_nuevo)
+
+
+def cargar_resumenes(directorio, estado=None):
+    """Lee los resúmenes vigentes del almacén (los que indica estado.json)"""
+    estado = estado or _leer_estado(directorio)
+    return _leer_npz(os.path.join(directorio, estado['resumenes']), {
+        'por_periodo': 'periodo',
+        'por_asignatura': 'asignatura',
+        'por_estudiante': 'id_estudiante'
+    })
+
+
+def cargar_detalle(directorio):
+    """Une los segmentos de detalle (estudiante, asignatura, periodo) del almacén"""
+    estado = _leer_estado(directorio)
+    partes = [
+        _leer_npz(os.path.join(directorio, s), {'detalle': ['id_estudiante', 'asignatura', 'periodo']})['detalle']
+        for s in estado['segmentos']
+    ]
+    return pd.concat(partes).groupby(level=[0, 1, 2]).sum()
+
+
+def promedios_por_periodo(resumenes):
+    """Promedio del curso en cada periodo (HU01)"""
+    por_periodo = resumenes['por_periodo']
+    return (por_periodo['suma'] / por_periodo['conteo']).rename('promedio')
+
+
+def promedios_por_asignatura(resumenes):
+    """Promedio, desviación estándar (muestral) y registros por asignatura (HU05)"""
+    a = resumenes['por_asignatura']
+    n = a['conteo']
+    varianza = (a['suma_cuadrados'] - a['suma'] ** 2 / n) / (n - 1)
+    tabla = pd.DataFrame({
+        'Promedio_General': a['suma'] / n,
+        'Desviacion_Std': np.sqrt(varianza.clip(lower=0)),
+        'Total_Registros': n.astype(int),
+        'Promedio_Nota1': a['suma_nota1'] / n,
+        'Promedio_Nota2': a['suma_nota2'] / n,
+        'Promedio_Nota3': a['suma_nota3'] / n
+    }).round(2)
+    return tabla.sort_values('Promedio_General')
+
+
+def promedios_por_estudiante(resumenes):
+    """Promedio acumulado de cada estudiante (HU08)"""
+    e = resumenes['por_estudiante']
+    return pd.DataFrame({
+        'id_estudiante': e.index.to_numpy(),
+        'nombre': e['nombre'].to_numpy(),
+        'promedio_actual': (e['suma'] / e['conteo']).round(2).to_numpy()
+    })
+
+
+def reporte_desde_agregados(resumenes, reglas=None):
+    """
+    Reporte general de HU08 calculado solo con los agregados.
+
+    Raises:
+        ValueError: Si la política pondera los periodos (los agregados por
+            estudiante no guardan el promedio de cada periodo)
+    """
+    hu08 = importar_script('reporte_general_hu08.py')
+    reglas = reglas or hu08.reglas_reporte()
+    if reglas.get('pesos_periodos') is not None:
+        raise ValueError("La política de calificación pondera los periodos: el reporte por estudiante "
+                         "no se puede calcular desde los agregados (usa la ejecución en memoria)")
+    reporte = promedios_por_estudiante(resumenes)
+    periodos_actuales = resumenes['por_periodo'].index.max()
+    reporte['necesita_en_periodo4'] = hu08.calcular_necesita(
+        reporte['promedio_actual'].to_numpy(), periodos_actuales, reglas
+    )
+    reporte['estado'] = hu08.clasificar_estados(reporte['promedio_actual'].to_numpy(), reglas)
+    return reporte
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Actualiza y consulta el almacén incremental de agregados")
+    parser.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--almacen', default=None, help="Directorio del almacén (default: <csv>.agregados)")
+    parser.add_argument('--reconstruir', action='store_true', help="Vuelve a construir el almacén desde cero")
+    args = parser.parse_args()
+
+    directorio = args.almacen or ruta_almacen(args.input)
+    try:
+        nuevas = actualizar_agregados(args.input, directorio, args.reconstruir)
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{args.input}' NO ENCONTRADO.")
+        return
+    print(f" Filas nuevas incorporadas: {nuevas}")
+
+    resumenes = cargar_resumenes(directorio)
+
+    print("\n--- Promedios del Curso por Periodo (HU01) ---")
+    for periodo, promedio in promedios_por_periodo(resumenes).items():
+        print(f" Periodo {int(periodo)}: {promedio:.2f}")
+
+    print("\n--- Promedios por Asignatura (HU05) ---")
+    print(promedios_por_asignatura(resumenes).to_string(float_format=lambda x: f"{x:.2f}"))
+
+    reporte = reporte_desde_agregados(resumenes)
+    print("\n--- Reporte General (HU08) ---")
+    print(f" Estudiantes: {len(reporte)}  Promedio del grupo: {reporte['promedio_actual'].mean():.2f}")
+    print(f" En riesgo: {(reporte['estado'] == 'En riesgo').mean() * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
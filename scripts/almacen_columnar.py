@@ -0,0 +1,187 @@
+"""
+Almacenamiento columnar particionado
+Guarda el dataset de notas como un directorio con un archivo .npy por
+columna, separado en particiones por periodo (y opcionalmente por
+asignatura):
+
+    <base>.particionado/
+        manifiesto.json
+        periodo=1/id_estudiante.npy, nombre.npy, nota1.npy, ...
+        periodo=1/asignatura=Algoritmos/...   (con por_asignatura=True)
+
+Al leer solo se abren las columnas pedidas y las particiones que cumplen
+el filtro: HU01 lee las notas sin tocar nombres ni asistencia, y una HU07
+de un solo periodo no abre los demás periodos. Las columnas de texto se
+guardan como códigos enteros con las categorías en el manifiesto.
+"""
+
+import json
+import os
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+# --- Constantes y Configuración ---
+SUFIJO_PARTICIONADO = '.particionado'
+MANIFIESTO = 'manifiesto.json'
+VERSION_ALMACEN = 1
+COLUMNAS_CATEGORICAS = ('nombre', 'asignatura')
+
+
+def ruta_particionada(ruta_csv):
+    """Directorio particionado asociado a la ruta de un CSV"""
+    return os.path.splitext(ruta_csv)[0] + SUFIJO_PARTICIONADO
+
+
+def es_particionado(ruta):
+    """True si la ruta es un directorio escrito por escribir_particionado"""
+    return os.path.isdir(ruta) and os.path.exists(os.path.join(ruta, MANIFIESTO))
+
+
+def _nombre_particion(clave, valor):
+    """Directorio de una partición al estilo 'columna=valor' (el valor se escapa)"""
+    return f"{clave}={quote(str(valor), safe=' ')}"
+
+
+def escribir_particionado(df, directorio, por_asignatura=False):
+    """
+    Escribe el DataFrame como columnas .npy particionadas.
+
+    Args:
+        df: Datos de notas (con periodo y, si por_asignatura, asignatura)
+        directorio: Directorio de salida (se reemplaza su manifiesto)
+        por_asignatura: True para particionar también por asignatura
+
+    Returns:
+        El manifiesto escrito
+    """
+    claves = ['periodo', 'asignatura'] if por_asignatura else ['periodo']
+    columnas = [c for c in df.columns if c not in claves]
+
+    # Categorías globales: los códigos significan lo mismo en todas las particiones
+    categorias = {}
+    codigos = {}
+    for columna in COLUMNAS_CATEGORICAS:
+        if columna in df.columns:
+            serie = df[columna].astype('category')
+            categorias[columna] = serie.cat.categories.astype(str).tolist()
+            codigos[columna] = serie.cat.codes.to_numpy()
+
+    particiones = []
+    for valores, filas in df.groupby(claves, sort=True, observed=True).indices.items():
+        valores = valores if isinstance(valores, tuple) else (valores,)
+        valores = [v.item() if hasattr(v, 'item') else str(v) for v in valores]
+        ruta_relativa = os.path.join(*[_nombre_particion(c, v) for c, v in zip(claves, valores)])
+        ruta = os.path.join(directorio, ruta_relativa)
+        os.makedirs(ruta, exist_ok=True)
+
+        for columna in columnas:
+            datos = codigos[columna][filas] if columna in codigos else df[columna].to_numpy()[filas]
+            np.save(os.path.join(ruta, f'{columna}.npy'), datos)
+
+        particion = dict(zip(claves, valores))
+        particion.update(ruta=ruta_relativa, filas=int(len(filas)))
+        particiones.append(particion)
+
+    manifiesto = {
+        'version': VERSION_ALMACEN,
+        'columnas': list(df.columns),
+        'particion_por': claves,
+        'tipos': {c: str(df[c].dtype) for c in df.columns if c not in categorias},
+        'categorias': categorias,
+        'filas': int(len(df)),
+        'particiones': particiones
+    }
+    with open(os.path.join(directorio, MANIFIESTO), 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    return manifiesto
+
+
+def leer_manifiesto(directorio):
+    """Lee el manifiesto de un directorio particionado"""
+    with open(os.path.join(directorio, MANIFIESTO), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _seleccionar(manifiesto, periodos, asignaturas):
+    """Particiones que cumplen los filtros (las demás no se abren)"""
+    return [
+        p for p in manifiesto['particiones']
+        if (periodos is None or p['periodo'] in periodos)
+        and (asignaturas is None or 'asignatura' not in p or p['asignatura'] in asignaturas)
+    ]
+
+
+def num_particiones(directorio, periodos=None, asignaturas=None):
+    """Número de particiones que cumplen los filtros"""
+    return len(_seleccionar(leer_manifiesto(directorio), periodos, asignaturas))
+
+
+def iterar_particiones(directorio, columnas=None, periodos=None, asignaturas=None):
+    """
+    Recorre las particiones seleccionadas una por una (memoria acotada por partición).
+
+    Cada partición trae un periodo (o periodo y asignatura) de todos los
+    estudiantes: las filas de un estudiante quedan repartidas entre bloques.
+
+    Yields:
+        Un DataFrame por partición, con el formato de leer_particionado
+    """
+    manifiesto = leer_manifiesto(directorio)
+    for particion in _seleccionar(manifiesto, periodos, asignaturas):
+        filtro = {c: [particion[c]] for c in manifiesto['particion_por']}
+        yield leer_particionado(directorio, columnas, filtro.get('periodo'), filtro.get('asignatura', asignaturas))
+
+
+def leer_particionado(directorio, columnas=None, periodos=None, asignaturas=None):
+    """
+    Lee solo las columnas y particiones pedidas.
+
+    Args:
+        directorio: Directorio escrito por escribir_particionado
+        columnas: Columnas a leer (None = todas)
+        periodos: Periodos a leer (None = todos)
+        asignaturas: Asignaturas a leer (None = todas). Si el almacén no está
+            particionado por asignatura, el filtro se aplica a las filas.
+
+    Returns:
+        DataFrame con las columnas pedidas, con los mismos tipos que cargar_notas
+    """
+    manifiesto = leer_manifiesto(directorio)
+    claves = manifiesto['particion_por']
+    columnas = list(manifiesto['columnas'] if columnas is None else columnas)
+    desconocidas = set(columnas) - set(manifiesto['columnas'])
+    if desconocidas:
+        raise KeyError(f"Columnas que no están en el almacén: {', '.join(sorted(desconocidas))}")
+
+    # Filtro de asignatura sobre filas cuando no es clave de partición
+    filtrar_filas = asignaturas is not None and 'asignatura' not in claves
+    leer = columnas + ['asignatura'] if filtrar_filas and 'asignatura' not in columnas else columnas
+
+    partes = {c: [] for c in leer}
+    for particion in _seleccionar(manifiesto, periodos, asignaturas):
+        ruta = os.path.join(directorio, particion['ruta'])
+        for columna in leer:
+            if columna in claves:
+                valor = particion[columna]
+                if columna in manifiesto['categorias']:
+                    valor = manifiesto['categorias'][columna].index(valor)
+                datos = np.full(particion['filas'], valor)
+            else:
+                datos = np.load(os.path.join(ruta, f'{columna}.npy'))
+            partes[columna].append(datos)
+
+    datos = {}
+    for columna in leer:
+        valores = np.concatenate(partes[columna]) if partes[columna] else np.array([], dtype='int64')
+        if columna in manifiesto['categorias']:
+            datos[columna] = pd.Categorical.from_codes(valores.astype(np.int32),
+                                                       categories=manifiesto['categorias'][columna])
+        else:
+            datos[columna] = valores.astype(manifiesto['tipos'][columna], copy=False)
+    df = pd.DataFrame(datos, columns=leer)
+
+    if filtrar_filas:
+        df = df[df['asignatura'].isin(asignaturas)].reset_index(drop=True)[columnas]
+    return df
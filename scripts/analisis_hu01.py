@@ -1,17 +1,73 @@
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 
+from carga_datos import cargar_notas, agregar_promedio_fila, COLUMNA_PROMEDIO
+from graficos import obtener_figura, guardar_figura
+from instrumentacion import etapa
+from politica_notas import pesos_de_periodos
+
 # --- Constantes y Configuración ---
 COLUMNAS_NOTAS = ['nota1', 'nota2', 'nota3']
+# Solo se leen estas columnas (con un almacén particionado no se abren las demás)
+COLUMNAS_LECTURA = ['periodo'] + COLUMNAS_NOTAS
 OUTPUT_IMAGE = 'promedios_curso_hu01.png'
 CSV_FILE = '../data/data-generada.csv'
+PERIODOS_ANALISIS = [1, 2, 3]
+
+
+def calcular_promedios_periodos(df, periodos_analisis=PERIODOS_ANALISIS):
+    """
+    Calcula el promedio del curso en cada periodo y el promedio anual parcial.
+
+    Returns:
+        (Serie periodo -> promedio, promedio anual). El promedio anual es None
+        si falta algún periodo de periodos_analisis; si la política de
+        calificación tiene pesos de periodo, es el promedio ponderado.
+    """
+    # 1. Promedio simple de las 3 notas por fila (se reutiliza si ya existe)
+    agregar_promedio_fila(df)
+
+    # 2. Promedio del Curso por Periodo
+    promedios_periodos = df.groupby('periodo')[COLUMNA_PROMEDIO].mean()
+    promedios_periodos = promedios_periodos.loc[promedios_periodos.index.isin(periodos_analisis)]
+
+    # 3. Promedio Anual Parcial
+    if len(promedios_periodos) != len(periodos_analisis):
+        return promedios_periodos, None
+    pesos = pesos_de_periodos(promedios_periodos.index)
+    if pesos is None:
+        return promedios_periodos, promedios_periodos.mean()
+    return promedios_periodos, float(np.average(promedios_periodos, weights=pesos))
+
+
+def graficar_promedios_hu01(datos_grafico, ruta_salida=OUTPUT_IMAGE):
+    """Gráfico de barras con los promedios por periodo y el promedio anual"""
+    nombres = list(datos_grafico.keys())
+    valores = list(datos_grafico.values())
+    colores = ['skyblue', 'lightgreen', 'salmon', 'gold']
+
+    fig, ax = obtener_figura('barras')
+    barras = ax.bar(nombres, valores, color=colores)
+
+    for bar in barras:
+        yval = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2, yval - 0.2, f'{yval:.2f}', ha='center', va='bottom',
+                fontweight='bold', color='black')
 
+    ax.set_title('Promedio del Curso por Periodo y Promedio Anual Parcial', fontsize=14)
+    ax.set_xlabel('Resultados del Curso', fontsize=12)
+    ax.set_ylabel('Calificación Promedio', fontsize=12)
+    ax.set_ylim(0, 5.5)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
 
-def calcular_y_graficar_promedios_hu01(csv_path):
+    return guardar_figura(fig, ruta_salida)
+
+
+def calcular_y_graficar_promedios_hu01(csv_path, ruta_grafico=OUTPUT_IMAGE, graficar=True):
     """
     Implementa la HU01 con manejo de errores de ruta y codificación.
+
+    Con graficar=False solo muestra los resultados en consola (no importa matplotlib).
     """
     print(f"---  Análisis de Promedios del Curso (HU01) ---")
 
@@ -19,8 +75,9 @@ def calcular_y_graficar_promedios_hu01(csv_path):
 
     # --- Lógica de Lectura  ---
     try:
-        df = pd.read_csv(csv_path)
-        print(f" Archivo '{csv_path}' leído exitosamente con codificación por defecto.")
+        # cargar_notas reintenta con 'latin-1' si la codificación por defecto falla
+        df = cargar_notas(csv_path, columnas=COLUMNAS_LECTURA)
+        print(f" Archivo '{csv_path}' leído exitosamente.")
 
     except FileNotFoundError:
         full_path = os.path.abspath(csv_path)
@@ -29,34 +86,19 @@ def calcular_y_graficar_promedios_hu01(csv_path):
         print("         **Asegúrate de que el CSV esté en la misma carpeta que el script.**")
         return
 
-    except Exception as e_default:
-        print(
-            f"  Advertencia: Falló la lectura con codificación por defecto ({e_default}). Intentando con 'latin-1'...")
-        try:
-            df = pd.read_csv(csv_path, encoding='latin-1')
-            print(f" Archivo '{csv_path}' leído exitosamente con codificación 'latin-1'.")
-        except Exception as e_retry:
-            print(f" ERROR CRÍTICO: Falló la lectura del archivo CSV incluso con 'latin-1'.")
-            print(f"         Revisa el formato del archivo o el separador (debe ser coma ',').")
-            print(f"         Error final: {e_retry}")
-            return
+    except Exception as e_retry:
+        print(f" ERROR CRÍTICO: Falló la lectura del archivo CSV.")
+        print(f"         Revisa el formato del archivo o el separador (debe ser coma ',').")
+        print(f"         Error final: {e_retry}")
+        return
 
     # --- Continúa el Análisis Solo si la lectura fue exitosa ---
     if df is not None:
         print(f" {len(df)} filas encontradas y listas para analizar.")
 
-        # 1. Calcular el promedio simple de las 3 notas por fila
-        df['promedio_parcial'] = df[COLUMNAS_NOTAS].mean(axis=1)
-
-        # 2. Calcular el Promedio del Curso por Periodo
-        promedios_periodos = df.groupby('periodo')['promedio_parcial'].mean()
-        periodos_analisis = [1, 2, 3]
-        promedios_periodos = promedios_periodos.loc[promedios_periodos.index.isin(periodos_analisis)]
-
-        # 3. Calcular el Promedio Anual Parcial
-        if len(promedios_periodos) == len(periodos_analisis):
-            promedio_anual = promedios_periodos.mean()
-        else:
+        with etapa('calculo', len(df), hu='HU01'):
+            promedios_periodos, promedio_anual = calcular_promedios_periodos(df)
+        if promedio_anual is None:
             print(" Advertencia: Faltan datos para uno o más periodos (1-3). Finalizando.")
             return
 
@@ -74,27 +116,9 @@ def calcular_y_graficar_promedios_hu01(csv_path):
         print(f"\n**Promedio Anual Parcial del Curso (P1-3):** {promedio_anual:.2f}")
 
         # --- Generación del Gráfico ---
-
-        nombres = list(datos_grafico.keys())
-        valores = list(datos_grafico.values())
-        colores = ['skyblue', 'lightgreen', 'salmon', 'gold']
-
-        plt.figure(figsize=(10, 6))
-        barras = plt.bar(nombres, valores, color=colores)
-
-        for bar in barras:
-            yval = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width() / 2, yval - 0.2, f'{yval:.2f}', ha='center', va='bottom',
-                     fontweight='bold', color='black')
-
-        plt.title('Promedio del Curso por Periodo y Promedio Anual Parcial', fontsize=14)
-        plt.xlabel('Resultados del Curso', fontsize=12)
-        plt.ylabel('Calificación Promedio', fontsize=12)
-        plt.ylim(0, 5.5)
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-
-        plt.savefig(OUTPUT_IMAGE)
-        print(f"\n Gráfico generado y guardado como: **{OUTPUT_IMAGE}**")
+        if graficar:
+            ruta_grafico = graficar_promedios_hu01(datos_grafico, ruta_grafico)
+            print(f"\n Gráfico generado y guardado como: **{ruta_grafico}**")
 
 
 #
@@ -1,22 +1,155 @@
 
 import pandas as pd
 import numpy as np
+import argparse
 import os
 
+from carga_datos import cargar_notas, agregar_promedio_fila, COLUMNA_PROMEDIO
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
 # --- Constantes y Configuración ---
 COLUMNAS_NOTAS = ['nota1', 'nota2', 'nota3']
+COLUMNAS_LECTURA = ['id_estudiante', 'nombre', 'asignatura', 'periodo'] + COLUMNAS_NOTAS
 CSV_FILE = '../data/data-generada.csv'
 OUTPUT_CSV = 'cambios_bruscos.csv'
 UMBRAL_DIFERENCIA = 1.0
 
-def detectar_cambios_bruscos(csv_path, umbral=UMBRAL_DIFERENCIA):
+def _codigos(serie):
+    """Códigos enteros de una columna (los de la categoría si ya es categórica)"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), serie.cat.categories
+    codigos, categorias = pd.factorize(serie)
+    return codigos, categorias
+
+def _promedios_por_segmento(claves, valores):
+    """
+    Ordena por las claves y promedia los valores de cada segmento de claves iguales.
+
+    Args:
+        claves: Lista de arreglos enteros; el último es el periodo
+        valores: Arreglo con el valor de cada fila
+
+    Returns:
+        (orden, inicios de segmento en el orden, claves de cada segmento, promedio de cada segmento)
+    """
+    # np.lexsort usa la última clave como principal
+    orden = np.lexsort(claves[::-1])
+    ordenadas = [clave[orden] for clave in claves]
+
+    nuevo_segmento = np.zeros(len(orden), dtype=bool)
+    nuevo_segmento[:1] = True
+    for clave in ordenadas:
+        nuevo_segmento[1:] |= clave[1:] != clave[:-1]
+    inicios = np.flatnonzero(nuevo_segmento)
+
+    sumas = np.add.reduceat(valores[orden], inicios) if len(inicios) else np.array([])
+    conteos = np.diff(np.r_[inicios, len(orden)])
+    return orden, inicios, [clave[inicios] for clave in ordenadas], sumas / conteos
+
+def _transiciones(claves_segmento, promedios):
+    """
+    Diferencias entre periodos consecutivos de la misma entidad.
+
+    Returns:
+        (posición del segmento de origen de cada transición, diferencia)
+    """
+    misma_entidad = np.ones(max(len(promedios) - 1, 0), dtype=bool)
+    for clave in claves_segmento[:-1]:
+        misma_entidad &= clave[1:] == clave[:-1]
+    origen = np.flatnonzero(misma_entidad)
+    return origen, promedios[origen + 1] - promedios[origen]
+
+def calcular_cambios_bruscos(df, umbral=UMBRAL_DIFERENCIA, por_asignatura=False):
+    """
+    Detecta cambios bruscos entre periodos consecutivos para cualquier número de periodos.
+
+    En lugar de pivotar, ordena las filas por (estudiante, [asignatura,]
+    periodo), promedia cada segmento contiguo y compara cada segmento con el
+    siguiente del mismo estudiante (o estudiante y asignatura).
+
+    Args:
+        umbral: Diferencia absoluta mínima para marcar el cambio
+        por_asignatura: True para detectar cambios por estudiante y asignatura;
+            False para el promedio del estudiante en todas sus asignaturas
+
+    Returns:
+        DataFrame con una fila por transición marcada: id_estudiante, nombre,
+        asignatura, periodo_desde, periodo_hasta, promedio_desde,
+        promedio_hasta y diferencia. En el modo por estudiante, `asignatura`
+        es la asignatura que más cambió en esa transición.
+    """
+    agregar_promedio_fila(df)
+
+    ids = df['id_estudiante'].to_numpy()
+    periodos = df['periodo'].to_numpy()
+    valores = df[COLUMNA_PROMEDIO].to_numpy(dtype='float64')
+    codigos_asig, asignaturas = _codigos(df['asignatura'])
+
+    # Transiciones por estudiante y asignatura (se necesitan en ambos modos)
+    orden_a, inicios_a, (id_a, asig_a, per_a), prom_a = _promedios_por_segmento(
+        [ids, codigos_asig, periodos], valores
+    )
+    origen_a, dif_a = _transiciones([id_a, asig_a, per_a], prom_a)
+
+    if por_asignatura:
+        marcadas = origen_a[np.abs(dif_a) > umbral]
+        fila_origen = orden_a[inicios_a[marcadas]]
+        resultado = {
+            'id_estudiante': id_a[marcadas],
+            'asignatura': asignaturas[asig_a[marcadas]],
+            'periodo_desde': per_a[marcadas],
+            'periodo_hasta': per_a[marcadas + 1],
+            'promedio_desde': prom_a[marcadas],
+            'promedio_hasta': prom_a[marcadas + 1],
+            'diferencia': prom_a[marcadas + 1] - prom_a[marcadas]
+        }
+    else:
+        orden_e, inicios_e, (id_e, per_e), prom_e = _promedios_por_segmento([ids, periodos], valores)
+        origen_e, dif_e = _transiciones([id_e, per_e], prom_e)
+        seleccion = np.abs(dif_e) > umbral
+        marcadas = origen_e[seleccion]
+        fila_origen = orden_e[inicios_e[marcadas]]
+
+        # Asignatura que más cambió en cada transición (estudiante, periodo_hasta):
+        # se ordena por |diferencia| descendente y se toma el primero de cada grupo
+        id_t, hasta_t = id_a[origen_a + 1], per_a[origen_a + 1]
+        orden_t = np.lexsort((-np.abs(dif_a), hasta_t, id_t))
+        # Con len(orden_t), no np.r_[True, ...]: sin transiciones queda vacío
+        primero = np.ones(len(orden_t), dtype=bool)
+        primero[1:] = (id_t[orden_t][1:] != id_t[orden_t][:-1]) | (hasta_t[orden_t][1:] != hasta_t[orden_t][:-1])
+        mayores = orden_t[primero]
+        mayor_por_transicion = pd.Series(
+            asig_a[origen_a[mayores]],
+            index=pd.MultiIndex.from_arrays([id_t[mayores], hasta_t[mayores]])
+        )
+        claves_marcadas = pd.MultiIndex.from_arrays([id_e[marcadas], per_e[marcadas + 1]])
+        # Si faltan filas, una transición del estudiante puede no tener ninguna por asignatura
+        mayor = mayor_por_transicion.reindex(claves_marcadas, fill_value=-1).to_numpy()
+
+        resultado = {
+            'id_estudiante': id_e[marcadas],
+            'asignatura': np.where(mayor >= 0, np.asarray(asignaturas, dtype=object)[mayor], None),
+            'periodo_desde': per_e[marcadas],
+            'periodo_hasta': per_e[marcadas + 1],
+            'promedio_desde': prom_e[marcadas],
+            'promedio_hasta': prom_e[marcadas + 1],
+            'diferencia': dif_e[seleccion]
+        }
+
+    resultado['nombre'] = df['nombre'].to_numpy()[fila_origen]
+    columnas = ['id_estudiante', 'nombre', 'asignatura', 'periodo_desde', 'periodo_hasta',
+                'promedio_desde', 'promedio_hasta', 'diferencia']
+    return pd.DataFrame(resultado)[columnas]
+
+def detectar_cambios_bruscos(csv_path, umbral=UMBRAL_DIFERENCIA, por_asignatura=False, output_csv=OUTPUT_CSV):
     """
     Detecta estudiantes con cambios bruscos en su rendimiento entre periodos.
     """
     print(f"---  Detección de Cambios Bruscos en Rendimiento (HU06) ---")
 
     try:
-        df = pd.read_csv(csv_path)
+        df = cargar_notas(csv_path, columnas=COLUMNAS_LECTURA)
         print(f" Archivo '{csv_path}' leído exitosamente.")
     except FileNotFoundError:
         print(f" ERROR: Archivo '{csv_path}' NO ENCONTRADO.")
@@ -27,40 +160,33 @@ def detectar_cambios_bruscos(csv_path, umbral=UMBRAL_DIFERENCIA):
 
     print(f" {len(df)} filas encontradas y listas para analizar.")
 
-    # Calcular el promedio de notas por estudiante y periodo
-    df['promedio_parcial'] = df[COLUMNAS_NOTAS].mean(axis=1)
-
-    # Pivotar para tener periodos como columnas
-    df_pivot = df.pivot_table(
-        index=['id_estudiante', 'nombre'],
-        columns='periodo',
-        values='promedio_parcial'
-    ).reset_index()
-
-    # Calcular diferencias entre periodos consecutivos
-    for periodo in [2, 3]:
-        df_pivot[f'diff_{periodo-1}_{periodo}'] = np.abs(
-            df_pivot[periodo] - df_pivot[periodo - 1]
-        )
-
-    # Filtrar estudiantes con diferencias mayores al umbral
-    condiciones = (
-        (df_pivot['diff_1_2'] > umbral) |
-        (df_pivot['diff_2_3'] > umbral)
-    )
-    df_cambios_bruscos = df_pivot[condiciones]
+    with etapa('calculo', len(df), hu='HU06'):
+        df_cambios_bruscos = calcular_cambios_bruscos(df, umbral, por_asignatura)
 
     if not df_cambios_bruscos.empty:
-        print(f" Estudiantes con cambios bruscos (> {umbral}): {len(df_cambios_bruscos)}")
-        print(df_cambios_bruscos[['id_estudiante', 'nombre', 'diff_1_2', 'diff_2_3']])
+        print(f" Estudiantes con cambios bruscos (> {umbral}): {df_cambios_bruscos['id_estudiante'].nunique()}")
+        print(f" Transiciones marcadas: {len(df_cambios_bruscos)}")
+        print(df_cambios_bruscos.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
 
         # Guardar resultados en CSV
-        df_cambios_bruscos.to_csv(OUTPUT_CSV, index=False)
-        print(f" Resultados guardados en '{OUTPUT_CSV}'")
+        with etapa('guardado', len(df_cambios_bruscos), archivo=os.path.basename(output_csv)):
+            df_cambios_bruscos.to_csv(output_csv, index=False)
+        print(f" Resultados guardados en '{output_csv}'")
     else:
         print(" No se detectaron cambios bruscos en el rendimiento.")
 def main():
     """Función principal"""
-    detectar_cambios_bruscos(CSV_FILE)
+    parser = argparse.ArgumentParser(description="HU06 - Detección de cambios bruscos en el rendimiento")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_DIFERENCIA,
+                        help="Diferencia mínima entre periodos consecutivos (default: %(default)s)")
+    parser.add_argument('--por-asignatura', action='store_true',
+                        help="Detecta cambios por estudiante y asignatura")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+
+    detectar_cambios_bruscos(CSV_FILE, args.umbral, args.por_asignatura)
 if __name__ == "__main__":
     main()
@@ -0,0 +1,416 @@
+"""
+Carga compartida del archivo de notas (data-generada.csv)
+Lee el CSV con un esquema explícito y mantiene una caché binaria columnar
+junto al archivo, para que las siguientes ejecuciones no vuelvan a parsearlo.
+Si el CSV se convirtió al formato compilado (formato_compilado.py), se abre
+ese formato mapeado en memoria en lugar de leer la caché.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import zipfile
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from instrumentacion import etapa
+from almacen_columnar import es_particionado, leer_particionado, iterar_particiones, num_particiones, ruta_particionada
+from formato_compilado import es_compilado, abrir_compilado, escribir_compilado, leer_meta, ruta_compilada
+from esquema_estrella import es_estrella, leer_estrella, iterar_estrella, ruta_estrella
+from politica_notas import promedio_fila, con_columnas_politica
+
+# --- Constantes y Configuración ---
+RUTA_CSV = os.path.join('..', 'data', 'data-generada.csv')
+COLUMNAS_NOTAS = ['nota1', 'nota2', 'nota3']
+
+# Promedio simple de las 3 notas de cada fila, compartido por todas las HU
+COLUMNA_PROMEDIO = 'promedio_parcial'
+
+# Tipos de cada columna: IDs enteros, textos repetidos como categorías
+# y valores decimales en float32 (las notas solo tienen 2 decimales)
+ESQUEMA = {
+    'id_estudiante': 'int32',
+    'nombre': 'category',
+    'asignatura': 'category',
+    'periodo': 'int8',
+    'nota1': 'float32',
+    'nota2': 'float32',
+    'nota3': 'float32',
+    'asistencia_%': 'float32',
+    'participacion': 'float32'
+}
+
+# La caché se guarda como <archivo>.cache.npz (un arreglo por columna)
+SUFIJO_CACHE = '.cache.npz'
+VERSION_CACHE = 1
+TAMANO_LECTURA_HASH = 1 << 20
+
+
+def leer_csv_tipado(ruta_csv, columnas=None):
+    """
+    Lee el CSV aplicando el esquema; si falla la codificación UTF-8 reintenta con 'latin-1'.
+
+    Con `columnas` solo se convierten esas columnas (las que no existan se ignoran).
+    """
+    usecols = None if columnas is None else set(columnas).__contains__
+    try:
+        return pd.read_csv(ruta_csv, dtype=ESQUEMA, usecols=usecols)
+    except UnicodeDecodeError:
+        return pd.read_csv(ruta_csv, dtype=ESQUEMA, usecols=usecols, encoding='latin-1')
+
+
+def _resolver_ruta(ruta_csv):
+    """La ruta, o su <base>.compilado, <base>.particionado o <base>.estrella si el CSV no existe"""
+    if not os.path.exists(ruta_csv):
+        for alternativa in (ruta_compilada(ruta_csv), ruta_particionada(ruta_csv), ruta_estrella(ruta_csv)):
+            if es_compilado(alternativa) or es_particionado(alternativa) or es_estrella(alternativa):
+                return alternativa
+    return ruta_csv
+
+
+def cargar_notas(ruta_csv=RUTA_CSV, usar_cache=True, columnas=None, periodos=None, asignaturas=None):
+    """
+    Carga el archivo de notas con el esquema tipado.
+
+    Si existe una caché vigente junto al CSV se lee de ella sin parsear el
+    texto; si no, se lee el CSV y se (re)escribe la caché. La caché se
+    invalida cuando cambia el tamaño del CSV, o cuando cambia su fecha de
+    modificación y también su contenido (hash).
+
+    La ruta también puede ser un directorio de almacen_columnar (o el CSV
+    puede no existir y sí su <base>.particionado): entonces solo se leen
+    las columnas y particiones pedidas.
+
+    Con un directorio en esquema estrella (esquema_estrella.py) se lee la
+    tabla de hechos y el nombre y la asignatura se unen solo si se piden.
+
+    Si junto al CSV hay un <base>.compilado vigente (o la ruta es ese
+    directorio) las columnas se mapean en memoria sin parsear ni copiar.
+
+    Args:
+        ruta_csv: Ruta del archivo CSV, o del directorio particionado, compilado o en esquema estrella
+        usar_cache: False para leer siempre el CSV sin tocar la caché ni el compilado
+        columnas: Columnas a cargar (None = todas); siempre se agregan las
+            que usa la política de calificación activa
+        periodos: Periodos a cargar (None = todos)
+        asignaturas: Asignaturas a cargar (None = todas)
+
+    Returns:
+        DataFrame con las columnas del esquema
+
+    Raises:
+        FileNotFoundError: Si el CSV no existe
+    """
+    ruta_csv = _resolver_ruta(ruta_csv)
+    if not os.path.exists(ruta_csv):
+        raise FileNotFoundError(ruta_csv)
+    columnas = con_columnas_politica(columnas)
+
+    with etapa('carga', archivo=os.path.basename(ruta_csv)) as registro:
+        if es_particionado(ruta_csv):
+            df = leer_particionado(ruta_csv, columnas, periodos, asignaturas)
+            registro.update(filas=len(df), origen='particionado')
+            return df
+        if es_estrella(ruta_csv):
+            df = leer_estrella(ruta_csv, columnas, periodos, asignaturas)
+            registro.update(filas=len(df), origen='estrella')
+            return df
+
+        necesarias = None
+        if columnas is not None:
+            necesarias = list(columnas) + ['periodo'] * (periodos is not None) + ['asignatura'] * (asignaturas is not None)
+        compilado = _compilado_vigente(ruta_csv, usar_cache)
+        if compilado is not None:
+            df = abrir_compilado(compilado, necesarias)
+            registro['origen'] = 'compilado'
+        else:
+            df = _cargar_csv(ruta_csv, usar_cache, necesarias, registro)
+        if periodos is not None:
+            df = df[df['periodo'].isin(periodos)]
+        if asignaturas is not None:
+            df = df[df['asignatura'].isin(asignaturas)]
+        if columnas is not None:
+            df = df[[c for c in columnas if c in df.columns]]
+        if periodos is not None or asignaturas is not None:
+            df = df.reset_index(drop=True)
+        registro['filas'] = len(df)
+        return df
+
+
+def _compilado_vigente(ruta, usar_cache):
+    """Directorio compilado a usar para la ruta, o None si no hay uno vigente"""
+    if es_compilado(ruta):
+        return ruta
+    if not usar_cache:
+        return None
+
+    directorio = ruta_compilada(ruta)
+    if not es_compilado(directorio):
+        return None
+    meta = leer_meta(directorio)
+    if meta is None or not meta.get('fuente') or not _huella_vigente(ruta, meta['fuente']):
+        return None
+    return directorio
+
+
+def compilar_csv(ruta_csv=RUTA_CSV, destino=None):
+    """
+    Convierte el CSV al formato compilado (ver formato_compilado.py).
+
+    Args:
+        ruta_csv: CSV de notas
+        destino: Directorio de salida (None = <base>.compilado junto al CSV)
+
+    Returns:
+        (directorio escrito, metadatos)
+
+    Raises:
+        FileNotFoundError: Si el CSV no existe
+    """
+    destino = destino or ruta_compilada(ruta_csv)
+    with etapa('guardado', archivo=os.path.basename(destino)) as registro:
+        df = leer_csv_tipado(ruta_csv)
+        meta = escribir_compilado(df, destino, fuente=_huella(ruta_csv))
+        registro['filas'] = len(df)
+    return destino, meta
+
+
+def _cargar_csv(ruta_csv, usar_cache, columnas, registro):
+    """Lee el CSV completo desde la caché o el texto (sin caché, solo las columnas pedidas)"""
+    if usar_cache:
+        df = _leer_cache(ruta_csv)
+        if df is not None:
+            registro['origen'] = 'cache'
+            return df
+
+    registro['origen'] = 'csv'
+    if not usar_cache:
+        return leer_csv_tipado(ruta_csv, columnas)
+
+    df = leer_csv_tipado(ruta_csv)
+    try:
+        _escribir_cache(ruta_csv, df)
+    except OSError as e:
+        # Sin permisos de escritura junto al CSV: se sigue sin caché
+        print(f" Advertencia: no se pudo guardar la caché de '{ruta_csv}' ({e})")
+    return df
+
+
+def verificar_bloques_por_estudiante(ruta_csv=RUTA_CSV, periodos=None):
+    """
+    Comprueba que iterar_bloques pueda dar las filas de cada estudiante en bloques consecutivos.
+
+    Raises:
+        ValueError: Si la ruta (o su alternativa) es un directorio particionado
+            con más de una partición seleccionada
+    """
+    ruta_csv = _resolver_ruta(ruta_csv)
+    if es_particionado(ruta_csv) and num_particiones(ruta_csv, periodos) > 1:
+        raise ValueError(f"'{ruta_csv}' está particionado por periodo: sus bloques no agrupan las filas de "
+                         "cada estudiante (usa el CSV, el formato compilado o el esquema estrella)")
+
+
+def iterar_bloques(ruta_csv=RUTA_CSV, columnas=None, filas_por_bloque=1_000_000, periodos=None,
+                   por_estudiante=False):
+    """
+    Recorre el CSV por bloques de tamaño acotado con el esquema tipado.
+
+    Si la ruta es un directorio de almacen_columnar, cada bloque es una
+    partición y solo se abren las de los periodos pedidos. Con un formato
+    compilado vigente los bloques son porciones de las columnas mapeadas, y
+    con un esquema estrella son bloques de la tabla de hechos. Como en
+    cargar_notas, si el CSV no existe se usa su <base>.particionado,
+    <base>.compilado o <base>.estrella.
+
+    Args:
+        ruta_csv: Ruta del archivo CSV, o del directorio particionado, compilado o en esquema estrella
+        columnas: Columnas a leer (None = todas)
+        filas_por_bloque: Filas máximas de cada bloque (CSV y esquema estrella)
+        periodos: Periodos a leer (None = todos)
+        por_estudiante: True si quien lee necesita las filas de cada
+            estudiante en bloques consecutivos (HU04, HU06 y HU08 por bloques)
+
+    Yields:
+        DataFrames de hasta filas_por_bloque filas
+
+    Raises:
+        FileNotFoundError: Si no existe el CSV ni ninguna de sus alternativas
+        ValueError: Si por_estudiante=True y la ruta es un directorio con
+            varias particiones: cada una trae a todos los estudiantes
+    """
+    ruta_csv = _resolver_ruta(ruta_csv)
+    if not os.path.exists(ruta_csv):
+        raise FileNotFoundError(ruta_csv)
+    columnas = con_columnas_politica(columnas)
+
+    if por_estudiante:
+        verificar_bloques_por_estudiante(ruta_csv, periodos)
+    if es_particionado(ruta_csv):
+        yield from iterar_particiones(ruta_csv, columnas, periodos)
+        return
+    if es_estrella(ruta_csv):
+        yield from iterar_estrella(ruta_csv, columnas, filas_por_bloque, periodos)
+        return
+
+    leer = columnas
+    if columnas is not None and periodos is not None and 'periodo' not in columnas:
+        leer = list(columnas) + ['periodo']
+    compilado = _compilado_vigente(ruta_csv, usar_cache=True)
+    if compilado is not None:
+        df = abrir_compilado(compilado, leer)
+        lector = (df.iloc[inicio:inicio + filas_por_bloque] for inicio in range(0, len(df), filas_por_bloque))
+    else:
+        esquema = ESQUEMA if leer is None else {c: ESQUEMA[c] for c in leer if c in ESQUEMA}
+        lector = pd.read_csv(ruta_csv, dtype=esquema, usecols=leer, chunksize=filas_por_bloque)
+
+    for bloque in lector:
+        if periodos is not None:
+            bloque = bloque[bloque['periodo'].isin(periodos)]
+            if columnas is not None:
+                bloque = bloque[list(columnas)]
+        yield bloque
+
+
+def agregar_promedio_fila(df, politica=None):
+    """
+    Agrega la columna COLUMNA_PROMEDIO (nota de cada fila según la política de calificación).
+
+    Con la política simple es el promedio de nota1..nota3; con otra, la
+    suma ponderada de sus componentes (politica_notas). Si la columna ya
+    existe no se recalcula, así varias HU pueden trabajar sobre el mismo
+    DataFrame calculando el promedio una sola vez.
+
+    La columna es float64 aunque las notas sean float32: así los promedios
+    por grupo (y su redondeo a 2 decimales) no dependen del orden de las
+    filas. Las notas se llevan a sus 2 decimales antes de promediar, para
+    no arrastrar el error de representación de float32.
+    """
+    if COLUMNA_PROMEDIO not in df.columns:
+        df[COLUMNA_PROMEDIO] = promedio_fila(df, politica)
+    return df
+
+
+def importar_script(nombre_archivo):
+    """
+    Importa un script de la carpeta scripts/ como módulo.
+
+    Permite reutilizar las funciones de scripts cuyo nombre no es un
+    identificador válido de Python (p. ej. 'cambios-rendimiento-HU06.py').
+    """
+    nombre_modulo = os.path.splitext(nombre_archivo)[0].replace('-', '_').lower()
+    if nombre_modulo in sys.modules:
+        return sys.modules[nombre_modulo]
+
+    ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), nombre_archivo)
+    spec = importlib.util.spec_from_file_location(nombre_modulo, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    # Se registra antes de ejecutarlo para que sus funciones se puedan
+    # serializar (pickle) y usar desde otros procesos
+    sys.modules[nombre_modulo] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def ruta_cache(ruta_csv):
+    """Ruta de la caché binaria asociada a un CSV"""
+    return ruta_csv + SUFIJO_CACHE
+
+
+def _hash_archivo(ruta):
+    """Hash del contenido del archivo, leído por bloques"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAMANO_LECTURA_HASH), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _huella(ruta_csv, con_hash=True):
+    """Tamaño, fecha de modificación y (opcionalmente) hash del CSV"""
+    info = os.stat(ruta_csv)
+    huella = {'tamano': info.st_size, 'mtime_ns': info.st_mtime_ns}
+    if con_hash:
+        huella['hash'] = _hash_archivo(ruta_csv)
+    return huella
+
+
+def _cache_vigente(ruta_csv, meta):
+    """Compara la huella guardada en la caché con el CSV actual"""
+    if meta.get('version') != VERSION_CACHE:
+        return False
+    return _huella_vigente(ruta_csv, meta)
+
+
+def _huella_vigente(ruta_csv, huella):
+    """True si el CSV sigue siendo el de la huella guardada"""
+    actual = _huella(ruta_csv, con_hash=False)
+    if actual['tamano'] != huella['tamano']:
+        return False
+    if actual['mtime_ns'] == huella['mtime_ns']:
+        return True
+
+    # Misma longitud pero otra fecha: solo es válida si el contenido no cambió
+    return _hash_archivo(ruta_csv) == huella['hash']
+
+
+def _escribir_cache(ruta_csv, df):
+    """Guarda el DataFrame como arreglos por columna (las categorías como códigos + tabla)"""
+    arreglos = {}
+    for columna in df.columns:
+        serie = df[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            arreglos[f'{columna}__codigos'] = serie.cat.codes.to_numpy()
+            arreglos[f'{columna}__categorias'] = serie.cat.categories.to_numpy(dtype=str)
+        else:
+            arreglos[columna] = serie.to_numpy()
+
+    meta = _huella(ruta_csv)
+    meta['version'] = VERSION_CACHE
+    meta['columnas'] = list(df.columns)
+    arreglos['__meta__'] = np.array(json.dumps(meta))
+
+    # Escritura atómica: nunca queda una caché a medio escribir. El temporal
+    # tiene nombre único, así varios procesos pueden escribir la misma caché a la vez
+    destino = ruta_cache(ruta_csv)
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(destino)),
+                                            prefix=os.path.basename(destino) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            np.savez(f, **arreglos)
+        os.replace(temporal, destino)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+
+def _leer_cache(ruta_csv):
+    """Devuelve el DataFrame de la caché, o None si no existe o no está vigente"""
+    destino = ruta_cache(ruta_csv)
+    if not os.path.exists(destino):
+        return None
+
+    try:
+        with np.load(destino, allow_pickle=False) as datos:
+            meta = json.loads(str(datos['__meta__']))
+            if not _cache_vigente(ruta_csv, meta):
+                return None
+
+            columnas = {}
+            for columna in meta['columnas']:
+                if f'{columna}__codigos' in datos.files:
+                    columnas[columna] = pd.Categorical.from_codes(
+                        datos[f'{columna}__codigos'],
+                        categories=datos[f'{columna}__categorias']
+                    )
+                else:
+                    columnas[columna] = datos[columna]
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile, zlib.error):
+        # Caché dañada (p. ej. truncada) o de otro formato: se ignora y se regenera
+        return None
+
+    return pd.DataFrame(columnas)
@@ -1,20 +1,59 @@
 
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
+import argparse
 import os
+
+from carga_datos import cargar_notas, agregar_promedio_fila, COLUMNA_PROMEDIO, COLUMNAS_NOTAS
+from graficos import obtener_figura, guardar_figura
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+import distribucion_streaming
 CSV_FILE = '../data/data-generada.csv'
 OUTPUT_IMAGE = 'histograma_notas.png'
+NUM_BINS = 20
+
+def calcular_estadisticas_notas(df, bins=NUM_BINS):
+    """
+    Calcula media, mediana y conteos del histograma de las notas finales por periodo.
 
-def generar_histograma_notas(csv_path):
+    Las barras salen de la rejilla exacta de la política con la misma regla
+    entera que los modos por bloques y punto fijo (distribucion_streaming.histograma),
+    así que el histograma es el mismo en todos los modos. Solo una política sin
+    rejilla exacta usa np.histogram.
+
+    Returns:
+        Diccionario con 'media', 'mediana', 'conteos' y 'bordes'
+    """
+    agregar_promedio_fila(df)
+    valores = df[COLUMNA_PROMEDIO].to_numpy()
+    conteos, bordes = histograma_en_rejilla(valores, bins)
+    return {
+        'media': float(np.mean(valores)),
+        'mediana': float(np.median(valores)),
+        'conteos': conteos,
+        'bordes': bordes
+    }
+
+def histograma_en_rejilla(valores, bins=NUM_BINS):
+    """Conteos y bordes del histograma de `valores` en la rejilla de la política activa"""
+    resolucion = distribucion_streaming.resolucion_politica()
+    if resolucion is None:
+        return np.histogram(valores, bins=bins)
+    sketch = distribucion_streaming.crear_sketch(resolucion=resolucion)
+    return distribucion_streaming.histograma(distribucion_streaming.actualizar_sketch(sketch, valores), bins)
+
+def generar_histograma_notas(csv_path, periodos=None, ruta_grafico=OUTPUT_IMAGE, graficar=True):
     """
     Genera un histograma de las notas finales con líneas de media y mediana.
+
+    Solo se cargan las columnas de notas (y de `periodos`, si se indican).
+    Con graficar=False solo se muestran la media y la mediana.
     """
     print(f"---  Generación de Histograma de Notas Finales (HU07) ---")
 
 
     try:
-        df = pd.read_csv(csv_path)
+        df = cargar_notas(csv_path, columnas=COLUMNAS_NOTAS, periodos=periodos)
         print(f" Archivo '{csv_path}' leído exitosamente.")
     except FileNotFoundError:
         print(f" ERROR: Archivo '{csv_path}' NO ENCONTRADO.")
@@ -25,38 +64,113 @@ def generar_histograma_notas(csv_path):
 
     print(f" {len(df)} filas encontradas y listas para analizar.")
 
-    # 1. Crear columna promedio_periodo
-    df['promedio_periodo'] = df[['nota1', 'nota2', 'nota3']].mean(axis=1)
-
-    # 2. Calcular media y mediana
-    media = np.mean(df['promedio_periodo'])
-    mediana = np.median(df['promedio_periodo'])
+    # 1. Promedio por periodo y 2. media, mediana y conteos del histograma
+    with etapa('calculo', len(df), hu='HU07'):
+        estadisticas = calcular_estadisticas_notas(df)
+    media = estadisticas['media']
+    mediana = estadisticas['mediana']
     print(f" Media de notas finales: {media:.2f}")
     print(f" Mediana de notas finales: {mediana:.2f}")
 
     # 3. Graficar histograma
-    plt.figure(figsize=(10, 6))
-    plt.hist(df['promedio_periodo'], bins=20, color='skyblue', edgecolor='black', alpha=0.7)
-    plt.axvline(media, color='red', linestyle='dashed', linewidth=1, label=f'Media: {media:.2f}')
-    plt.axvline(mediana, color='green', linestyle='dashed', linewidth=1, label=f'Mediana: {mediana:.2f}')
-    plt.title('Histograma de Notas Finales por Periodo')
-    plt.xlabel('Nota Final')
-    plt.ylabel('Número de Estudiantes')
-    plt.legend()
-    plt.grid(axis='y', alpha=0.75)
+    if graficar:
+        ruta_grafico = graficar_histograma(estadisticas, ruta_grafico)
+        print(f" Histograma guardado en '{ruta_grafico}'")
+
+def generar_histograma_streaming(rutas, filas_por_bloque=distribucion_streaming.FILAS_POR_BLOQUE,
+                                 ruta_sketch=None, periodos=None, ruta_grafico=OUTPUT_IMAGE, graficar=True):
+    """
+    Genera el histograma leyendo los archivos por bloques, con memoria constante.
+
+    Args:
+        rutas: CSV de notas y/o resúmenes .npz guardados antes; todos se combinan
+        filas_por_bloque: Filas leídas a la vez de cada CSV
+        ruta_sketch: Si se indica, guarda el resumen combinado para reutilizarlo
+    """
+    print(f"---  Generación de Histograma de Notas Finales (HU07, modo streaming) ---")
+
+    sketches = []
+    for ruta in rutas:
+        try:
+            if ruta.endswith('.npz'):
+                sketches.append(distribucion_streaming.cargar_sketch(ruta))
+            else:
+                with etapa('calculo', hu='HU07', archivo=os.path.basename(ruta)) as registro:
+                    sketches.append(distribucion_streaming.sketch_desde_csv(ruta, filas_por_bloque,
+                                                                            periodos=periodos))
+                    registro['filas'] = sketches[-1]['total']
+        except FileNotFoundError:
+            print(f" ERROR: Archivo '{ruta}' NO ENCONTRADO.")
+            return
+        except ValueError as e:
+            print(f" ERROR: {e}")
+            return
+        print(f" Archivo '{ruta}' procesado: {sketches[-1]['total']} filas.")
+
+    try:
+        sketch = distribucion_streaming.combinar_sketches(sketches)
+    except ValueError as e:
+        print(f" ERROR: {e}")
+        return
+    if ruta_sketch:
+        distribucion_streaming.guardar_sketch(sketch, ruta_sketch)
+        print(f" Resumen de la distribución guardado en '{ruta_sketch}'")
+
+    estadisticas = distribucion_streaming.estadisticas(sketch, bins=NUM_BINS)
+    print(f" Media de notas finales: {estadisticas['media']:.2f}")
+    print(f" Mediana de notas finales: {estadisticas['mediana']:.2f}")
+    print(f" Percentiles 25/75/90: {estadisticas['p25']:.2f} / {estadisticas['p75']:.2f} / {estadisticas['p90']:.2f}")
+
+    if graficar:
+        ruta_grafico = graficar_histograma(estadisticas, ruta_grafico)
+        print(f" Histograma guardado en '{ruta_grafico}'")
+
+def graficar_histograma(estadisticas, ruta_salida=OUTPUT_IMAGE):
+    """Dibuja el histograma a partir de los conteos ya calculados (no necesita las notas)"""
+    media = estadisticas['media']
+    mediana = estadisticas['mediana']
+    bordes = estadisticas['bordes']
+
+    fig, ax = obtener_figura('histograma')
+    ax.hist(bordes[:-1], bins=bordes, weights=estadisticas['conteos'],
+            color='skyblue', edgecolor='black', alpha=0.7)
+    ax.axvline(media, color='red', linestyle='dashed', linewidth=1, label=f'Media: {media:.2f}')
+    ax.axvline(mediana, color='green', linestyle='dashed', linewidth=1, label=f'Mediana: {mediana:.2f}')
+    ax.set_title('Histograma de Notas Finales por Periodo')
+    ax.set_xlabel('Nota Final')
+    ax.set_ylabel('Número de Estudiantes')
+    ax.legend()
+    ax.grid(axis='y', alpha=0.75)
 
     # Guardar imagen
-    plt.savefig(OUTPUT_IMAGE)
-    print(f" Histograma guardado en '{OUTPUT_IMAGE}'")
-    plt.close()
-    plt.show()
+    return guardar_figura(fig, ruta_salida)
 def main():
     """Función principal del programa"""
+    parser = argparse.ArgumentParser(description="HU07 - Histograma de notas finales")
+    parser.add_argument('archivos', nargs='*', default=[CSV_FILE],
+                        help="CSV de notas o resúmenes .npz (varios se combinan en modo streaming)")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Lee por bloques con memoria constante en lugar de cargar todo el archivo")
+    parser.add_argument('--filas-por-bloque', type=int, default=distribucion_streaming.FILAS_POR_BLOQUE,
+                        help="Filas por bloque en modo streaming (default: %(default)s)")
+    parser.add_argument('--guardar-resumen', metavar='RUTA_NPZ',
+                        help="Guarda el resumen de la distribución para combinarlo después")
+    parser.add_argument('--periodo', type=int, action='append', default=None,
+                        help="Solo las notas de este periodo (se puede repetir)")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+
     print("\n" + "="*80)
     print("HU07 - HISTOGRAMA DE NOTAS FINALES DEL PERIODO".center(80))
     print("="*80)
 
-    generar_histograma_notas(CSV_FILE)
+    if args.streaming or len(args.archivos) > 1 or args.guardar_resumen:
+        generar_histograma_streaming(args.archivos, args.filas_por_bloque, args.guardar_resumen, args.periodo)
+    else:
+        generar_histograma_notas(args.archivos[0], args.periodo)
 if __name__ == "__main__":
     main()
 
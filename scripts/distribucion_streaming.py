@@ -0,0 +1,245 @@
+"""
+Distribución de notas por bloques (HU07 en modo streaming)
+Mantiene conteos en una rejilla fina de valores en lugar de guardar todas las
+notas: la memoria es constante, los conteos de varios archivos se pueden sumar
+y de ellos salen la media, los percentiles y el histograma.
+
+Como las notas tienen 2 decimales, el promedio de 3 notas siempre es un
+múltiplo de 1/300; con la resolución por defecto (1/300) los cuantiles son
+exactos. Con otra resolución el error máximo es de una celda.
+
+Con una política ponderada la nota de la fila es un múltiplo de otra rejilla
+(p. ej. 1/1000 con pesos 0.2/0.3/0.5): resolucion_politica() la calcula y el
+histograma de HU07 usa esa rejilla en todos los modos (en memoria, tensor,
+por bloques y punto fijo), así que las barras son las mismas en todos.
+"""
+
+import json
+import math
+from fractions import Fraction
+
+import numpy as np
+
+from carga_datos import iterar_bloques, COLUMNAS_NOTAS
+import politica_notas
+from politica_notas import promedio_fila
+
+# --- Constantes y Configuración ---
+NOTA_MIN = 0.0
+NOTA_MAX = 5.0
+RESOLUCION = 1 / 300
+FILAS_POR_BLOQUE = 1_000_000
+# Los componentes de la nota se escriben con 2 decimales
+UNIDAD_COMPONENTES = Fraction(1, 100)
+MAX_CELDAS = 1_000_000
+MAX_DENOMINADOR_PESO = 10 ** 6
+
+
+def _fraccion_exacta(valor):
+    """Fracción de denominador pequeño igual al float (None si no la hay)"""
+    fraccion = Fraction(valor).limit_denominator(MAX_DENOMINADOR_PESO)
+    return fraccion if math.isclose(float(fraccion), valor, rel_tol=1e-12, abs_tol=1e-15) else None
+
+
+def resolucion_politica(politica=None, nota_min=NOTA_MIN, nota_max=NOTA_MAX):
+    """
+    Rejilla en la que cae exactamente la nota de cada fila con la política.
+
+    La nota es la suma de componentes con 2 decimales por peso × escala, así
+    que es múltiplo de 0.01 por el máximo común divisor de esos factores
+    (1/300 con la política simple).
+
+    Returns:
+        La resolución, o None si los pesos no dan una rejilla de a lo más MAX_CELDAS celdas
+    """
+    politica = politica or politica_notas.politica_activa()
+    paso = Fraction(0)
+    for componente, peso in politica['pesos'].items():
+        factor = _fraccion_exacta(peso * politica['escalas'][componente])
+        if factor is None:
+            return None
+        # MCD de fracciones: mcd de numeradores cruzados / producto de denominadores
+        paso = Fraction(math.gcd(paso.numerator * factor.denominator, factor.numerator * paso.denominator),
+                        paso.denominator * factor.denominator)
+    if paso == 0:
+        return None
+    resolucion = float(paso * UNIDAD_COMPONENTES)
+    if (nota_max - nota_min) / resolucion + 1 > MAX_CELDAS:
+        return None
+    return resolucion
+
+
+def crear_sketch_politica(politica=None):
+    """
+    Resumen vacío con la rejilla exacta de la política.
+
+    Raises:
+        ValueError: Si los pesos de la política no caen en una rejilla exacta
+    """
+    politica = politica or politica_notas.politica_activa()
+    resolucion = resolucion_politica(politica)
+    if resolucion is None:
+        raise ValueError(f"La política '{politica['nombre']}' no da notas en una rejilla exacta: "
+                         "el histograma por bloques no la admite (usa la ejecución en memoria)")
+    return crear_sketch(resolucion=resolucion)
+
+
+def crear_sketch(nota_min=NOTA_MIN, nota_max=NOTA_MAX, resolucion=RESOLUCION):
+    """
+    Crea un resumen vacío de la distribución.
+
+    Returns:
+        Diccionario con los conteos por celda y las sumas para la media
+    """
+    num_celdas = int(round((nota_max - nota_min) / resolucion)) + 1
+    return {
+        'nota_min': nota_min,
+        'nota_max': nota_max,
+        'resolucion': resolucion,
+        'conteos': np.zeros(num_celdas, dtype=np.int64),
+        'total': 0,
+        'suma': 0.0,
+        'minimo': np.inf,
+        'maximo': -np.inf
+    }
+
+
+def actualizar_sketch(sketch, valores):
+    """Agrega un bloque de valores al resumen (los valores fuera de rango van al extremo)"""
+    valores = np.asarray(valores, dtype='float64')
+    valores = valores[~np.isnan(valores)]
+    if len(valores) == 0:
+        return sketch
+
+    celdas = np.rint((valores - sketch['nota_min']) / sketch['resolucion']).astype(np.int64)
+    np.clip(celdas, 0, len(sketch['conteos']) - 1, out=celdas)
+    sketch['conteos'] += np.bincount(celdas, minlength=len(sketch['conteos']))
+
+    sketch['total'] += len(valores)
+    sketch['suma'] += float(valores.sum())
+    sketch['minimo'] = min(sketch['minimo'], float(valores.min()))
+    sketch['maximo'] = max(sketch['maximo'], float(valores.max()))
+    return sketch
+
+
+def combinar_sketches(sketches):
+    """Suma varios resúmenes con la misma rejilla (p. ej. de varios cursos o fragmentos)"""
+    sketches = list(sketches)
+    base = sketches[0]
+    combinado = crear_sketch(base['nota_min'], base['nota_max'], base['resolucion'])
+
+    for sketch in sketches:
+        if (len(sketch['conteos']) != len(combinado['conteos']) or sketch['nota_min'] != base['nota_min']
+                or sketch['resolucion'] != base['resolucion']):
+            raise ValueError("Solo se pueden combinar resúmenes con la misma rejilla")
+        combinado['conteos'] += sketch['conteos']
+        combinado['total'] += sketch['total']
+        combinado['suma'] += sketch['suma']
+        combinado['minimo'] = min(combinado['minimo'], sketch['minimo'])
+        combinado['maximo'] = max(combinado['maximo'], sketch['maximo'])
+
+    return combinado
+
+
+def _valores_celdas(sketch):
+    """Valor representado por cada celda de la rejilla"""
+    return sketch['nota_min'] + np.arange(len(sketch['conteos'])) * sketch['resolucion']
+
+
+def media(sketch):
+    """Media exacta (se calcula con la suma, no con las celdas)"""
+    return sketch['suma'] / sketch['total'] if sketch['total'] else float('nan')
+
+
+def cuantil(sketch, q):
+    """
+    Cuantil q (0-1) con interpolación lineal, igual que np.quantile.
+
+    Para q = 0.5 coincide con np.median de los valores redondeados a la rejilla.
+    """
+    if sketch['total'] == 0:
+        return float('nan')
+
+    acumulado = np.cumsum(sketch['conteos'])
+    valores = _valores_celdas(sketch)
+
+    posicion = (sketch['total'] - 1) * q
+    inferior = int(np.floor(posicion))
+    superior = int(np.ceil(posicion))
+    # Celda que contiene al elemento de rango r (contando desde 0)
+    v_inf = valores[np.searchsorted(acumulado, inferior, side='right')]
+    v_sup = valores[np.searchsorted(acumulado, superior, side='right')]
+    return float(v_inf + (v_sup - v_inf) * (posicion - inferior))
+
+
+def histograma(sketch, bins=20):
+    """
+    Conteos del histograma de `bins` barras entre el mínimo y el máximo observados.
+
+    Cada celda cae en su barra con aritmética entera sobre su índice (como
+    HU07 en punto_fijo): barra = (celda - primera) * bins // (última - primera),
+    con la última celda en la última barra. Así ninguna celda del borde se
+    pierde por redondeo y los conteos suman el total.
+
+    Returns:
+        (conteos, bordes) como np.histogram
+    """
+    ocupadas = np.flatnonzero(sketch['conteos'])
+    if len(ocupadas) == 0:
+        return np.zeros(bins, dtype=np.int64), np.linspace(sketch['nota_min'], sketch['nota_max'], bins + 1)
+
+    primera, ultima = int(ocupadas[0]), int(ocupadas[-1])
+    if primera == ultima:
+        # Como np.histogram: un rango vacío se abre medio punto a cada lado
+        bordes = np.linspace(sketch['minimo'] - 0.5, sketch['minimo'] + 0.5, bins + 1)
+        barras = np.full(len(ocupadas), bins // 2)
+    else:
+        bordes = np.linspace(sketch['minimo'], sketch['maximo'], bins + 1)
+        barras = np.minimum((ocupadas - primera) * bins // (ultima - primera), bins - 1)
+    return np.bincount(barras, weights=sketch['conteos'][ocupadas], minlength=bins).astype(np.int64), bordes
+
+
+def estadisticas(sketch, bins=20, percentiles=(25, 75, 90)):
+    """Diccionario con media, mediana, percentiles y conteos del histograma (formato de HU07)"""
+    conteos, bordes = histograma(sketch, bins)
+    resultado = {
+        'media': media(sketch),
+        'mediana': cuantil(sketch, 0.5),
+        'conteos': conteos.astype(np.int64),
+        'bordes': bordes
+    }
+    for p in percentiles:
+        resultado[f'p{p}'] = cuantil(sketch, p / 100)
+    return resultado
+
+
+def sketch_desde_csv(ruta_csv, filas_por_bloque=FILAS_POR_BLOQUE, sketch=None, periodos=None):
+    """
+    Llena un resumen leyendo solo las columnas de notas, bloque por bloque.
+
+    La memoria usada depende de filas_por_bloque y no del tamaño del archivo.
+    Con un directorio particionado solo se abren las particiones de `periodos`.
+    Sin `sketch` se usa la rejilla de la política activa.
+    """
+    if sketch is None:
+        sketch = crear_sketch_politica()
+    columnas = politica_notas.con_columnas_politica(COLUMNAS_NOTAS)
+    for bloque in iterar_bloques(ruta_csv, columnas, filas_por_bloque, periodos):
+        promedios = promedio_fila(bloque)
+        actualizar_sketch(sketch, promedios)
+    return sketch
+
+
+def guardar_sketch(sketch, ruta):
+    """Guarda el resumen en un .npz para combinarlo después con otros"""
+    meta = {k: v for k, v in sketch.items() if k != 'conteos'}
+    with open(ruta, 'wb') as f:
+        np.savez(f, conteos=sketch['conteos'], meta=np.array(json.dumps(meta)))
+
+
+def cargar_sketch(ruta):
+    """Lee un resumen guardado con guardar_sketch"""
+    with np.load(ruta, allow_pickle=False) as datos:
+        sketch = json.loads(str(datos['meta']))
+        sketch['conteos'] = datos['conteos']
+    return sketch
@@ -0,0 +1,190 @@
+"""
+Ejecución de las HU por bloques (archivos que no caben en memoria)
+Lee el CSV en bloques cuyo tamaño sale de un presupuesto de memoria y, por
+cada bloque, calcula resultados parciales que se pueden sumar:
+    HU01 y HU05  sumas, conteos y sumas de cuadrados (agregados_incrementales)
+    HU07         conteos de la rejilla de distribucion_streaming
+    HU08         sumas y conteos por estudiante
+    HU06         las filas del último estudiante de cada bloque se guardan y
+                 se procesan con el bloque siguiente, así ningún estudiante
+                 queda partido entre dos bloques
+
+HU06 requiere que las filas de cada estudiante estén juntas en el archivo
+(como las escribe el generador); verificar_contiguidad lo comprueba bloque
+a bloque. La memoria de los resultados por estudiante (HU08) crece con el
+número de estudiantes, no con el de filas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import RUTA_CSV, COLUMNA_PROMEDIO, iterar_bloques, agregar_promedio_fila, importar_script
+from agregados_incrementales import (agregar_lote, _combinar_resumenes, _resumenes_vacios,
+                                     promedios_por_periodo, promedios_por_asignatura, reporte_desde_agregados)
+import distribucion_streaming
+from politica_notas import pesos_de_periodos, politica_activa
+
+# --- Constantes y Configuración ---
+PRESUPUESTO_MEMORIA = '256M'
+FILAS_MUESTRA = 10_000
+# Copias temporales que hacen los análisis por cada byte del bloque cargado
+FACTOR_TRABAJO = 6
+UNIDADES = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+def interpretar_tamano(texto):
+    """Convierte '512M', '2G', '64K' o un número de bytes a bytes"""
+    texto = str(texto).strip().upper().rstrip('B')
+    if texto and texto[-1] in UNIDADES:
+        return int(float(texto[:-1]) * UNIDADES[texto[-1]])
+    return int(texto)
+
+
+def filas_por_presupuesto(ruta_csv=RUTA_CSV, presupuesto=PRESUPUESTO_MEMORIA):
+    """
+    Número de filas por bloque que caben en el presupuesto de memoria.
+
+    Se mide el tamaño por fila de una muestra con el esquema tipado y se
+    multiplica por FACTOR_TRABAJO para contar las copias de los análisis.
+    """
+    muestra = next(iterar_bloques(ruta_csv, filas_por_bloque=FILAS_MUESTRA, por_estudiante=True))
+    bytes_por_fila = muestra.memory_usage(deep=True).sum() / max(len(muestra), 1)
+    return max(1, int(interpretar_tamano(presupuesto) / (bytes_por_fila * FACTOR_TRABAJO)))
+
+
+def crear_control_contiguidad():
+    """Estado vacío para verificar_contiguidad"""
+    return {'cerrados': np.zeros(0, dtype=bool), 'abierto': None}
+
+
+def verificar_contiguidad(control, ids, mensaje="Las filas de cada estudiante deben estar juntas en el archivo"):
+    """
+    Comprueba, bloque a bloque, que las filas de cada estudiante formen un solo tramo en el archivo.
+
+    `control` (de crear_control_contiguidad) guarda un mapa de bits con los
+    estudiantes ya cerrados, indexado por ID, y el último estudiante del
+    bloque anterior, que puede continuar en este. El costo es proporcional a
+    las filas del bloque, no al número de estudiantes vistos.
+
+    Raises:
+        ValueError: Si un estudiante tiene dos tramos en el bloque o vuelve a
+            aparecer después de cerrado
+    """
+    ids = np.asarray(ids)
+    if len(ids) == 0:
+        return
+    tramos = ids[np.r_[0, np.flatnonzero(ids[1:] != ids[:-1]) + 1]]
+    if len(np.unique(tramos)) != len(tramos) or tramos.min() < 0:
+        raise ValueError(mensaje)
+
+    abierto = control['abierto']
+    continua = abierto is not None and tramos[0] == abierto
+    cerrados = control['cerrados']
+    maximo = int(tramos.max())
+    if maximo >= len(cerrados):
+        cerrados = np.zeros(max(maximo + 1, 2 * len(cerrados)), dtype=bool)
+        cerrados[:len(control['cerrados'])] = control['cerrados']
+
+    if abierto is not None and not continua:
+        cerrados[abierto] = True
+    if cerrados[tramos[1:] if continua else tramos].any():
+        raise ValueError(mensaje)
+    # Todos los tramos menos el último terminan dentro del bloque
+    cerrados[tramos[:-1]] = True
+    control['cerrados'] = cerrados
+    control['abierto'] = int(tramos[-1])
+
+
+def _separar_ultimo_estudiante(df):
+    """Divide el bloque en (estudiantes completos, filas del último estudiante)"""
+    ids = df['id_estudiante'].to_numpy()
+    inicio_ultimo = len(ids) - np.argmax(ids[::-1] != ids[-1]) if (ids != ids[-1]).any() else 0
+    return df.iloc[:inicio_ultimo], df.iloc[inicio_ultimo:]
+
+
+def _unir_por_estudiante(partes):
+    """Suma los agregados por estudiante de todos los bloques (el nombre es el de su primera fila)"""
+    todas = pd.concat(partes)
+    grupos = todas.groupby(level=0, sort=True)
+    tabla = grupos[['conteo', 'suma']].sum()
+    tabla.insert(0, 'nombre', grupos['nombre'].first())
+    return tabla
+
+
+def calcular_todo_por_bloques(ruta_csv=RUTA_CSV, presupuesto=PRESUPUESTO_MEMORIA, filas_por_bloque=None):
+    """
+    Calcula los resultados de todas las HU sin cargar el archivo completo.
+
+    Args:
+        ruta_csv: Ruta del archivo CSV
+        presupuesto: Memoria máxima aproximada ('512M', '2G', ...)
+        filas_por_bloque: Fija el tamaño de bloque (None = según el presupuesto)
+
+    Returns:
+        Diccionario con el mismo formato que ejecutar_todo.calcular_todo
+
+    Raises:
+        ValueError: Si las filas de un estudiante no están juntas en el archivo
+            (o es un directorio particionado por periodo), o si la política de calificación pondera los periodos (HU08)
+            o no da notas en una rejilla exacta (HU07)
+    """
+    hu01 = importar_script('analisis_hu01.py')
+    hu06 = importar_script('cambios-rendimiento-HU06.py')
+    hu07 = importar_script('distribucion-notas-HU07.py')
+
+    if politica_activa()['pesos_periodos'] is not None:
+        raise ValueError("La política de calificación pondera los periodos: HU08 por bloques no lo permite "
+                         "(usa la ejecución en memoria)")
+    filas_por_bloque = filas_por_bloque or filas_por_presupuesto(ruta_csv, presupuesto)
+
+    resumenes = _resumenes_vacios()
+    # Los agregados por estudiante de cada bloque se unen una sola vez al final
+    partes_estudiante = [resumenes.pop('por_estudiante')]
+    sketch = distribucion_streaming.crear_sketch_politica()
+    control = crear_control_contiguidad()
+    cambios = []
+    pendiente = None
+    filas = 0
+
+    for bloque in iterar_bloques(ruta_csv, filas_por_bloque=filas_por_bloque, por_estudiante=True):
+        if len(bloque) == 0:
+            continue
+        filas += len(bloque)
+        verificar_contiguidad(control, bloque['id_estudiante'].to_numpy(),
+                              "Las filas de cada estudiante deben estar juntas en el archivo para HU06 por bloques")
+
+        _, resumenes_bloque = agregar_lote(bloque, con_detalle=False)
+        partes_estudiante.append(resumenes_bloque.pop('por_estudiante'))
+        resumenes = _combinar_resumenes(resumenes, resumenes_bloque)
+
+        agregar_promedio_fila(bloque)
+        distribucion_streaming.actualizar_sketch(sketch, bloque[COLUMNA_PROMEDIO].to_numpy())
+
+        if pendiente is not None:
+            bloque = pd.concat([pendiente, bloque], ignore_index=True)
+        completos, pendiente = _separar_ultimo_estudiante(bloque)
+        if len(completos):
+            cambios.append(hu06.calcular_cambios_bruscos(completos))
+
+    if filas == 0:
+        raise ValueError(f"El archivo '{ruta_csv}' no tiene filas de notas.")
+    if pendiente is not None and len(pendiente):
+        cambios.append(hu06.calcular_cambios_bruscos(pendiente))
+    resumenes['por_estudiante'] = _unir_por_estudiante(partes_estudiante)
+
+    promedios_periodos = promedios_por_periodo(resumenes)
+    promedios_periodos = promedios_periodos.loc[promedios_periodos.index.isin(hu01.PERIODOS_ANALISIS)]
+    promedio_anual = None
+    if len(promedios_periodos) == len(hu01.PERIODOS_ANALISIS):
+        pesos = pesos_de_periodos(promedios_periodos.index)
+        promedio_anual = (promedios_periodos.mean() if pesos is None
+                          else float(np.average(promedios_periodos, weights=pesos)))
+
+    return {
+        'promedios_periodos': promedios_periodos,
+        'promedio_anual': promedio_anual,
+        'promedios_asignaturas': promedios_por_asignatura(resumenes),
+        'cambios_bruscos': pd.concat(cambios, ignore_index=True),
+        'distribucion': distribucion_streaming.estadisticas(sketch, bins=hu07.NUM_BINS),
+        'reporte': reporte_desde_agregados(resumenes)
+    }
@@ -0,0 +1,241 @@
+"""
+Ejecución de todas las HU en una sola pasada
+Carga el archivo una vez, calcula el promedio de nota1..nota3 de cada fila una
+sola vez y, sobre ese mismo DataFrame, produce las salidas de HU01, HU05, HU06,
+HU07 y HU08.
+
+Con --memory-budget el archivo se procesa por bloques (ejecucion_por_bloques)
+y la memoria queda acotada por el presupuesto en lugar del tamaño del CSV.
+Con --tensor las HU se calculan como reducciones sobre el tensor denso
+estudiantes × asignaturas × periodos × notas (tensor_notas), y con
+--punto-fijo sobre las notas en centésimas enteras (punto_fijo).
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import cargar_notas, agregar_promedio_fila, importar_script, RUTA_CSV, COLUMNAS_NOTAS
+from graficos import configurar, renderizar_en_paralelo, tarea
+from ejecucion_por_bloques import calcular_todo_por_bloques
+import tensor_notas
+import punto_fijo
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
+# --- Constantes y Configuración ---
+DIRECTORIO_SALIDA = os.path.join('..', 'outputs', 'reportes')
+# Ninguna HU usa asistencia ni participación: no se leen
+COLUMNAS_LECTURA = ['id_estudiante', 'nombre', 'asignatura', 'periodo'] + COLUMNAS_NOTAS
+HUS = ('HU01', 'HU05', 'HU06', 'HU07', 'HU08')
+
+
+def calcular_todo(df, hus=HUS):
+    """
+    Calcula los resultados de todas las HU (o solo de `hus`) sobre un DataFrame ya cargado.
+
+    Returns:
+        Diccionario con los resultados de cada HU calculada
+    """
+    hu01 = importar_script('analisis_hu01.py')
+    hu05 = importar_script('promedio-asignatura-HU05.py')
+    hu06 = importar_script('cambios-rendimiento-HU06.py')
+    hu07 = importar_script('distribucion-notas-HU07.py')
+    hu08 = importar_script('reporte_general_hu08.py')
+
+    filas = len(df)
+
+    # Base compartida: el promedio por fila se calcula aquí y todas las HU lo reutilizan
+    with etapa('calculo', filas, paso='promedio_fila'):
+        agregar_promedio_fila(df)
+
+    resultados = {}
+    if 'HU01' in hus:
+        with etapa('calculo', filas, hu='HU01'):
+            resultados['promedios_periodos'], resultados['promedio_anual'] = hu01.calcular_promedios_periodos(df)
+    if 'HU05' in hus:
+        with etapa('calculo', filas, hu='HU05'):
+            resultados['promedios_asignaturas'] = hu05.calcular_promedios_por_asignatura(df)
+    if 'HU06' in hus:
+        with etapa('calculo', filas, hu='HU06'):
+            resultados['cambios_bruscos'] = hu06.calcular_cambios_bruscos(df)
+    if 'HU07' in hus:
+        with etapa('calculo', filas, hu='HU07'):
+            resultados['distribucion'] = hu07.calcular_estadisticas_notas(df)
+    if 'HU08' in hus:
+        with etapa('calculo', filas, hu='HU08'):
+            resultados['reporte'] = hu08.calcular_reporte(df)
+
+    return resultados
+
+
+def guardar_resultados(resultados, directorio=DIRECTORIO_SALIDA):
+    """Guarda como CSV, en el directorio indicado, las tablas de las HU que están en los resultados"""
+    os.makedirs(directorio, exist_ok=True)
+
+    tablas = {}
+    if 'promedios_periodos' in resultados:
+        tablas['promedios_periodos.csv'] = (resultados['promedios_periodos'].rename('promedio').reset_index(), False)
+    if 'promedios_asignaturas' in resultados:
+        tablas['promedios_asignaturas.csv'] = (resultados['promedios_asignaturas'], True)
+    if 'cambios_bruscos' in resultados:
+        tablas['cambios_bruscos.csv'] = (resultados['cambios_bruscos'], False)
+    if 'distribucion' in resultados:
+        distribucion = resultados['distribucion']
+        histograma = pd.DataFrame({
+            'desde': distribucion['bordes'][:-1],
+            'hasta': distribucion['bordes'][1:],
+            'conteo': distribucion['conteos']
+        })
+        tablas['histograma_notas.csv'] = (histograma, False)
+    if 'reporte' in resultados:
+        tablas['reporte_general.csv'] = (resultados['reporte'], False)
+
+    rutas = []
+    for nombre_archivo, (tabla, con_indice) in tablas.items():
+        ruta = os.path.join(directorio, nombre_archivo)
+        with etapa('guardado', len(tabla), archivo=nombre_archivo):
+            tabla.to_csv(ruta, index=con_indice, float_format="%.2f", encoding='utf-8')
+        rutas.append(ruta)
+
+    return rutas
+
+
+def graficar_resultados(resultados, directorio=DIRECTORIO_SALIDA, workers=None):
+    """Renderiza en paralelo los gráficos de HU01, HU05 y HU07 que estén en los resultados"""
+    tareas = []
+    if 'promedios_periodos' in resultados:
+        datos_hu01 = {f"Periodo {int(p)}": v for p, v in resultados['promedios_periodos'].items()}
+        if resultados['promedio_anual'] is not None:
+            datos_hu01["Promedio Anual (P1-3)"] = resultados['promedio_anual']
+        tareas.append(tarea('analisis_hu01.py', 'graficar_promedios_hu01', datos_hu01,
+                            os.path.join(directorio, 'promedios_curso_hu01.png')))
+    if 'promedios_asignaturas' in resultados:
+        tareas.append(tarea('promedio-asignatura-HU05.py', 'graficar_promedios_asignaturas',
+                            resultados['promedios_asignaturas'], os.path.join(directorio, 'promedios_asignaturas.png')))
+    if 'distribucion' in resultados:
+        tareas.append(tarea('distribucion-notas-HU07.py', 'graficar_histograma', resultados['distribucion'],
+                            os.path.join(directorio, 'histograma_notas.png')))
+    return renderizar_en_paralelo(tareas, workers)
+
+
+def mostrar_resumen(resultados):
+    """Muestra un resumen corto de todas las HU en consola"""
+    print("\n--- Promedios del Curso (HU01) ---")
+    for periodo, promedio in resultados['promedios_periodos'].items():
+        print(f" Periodo {int(periodo)}: {promedio:.2f}")
+    if resultados['promedio_anual'] is not None:
+        print(f" Promedio Anual: {resultados['promedio_anual']:.2f}")
+
+    asignaturas = resultados['promedios_asignaturas']
+    print("\n--- Promedio por Asignatura (HU05) ---")
+    print(f" Más baja: {asignaturas.index[0]} ({asignaturas['Promedio_General'].iloc[0]:.2f})")
+    print(f" Más alta: {asignaturas.index[-1]} ({asignaturas['Promedio_General'].iloc[-1]:.2f})")
+
+    print("\n--- Cambios Bruscos (HU06) ---")
+    print(f" Estudiantes con cambios bruscos: {resultados['cambios_bruscos']['id_estudiante'].nunique()}")
+
+    distribucion = resultados['distribucion']
+    print("\n--- Distribución de Notas (HU07) ---")
+    print(f" Media: {distribucion['media']:.2f}  Mediana: {distribucion['mediana']:.2f}")
+
+    reporte = resultados['reporte']
+    mejor = reporte.loc[reporte['promedio_actual'].idxmax()]
+    porcentaje_riesgo = np.mean(reporte['estado'] == 'En riesgo') * 100
+    print("\n--- Reporte General (HU08) ---")
+    print(f" Promedio del grupo: {reporte['promedio_actual'].mean():.2f}")
+    print(f" Mejor estudiante: {mejor['nombre']} ({mejor['promedio_actual']:.2f})")
+    print(f" En riesgo: {porcentaje_riesgo:.2f}%")
+
+
+def validar_no_vacio(df, ruta_csv):
+    """Lanza ValueError si el archivo no tiene filas: sin estudiantes no hay resumen que mostrar"""
+    if len(df) == 0:
+        raise ValueError(f"El archivo '{ruta_csv}' no tiene filas de notas.")
+
+
+def ejecutar(ruta_csv=RUTA_CSV, directorio=DIRECTORIO_SALIDA, graficos=False, workers=None,
+             presupuesto=None, dpi=None, formato=None, tensor=False, centesimas=False):
+    """
+    Calcula todas las HU, muestra el resumen y guarda las tablas (y los gráficos si se piden).
+
+    Returns:
+        Diccionario de resultados, o None si no se pudo leer el archivo
+    """
+    try:
+        if presupuesto:
+            print(f" Procesando '{ruta_csv}' por bloques (presupuesto: {presupuesto}).")
+            with etapa('calculo', paso='por_bloques', presupuesto=presupuesto):
+                resultados = calcular_todo_por_bloques(ruta_csv, presupuesto)
+        elif centesimas:
+            df = punto_fijo.cargar_punto_fijo(ruta_csv, columnas=COLUMNAS_LECTURA)
+            print(f" {len(df)} filas cargadas en centésimas enteras desde '{ruta_csv}'.")
+            validar_no_vacio(df, ruta_csv)
+            resultados = punto_fijo.calcular_todo(df)
+        else:
+            df = cargar_notas(ruta_csv, columnas=COLUMNAS_LECTURA)
+            print(f" {len(df)} filas cargadas desde '{ruta_csv}'.")
+            validar_no_vacio(df, ruta_csv)
+            if tensor:
+                with etapa('calculo', len(df), paso='construir_tensor'):
+                    datos_tensor = tensor_notas.construir_tensor(df)
+                resultados = tensor_notas.calcular_todo(datos_tensor)
+            else:
+                resultados = calcular_todo(df)
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{ruta_csv}' NO ENCONTRADO.")
+        return None
+    except ValueError as e:
+        print(f" ERROR: {e}")
+        return None
+    mostrar_resumen(resultados)
+
+    rutas = guardar_resultados(resultados, directorio)
+    print(f"\n Resultados guardados en '{directorio}':")
+    for ruta in rutas:
+        print(f"  - {os.path.basename(ruta)}")
+
+    if graficos:
+        configurar(dpi=dpi, formato=formato)
+        for ruta in graficar_resultados(resultados, directorio, workers):
+            print(f"  - {os.path.basename(ruta)}")
+    return resultados
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Ejecuta todas las HU con una sola lectura del archivo")
+    parser.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--output', default=DIRECTORIO_SALIDA, help="Directorio de salida (default: %(default)s)")
+    parser.add_argument('--graficos', action='store_true', help="Genera también los gráficos de HU01, HU05 y HU07")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos para renderizar gráficos")
+    parser.add_argument('--dpi', type=int, default=None, help="Resolución de los gráficos")
+    parser.add_argument('--formato', choices=['png', 'svg'], default=None, help="Formato de los gráficos")
+    parser.add_argument('--memory-budget', '--presupuesto-memoria', dest='presupuesto', default=None,
+                        help="Procesa el archivo por bloques con esta memoria máxima (p. ej. 512M, 2G)")
+    parser.add_argument('--tensor', action='store_true',
+                        help="Calcula las HU sobre el tensor denso estudiantes × asignaturas × periodos")
+    parser.add_argument('--punto-fijo', action='store_true',
+                        help="Guarda las notas en centésimas enteras y agrega sin error de redondeo")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+    if args.tensor and args.presupuesto:
+        parser.error("--tensor y --memory-budget no se pueden usar juntos")
+    if args.punto_fijo and (args.tensor or args.presupuesto):
+        parser.error("--punto-fijo no se puede usar con --tensor ni con --memory-budget")
+
+    print("\n" + "=" * 80)
+    print("EJECUCIÓN COMPLETA HU01-HU08".center(80))
+    print("=" * 80)
+
+    ejecutar(args.input, args.output, args.graficos, args.workers, args.presupuesto, args.dpi, args.formato,
+             args.tensor, args.punto_fijo)
+
+
+if __name__ == "__main__":
+    main()
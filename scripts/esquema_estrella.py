@@ -0,0 +1,252 @@
+"""
+Dataset normalizado en esquema estrella
+En el CSV plano cada fila repite el nombre del estudiante y el texto de la
+asignatura. En el esquema estrella esos textos se guardan una sola vez y
+la tabla de hechos queda solo con números:
+
+    <base>.estrella/
+        estudiantes.csv   id_estudiante, nombre
+        asignaturas.csv   id_asignatura, asignatura
+        hechos.csv        id_estudiante, id_asignatura, periodo, nota1..nota3,
+                          asistencia_%, participacion
+
+Al leer, el nombre y la asignatura se vuelven a unir como categorías solo
+si se piden en las columnas: HU01 y HU07 leen únicamente la tabla de
+hechos y HU08 agrega el nombre para su reporte.
+
+Uso:
+    python esquema_estrella.py --input ../data/data-generada.csv
+    python esquema_estrella.py --input ../data/data-generada.csv --comparar
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+
+# --- Constantes y Configuración ---
+SUFIJO_ESTRELLA = '.estrella'
+ESTUDIANTES = 'estudiantes.csv'
+ASIGNATURAS = 'asignaturas.csv'
+HECHOS = 'hechos.csv'
+# Columnas que se unen desde las dimensiones (y la clave con que se unen)
+DIMENSIONES = {'nombre': 'id_estudiante', 'asignatura': 'id_asignatura'}
+ORDEN_COLUMNAS = ['id_estudiante', 'nombre', 'asignatura', 'periodo', 'nota1', 'nota2', 'nota3',
+                  'asistencia_%', 'participacion']
+TIPOS_HECHOS = {
+    'id_estudiante': 'int32',
+    'id_asignatura': 'int8',
+    'periodo': 'int8',
+    'nota1': 'float32',
+    'nota2': 'float32',
+    'nota3': 'float32',
+    'asistencia_%': 'float32',
+    'participacion': 'float32'
+}
+
+
+def ruta_estrella(ruta_csv):
+    """Directorio en esquema estrella asociado a la ruta de un CSV"""
+    return os.path.splitext(ruta_csv)[0] + SUFIJO_ESTRELLA
+
+
+def es_estrella(ruta):
+    """True si la ruta es un directorio escrito por escribir_estrella"""
+    return os.path.isdir(ruta) and all(os.path.exists(os.path.join(ruta, t)) for t in (ESTUDIANTES, ASIGNATURAS, HECHOS))
+
+
+def escribir_estrella(df, directorio):
+    """
+    Escribe el DataFrame como tablas de estudiantes, asignaturas y hechos.
+
+    Los IDs de asignatura se asignan en orden alfabético (1, 2, ...) y el
+    nombre de cada estudiante es el de su primera fila.
+
+    Returns:
+        Diccionario con la ruta de cada tabla
+    """
+    os.makedirs(directorio, exist_ok=True)
+
+    estudiantes = df[['id_estudiante', 'nombre']].drop_duplicates('id_estudiante').sort_values('id_estudiante')
+    codigos, nombres_asignaturas = pd.factorize(df['asignatura'], sort=True)
+    asignaturas = pd.DataFrame({'id_asignatura': np.arange(1, len(nombres_asignaturas) + 1),
+                                'asignatura': np.asarray(nombres_asignaturas, dtype=object)})
+
+    hechos = df.drop(columns=['nombre', 'asignatura'])
+    hechos.insert(1, 'id_asignatura', (codigos + 1).astype(np.int8))
+
+    rutas = {}
+    for nombre_archivo, tabla in ((ESTUDIANTES, estudiantes), (ASIGNATURAS, asignaturas), (HECHOS, hechos)):
+        rutas[nombre_archivo] = os.path.join(directorio, nombre_archivo)
+        tabla.to_csv(rutas[nombre_archivo], index=False, float_format="%.2f", encoding='utf-8')
+    return rutas
+
+
+def leer_dimensiones(directorio, nombres=True):
+    """
+    Lee las tablas de asignaturas y (si nombres=True) de estudiantes.
+
+    Returns:
+        Diccionario con 'asignaturas' e 'estudiantes' (None si no se pidió)
+    """
+    asignaturas = pd.read_csv(os.path.join(directorio, ASIGNATURAS), dtype={'id_asignatura': 'int8'})
+    estudiantes = None
+    if nombres:
+        estudiantes = pd.read_csv(os.path.join(directorio, ESTUDIANTES), dtype={'id_estudiante': 'int32'})
+        estudiantes = estudiantes.sort_values('id_estudiante', kind='stable').reset_index(drop=True)
+    return {'asignaturas': asignaturas, 'estudiantes': estudiantes}
+
+
+def _categorias(claves_tabla, textos, claves):
+    """
+    Une una dimensión a las filas: el texto de cada clave como categoría.
+
+    Las categorías quedan ordenadas (como al leer el CSV plano con
+    dtype='category') y cada fila guarda solo un código entero.
+    """
+    codigos_texto, categorias = pd.factorize(pd.Series(textos, dtype=object), sort=True)
+    orden = np.argsort(claves_tabla, kind='stable')
+    posiciones = np.searchsorted(claves_tabla[orden], claves)
+    posiciones = np.minimum(posiciones, max(len(orden) - 1, 0))
+    encontradas = (len(orden) > 0) & (claves_tabla[orden][posiciones] == claves) if len(claves) else np.zeros(0, bool)
+    codigos = np.where(encontradas, codigos_texto[orden][posiciones], -1).astype(np.int32)
+    return pd.Categorical.from_codes(codigos, categories=pd.Index(categorias, dtype=object))
+
+
+def _unir(hechos, dimensiones, columnas):
+    """Tabla de hechos con las columnas pedidas, uniendo nombre y asignatura solo si están en `columnas`"""
+    datos = {}
+    for columna in columnas:
+        if columna == 'asignatura':
+            tabla = dimensiones['asignaturas']
+            datos[columna] = _categorias(tabla['id_asignatura'].to_numpy(), tabla['asignatura'].to_numpy(),
+                                         hechos['id_asignatura'].to_numpy())
+        elif columna == 'nombre':
+            tabla = dimensiones['estudiantes']
+            datos[columna] = _categorias(tabla['id_estudiante'].to_numpy(), tabla['nombre'].to_numpy(),
+                                         hechos['id_estudiante'].to_numpy())
+        else:
+            datos[columna] = hechos[columna].to_numpy()
+    return pd.DataFrame(datos, columns=columnas)
+
+
+def _plan_lectura(directorio, columnas, periodos, asignaturas):
+    """Columnas finales, columnas a leer de la tabla de hechos y dimensiones necesarias"""
+    encabezado = pd.read_csv(os.path.join(directorio, HECHOS), nrows=0).columns
+    disponibles = [c for c in ORDEN_COLUMNAS if c in encabezado or DIMENSIONES.get(c) in encabezado]
+    columnas = list(disponibles if columnas is None else columnas)
+    desconocidas = set(columnas) - set(disponibles)
+    if desconocidas:
+        raise KeyError(f"Columnas que no están en el esquema estrella: {', '.join(sorted(desconocidas))}")
+
+    leer = [DIMENSIONES.get(c, c) for c in columnas]
+    leer += ['periodo'] * (periodos is not None) + ['id_asignatura'] * (asignaturas is not None)
+    leer = list(dict.fromkeys(leer))
+    dimensiones = leer_dimensiones(directorio, nombres='nombre' in columnas)
+    return columnas, leer, dimensiones
+
+
+def _filtrar(hechos, dimensiones, periodos, asignaturas):
+    """Filtra filas de la tabla de hechos por periodo y por asignatura (por su ID, sin unir textos)"""
+    if periodos is not None:
+        hechos = hechos[hechos['periodo'].isin(periodos)]
+    if asignaturas is not None:
+        tabla = dimensiones['asignaturas']
+        ids = tabla.loc[tabla['asignatura'].isin(asignaturas), 'id_asignatura']
+        hechos = hechos[hechos['id_asignatura'].isin(ids)]
+    return hechos
+
+
+def leer_estrella(directorio, columnas=None, periodos=None, asignaturas=None):
+    """
+    Lee el esquema estrella con las columnas del CSV plano.
+
+    Args:
+        directorio: Directorio escrito por escribir_estrella
+        columnas: Columnas a devolver (None = todas); nombre y asignatura se
+            unen desde sus tablas solo si se piden
+        periodos: Periodos a leer (None = todos)
+        asignaturas: Asignaturas a leer (None = todas)
+
+    Returns:
+        DataFrame con las columnas pedidas, con los mismos tipos que cargar_notas
+    """
+    columnas, leer, dimensiones = _plan_lectura(directorio, columnas, periodos, asignaturas)
+    hechos = pd.read_csv(os.path.join(directorio, HECHOS), usecols=leer,
+                         dtype={c: TIPOS_HECHOS[c] for c in leer if c in TIPOS_HECHOS})
+    hechos = _filtrar(hechos, dimensiones, periodos, asignaturas)
+    return _unir(hechos, dimensiones, columnas)
+
+
+def iterar_estrella(directorio, columnas=None, filas_por_bloque=1_000_000, periodos=None):
+    """
+    Recorre la tabla de hechos por bloques; las dimensiones se leen una sola vez.
+
+    Yields:
+        DataFrames de hasta filas_por_bloque filas, con el formato de leer_estrella
+    """
+    columnas, leer, dimensiones = _plan_lectura(directorio, columnas, periodos, None)
+    lector = pd.read_csv(os.path.join(directorio, HECHOS), usecols=leer, chunksize=filas_por_bloque,
+                         dtype={c: TIPOS_HECHOS[c] for c in leer if c in TIPOS_HECHOS})
+    for hechos in lector:
+        yield _unir(_filtrar(hechos, dimensiones, periodos, None), dimensiones, columnas)
+
+
+def tamano_estrella(directorio):
+    """Bytes de las tres tablas"""
+    return sum(os.path.getsize(os.path.join(directorio, t)) for t in (ESTUDIANTES, ASIGNATURAS, HECHOS))
+
+
+def comparar_con_csv(ruta_csv, directorio, columnas_reporte=('id_estudiante', 'nombre', 'periodo', 'nota1')):
+    """
+    Compara el CSV plano con el esquema estrella: tamaño en disco, tiempo de
+    lectura y memoria, leyendo todo y leyendo solo números (como HU01).
+    """
+    from carga_datos import leer_csv_tipado
+
+    print(f"\n{'Lectura':<28} {'Formato':<10} {'Segundos':>9} {'Memoria MB':>11}")
+    for descripcion, columnas in (("Todas las columnas", None), ("Solo periodo y notas", ['periodo', 'nota1', 'nota2', 'nota3']),
+                                  ("Reporte (con nombre)", list(columnas_reporte))):
+        for formato, leer in (('csv', lambda: leer_csv_tipado(ruta_csv, columnas)),
+                              ('estrella', lambda: leer_estrella(directorio, columnas))):
+            inicio = time.perf_counter()
+            df = leer()
+            segundos = time.perf_counter() - inicio
+            print(f"{descripcion:<28} {formato:<10} {segundos:>9.3f} {df.memory_usage(deep=True).sum() / 1e6:>11.1f}")
+
+
+def main():
+    """Función principal: convierte un CSV plano al esquema estrella"""
+    from carga_datos import cargar_notas, RUTA_CSV
+
+    parser = argparse.ArgumentParser(description="Convierte el CSV de notas al esquema estrella")
+    parser.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--output', default=None, help="Directorio de salida (default: <input>.estrella)")
+    parser.add_argument('--comparar', action='store_true',
+                        help="Compara tamaño, tiempo de lectura y memoria con el CSV plano")
+    agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+
+    destino = args.output or ruta_estrella(args.input)
+    try:
+        df = cargar_notas(args.input, usar_cache=False)
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{args.input}' NO ENCONTRADO.")
+        return
+
+    with etapa('guardado', len(df), archivo=os.path.basename(destino)):
+        escribir_estrella(df, destino)
+    print(f" {len(df)} filas escritas en '{destino}'.")
+    print(f" Tamaño: CSV {os.path.getsize(args.input) / 1e6:.1f} MB, estrella {tamano_estrella(destino) / 1e6:.1f} MB")
+
+    if args.comparar:
+        comparar_con_csv(args.input, destino)
+
+
+if __name__ == "__main__":
+    main()
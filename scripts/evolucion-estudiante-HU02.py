@@ -4,22 +4,62 @@ Muestra cómo han cambiado las notas de un estudiante a lo largo de los tres per
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
+import argparse
 import os
 
-def cargar_datos():
+from carga_datos import cargar_notas, RUTA_CSV
+from graficos import obtener_figura, guardar_figura, configurar, renderizar_en_paralelo, tarea
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
+def cargar_datos(ruta_csv=RUTA_CSV):
     """Carga el archivo CSV con los datos"""
-    ruta_csv = os.path.join('..', 'data', 'data-generada.csv')
     try:
-        df = pd.read_csv(ruta_csv)
+        df = cargar_notas(ruta_csv)
         return df
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {ruta_csv}")
         return None
 
-def buscar_estudiante(df, busqueda):
-    """Busca un estudiante por ID o nombre"""
+def normalizar_nombre(nombre):
+    """Normaliza un nombre para buscarlo: minúsculas y espacios simples"""
+    return ' '.join(str(nombre).lower().split())
+
+def construir_indice(df):
+    """
+    Construye el índice de búsqueda de estudiantes.
+
+    Las filas de cada estudiante quedan contiguas (se ordena por ID si hace
+    falta), así que el índice guarda para cada ID su rango de filas
+    [inicio, fin) y, para cada nombre normalizado, la lista de IDs. Cada
+    búsqueda posterior es una consulta a un diccionario más un slice.
+
+    Returns:
+        Diccionario con 'df' (datos ordenados), 'por_id' y 'por_nombre'
+    """
+    if not df['id_estudiante'].is_monotonic_increasing:
+        df = df.sort_values('id_estudiante', kind='stable').reset_index(drop=True)
+
+    ids = df['id_estudiante'].to_numpy()
+    inicios = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=int)
+    fines = np.r_[inicios[1:], len(ids)]
+
+    ids_unicos = ids[inicios].tolist()
+    por_id = dict(zip(ids_unicos, zip(inicios.tolist(), fines.tolist())))
+
+    # Se normaliza un nombre por estudiante, no uno por fila
+    por_nombre = {}
+    for id_estudiante, nombre in zip(ids_unicos, df['nombre'].to_numpy()[inicios]):
+        por_nombre.setdefault(normalizar_nombre(nombre), []).append(id_estudiante)
+
+    return {'df': df, 'por_id': por_id, 'por_nombre': por_nombre}
+
+def buscar_estudiante(df, busqueda, indice=None):
+    """Busca un estudiante por ID o nombre (en O(1) si se pasa el índice de construir_indice)"""
+    if indice is not None:
+        return _buscar_en_indice(indice, busqueda)
+
     try:
         # Intentar buscar por ID
         id_estudiante = int(busqueda)
@@ -30,25 +70,80 @@ def buscar_estudiante(df, busqueda):
 
     return estudiante_df
 
+def _buscar_en_indice(indice, busqueda):
+    """Devuelve las filas del estudiante usando el índice precalculado"""
+    try:
+        ids = [int(busqueda)]
+    except ValueError:
+        ids = indice['por_nombre'].get(normalizar_nombre(busqueda), [])
+
+    rangos = [indice['por_id'][i] for i in ids if i in indice['por_id']]
+    if not rangos:
+        return indice['df'].iloc[0:0]
+    if len(rangos) == 1:
+        inicio, fin = rangos[0]
+        return indice['df'].iloc[inicio:fin]
+    return pd.concat([indice['df'].iloc[inicio:fin] for inicio, fin in rangos])
+
+def calcular_evolucion(df):
+    """
+    Calcula la evolución de todos los estudiantes de una vez.
+
+    Funciona para cualquier número de periodos: todo se calcula por columnas
+    y el promedio general de cada estudiante en cada periodo sale de un solo
+    groupby.
+
+    Returns:
+        Tabla larga con una fila por estudiante, asignatura y periodo:
+        id_estudiante, nombre, Asignatura, Periodo, Nota1..Nota3, Promedio
+        (nota de la fila según la política de calificación) y Promedio_Periodo (de todas las asignaturas del periodo)
+    """
+    notas = df[['nota1', 'nota2', 'nota3']].to_numpy(dtype='float64')
+
+    evolucion = pd.DataFrame({
+        'id_estudiante': df['id_estudiante'].to_numpy(),
+        'nombre': df['nombre'].to_numpy(),
+        'Asignatura': df['asignatura'].to_numpy(),
+        'Periodo': df['periodo'].to_numpy(),
+        'Nota1': notas[:, 0],
+        'Nota2': notas[:, 1],
+        'Nota3': notas[:, 2],
+        'Promedio': np.round(politica_notas.promedio_fila(df), 2)
+    })
+
+    # Orden: estudiante, periodo y, dentro del periodo, el orden original de las asignaturas
+    evolucion = evolucion.sort_values(['id_estudiante', 'Periodo'], kind='stable').reset_index(drop=True)
+
+    evolucion['Promedio_Periodo'] = evolucion.groupby(
+        ['id_estudiante', 'Periodo'], sort=False
+    )['Promedio'].transform('mean')
+
+    return evolucion
+
 def calcular_promedios_por_periodo(df_estudiante):
     """Calcula el promedio de cada periodo para todas las asignaturas"""
-    resultados = []
+    columnas = ['Asignatura', 'Periodo', 'Nota1', 'Nota2', 'Nota3', 'Promedio']
+    return calcular_evolucion(df_estudiante)[columnas]
+
+def exportar_evolucion(df_evolucion, ruta_salida):
+    """Guarda la evolución de todos los estudiantes en un solo CSV (tabla larga)"""
+    df_evolucion.to_csv(ruta_salida, index=False, float_format="%.2f")
+    print(f"\n✅ Evolución de {df_evolucion['id_estudiante'].nunique()} estudiantes guardada en: {ruta_salida}")
+
+def exportar_evolucion_por_estudiante(df_evolucion, directorio):
+    """Guarda un CSV por estudiante (evolucion_<id>.csv) recorriendo la tabla una sola vez"""
+    os.makedirs(directorio, exist_ok=True)
 
-    for periodo in [1, 2, 3]:
-        df_periodo = df_estudiante[df_estudiante['periodo'] == periodo]
+    # La tabla ya viene ordenada por estudiante: cada grupo es un bloque contiguo
+    ids = df_evolucion['id_estudiante'].to_numpy()
+    inicios = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=int)
+    fines = np.r_[inicios[1:], len(ids)]
 
-        for _, row in df_periodo.iterrows():
-            promedio = (row['nota1'] + row['nota2'] + row['nota3']) / 3
-            resultados.append({
-                'Asignatura': row['asignatura'],
-                'Periodo': periodo,
-                'Nota1': row['nota1'],
-                'Nota2': row['nota2'],
-                'Nota3': row['nota3'],
-                'Promedio': round(promedio, 2)
-            })
+    for inicio, fin in zip(inicios, fines):
+        ruta = os.path.join(directorio, f'evolucion_{ids[inicio]}.csv')
+        df_evolucion.iloc[inicio:fin].to_csv(ruta, index=False, float_format="%.2f")
 
-    return pd.DataFrame(resultados)
+    print(f"\n✅ {len(inicios)} archivos de evolución guardados en: {directorio}")
 
 def mostrar_tabla(df_resultados, nombre_estudiante):
     """Muestra la tabla de notas por periodo en consola"""
@@ -56,15 +151,14 @@ def mostrar_tabla(df_resultados, nombre_estudiante):
     print(f"EVOLUCIÓN DE NOTAS - {nombre_estudiante}")
     print("="*80)
 
-    for periodo in [1, 2, 3]:
-        df_periodo = df_resultados[df_resultados['Periodo'] == periodo]
+    for periodo, df_periodo in df_resultados.groupby('Periodo', sort=True):
         print(f"\n{'PERIODO ' + str(periodo):^80}")
         print("-"*80)
         print(f"{'Asignatura':<25} {'Nota 1':>10} {'Nota 2':>10} {'Nota 3':>10} {'Promedio':>10}")
         print("-"*80)
 
-        for _, row in df_periodo.iterrows():
-            print(f"{row['Asignatura']:<25} {row['Nota1']:>10.2f} {row['Nota2']:>10.2f} {row['Nota3']:>10.2f} {row['Promedio']:>10.2f}")
+        for row in df_periodo.itertuples(index=False):
+            print(f"{row.Asignatura:<25} {row.Nota1:>10.2f} {row.Nota2:>10.2f} {row.Nota3:>10.2f} {row.Promedio:>10.2f}")
 
         promedio_periodo = df_periodo['Promedio'].mean()
         print("-"*80)
@@ -72,19 +166,20 @@ def mostrar_tabla(df_resultados, nombre_estudiante):
 
     print("="*80)
 
-def graficar_evolucion(df_resultados, nombre_estudiante):
+def graficar_evolucion(df_resultados, nombre_estudiante, ruta_salida=None):
     """Crea el gráfico de evolución del estudiante"""
     # Calcular promedio general por periodo
     promedios_periodo = df_resultados.groupby('Periodo')['Promedio'].mean()
 
-    # Crear figura con tamaño adecuado
-    plt.figure(figsize=(12, 8))
+    # Figura de la plantilla de evolución (reutilizada entre estudiantes)
+    fig, ax = obtener_figura('evolucion')
 
     # Obtener asignaturas únicas
     asignaturas = df_resultados['Asignatura'].unique()
 
-    # Colores para cada asignatura
-    colores = plt.cm.tab10(np.linspace(0, 1, len(asignaturas)))
+    # Colores para cada asignatura (matplotlib ya quedó importado al crear la figura)
+    import matplotlib
+    colores = matplotlib.colormaps['tab10'](np.linspace(0, 1, len(asignaturas)))
 
     # Graficar evolución de cada asignatura
     for i, asignatura in enumerate(asignaturas):
@@ -92,58 +187,83 @@ def graficar_evolucion(df_resultados, nombre_estudiante):
         periodos = df_asignatura['Periodo'].values
         promedios = df_asignatura['Promedio'].values
 
-        plt.plot(periodos, promedios, marker='o', linewidth=2,
+        ax.plot(periodos, promedios, marker='o', linewidth=2,
                 label=asignatura, color=colores[i], markersize=8)
 
     # Graficar promedio general
-    plt.plot([1, 2, 3], promedios_periodo.values, marker='s', linewidth=3,
+    ax.plot(promedios_periodo.index, promedios_periodo.values, marker='s', linewidth=3,
             label='PROMEDIO GENERAL', color='red', markersize=10, linestyle='--')
 
     # Configurar el gráfico
-    plt.title(f'Evolución de Notas - {nombre_estudiante}', fontsize=16, fontweight='bold', pad=20)
-    plt.xlabel('Periodo', fontsize=12, fontweight='bold')
-    plt.ylabel('Promedio de Notas', fontsize=12, fontweight='bold')
-    plt.xticks([1, 2, 3], ['Periodo 1', 'Periodo 2', 'Periodo 3'])
-    plt.ylim(0, 5.5)
-    plt.grid(True, alpha=0.3, linestyle='--')
-    plt.legend(loc='best', fontsize=9, framealpha=0.9)
+    ax.set_title(f'Evolución de Notas - {nombre_estudiante}', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Periodo', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Promedio de Notas', fontsize=12, fontweight='bold')
+    ax.set_xticks(promedios_periodo.index, [f'Periodo {p}' for p in promedios_periodo.index])
+    ax.set_ylim(0, 5.5)
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.legend(loc='best', fontsize=9, framealpha=0.9)
 
     # Añadir línea de referencia de aprobado (3.0)
-    plt.axhline(y=3.0, color='orange', linestyle=':', linewidth=2, alpha=0.5, label='Nota mínima (3.0)')
+    ax.axhline(y=3.0, color='orange', linestyle=':', linewidth=2, alpha=0.5, label='Nota mínima (3.0)')
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     # Guardar el gráfico
-    ruta_salida = os.path.join('..', 'outputs', 'evolucion_estudiante.png')
-    plt.savefig(ruta_salida, dpi=300, bbox_inches='tight')
-    print(f"\n✅ Gráfico guardado exitosamente en: {ruta_salida}")
-
-    plt.show()
-
-def main():
-    """Función principal del programa"""
-    print("\n" + "="*80)
-    print("HU02 - EVOLUCIÓN INDIVIDUAL DEL ESTUDIANTE".center(80))
-    print("="*80)
-
-    # Cargar datos
-    df = cargar_datos()
-    if df is None:
-        return
-
-    # Solicitar nombre o ID del estudiante
-    busqueda = input("\nIngrese el nombre o ID del estudiante: ").strip()
-
-    # Buscar estudiante
-    df_estudiante = buscar_estudiante(df, busqueda)
+    if ruta_salida is None:
+        ruta_salida = os.path.join('..', 'outputs', 'evolucion_estudiante.png')
+    return guardar_figura(fig, ruta_salida, bbox_inches='tight')
+
+def graficar_evolucion_curso(df_evolucion, directorio, workers=None, ids=None):
+    """
+    Renderiza el gráfico de evolución de cada estudiante en paralelo.
+
+    Args:
+        df_evolucion: Tabla de calcular_evolucion (ordenada por estudiante)
+        directorio: Carpeta donde se guarda evolucion_estudiante_<id>.<formato>
+        workers: Procesos del pool (None = número de CPUs)
+        ids: Limitar a estos IDs (None = todos)
+
+    Returns:
+        Lista de rutas generadas
+    """
+    columnas = ['Asignatura', 'Periodo', 'Nota1', 'Nota2', 'Nota3', 'Promedio']
+    ids_tabla = df_evolucion['id_estudiante'].to_numpy()
+    inicios = np.flatnonzero(np.r_[True, ids_tabla[1:] != ids_tabla[:-1]]) if len(ids_tabla) else np.array([], dtype=int)
+    fines = np.r_[inicios[1:], len(ids_tabla)]
+
+    tareas = []
+    for inicio, fin in zip(inicios, fines):
+        id_estudiante = ids_tabla[inicio]
+        if ids is not None and id_estudiante not in ids:
+            continue
+        bloque = df_evolucion.iloc[inicio:fin]
+        ruta = os.path.join(directorio, f'evolucion_estudiante_{id_estudiante}.png')
+        tareas.append(tarea(
+            'evolucion-estudiante-HU02.py', 'graficar_evolucion',
+            bloque[columnas], str(bloque['nombre'].iloc[0]), ruta
+        ))
+
+    return renderizar_en_paralelo(tareas, workers)
+
+def listar_estudiantes(indice):
+    """Muestra los estudiantes disponibles"""
+    print("\nEstudiantes disponibles:")
+    df = indice['df']
+    for id_estudiante, (inicio, _) in indice['por_id'].items():
+        print(f"  - ID: {id_estudiante} - {df['nombre'].iloc[inicio]}")
+
+def atender_consulta(indice, busqueda, graficar=True, ruta_grafico=None):
+    """
+    Resuelve una búsqueda: muestra la tabla de evolución y, opcionalmente, el gráfico.
+
+    Returns:
+        True si se encontró el estudiante
+    """
+    df_estudiante = buscar_estudiante(indice['df'], busqueda, indice)
 
     if df_estudiante.empty:
         print(f"\n❌ No se encontró ningún estudiante con: '{busqueda}'")
-        print("\nEstudiantes disponibles:")
-        estudiantes_unicos = df[['id_estudiante', 'nombre']].drop_duplicates().sort_values('id_estudiante')
-        for _, row in estudiantes_unicos.iterrows():
-            print(f"  - ID: {row['id_estudiante']} - {row['nombre']}")
-        return
+        return False
 
     # Obtener nombre del estudiante
     nombre_estudiante = df_estudiante['nombre'].iloc[0]
@@ -158,10 +278,110 @@ def main():
     mostrar_tabla(df_resultados, nombre_estudiante)
 
     # Graficar evolución
-    graficar_evolucion(df_resultados, nombre_estudiante)
+    if graficar:
+        ruta = graficar_evolucion(df_resultados, nombre_estudiante, ruta_grafico)
+        print(f"\n✅ Gráfico guardado exitosamente en: {ruta}")
+
+    return True
+
+def sesion_interactiva(indice, graficar=True):
+    """Atiende búsquedas una tras otra sobre los mismos datos cargados, hasta una línea vacía"""
+    while True:
+        try:
+            busqueda = input("\nIngrese el nombre o ID del estudiante (Enter para salir): ").strip()
+        except EOFError:
+            break
+        if not busqueda or busqueda.lower() == 'salir':
+            break
+        if not atender_consulta(indice, busqueda, graficar):
+            listar_estudiantes(indice)
+
+def consultar_lote(indice, ids, graficar=False, directorio_graficos=None, workers=None):
+    """
+    Atiende una lista de IDs sin interacción (modo --ids).
+
+    Los gráficos, si se piden, se guardan uno por estudiante y se renderizan
+    al final, todos a la vez, con el pool de graficos.py.
+    """
+    if directorio_graficos is None:
+        directorio_graficos = os.path.join('..', 'outputs')
+
+    encontrados = []
+    no_encontrados = []
+    for busqueda in ids:
+        if atender_consulta(indice, busqueda, graficar=False):
+            encontrados.append(busqueda)
+        else:
+            no_encontrados.append(busqueda)
+
+    print(f"\n✅ Consultas atendidas: {len(encontrados)} de {len(ids)}")
+    if no_encontrados:
+        print(f"❌ No encontrados: {', '.join(no_encontrados)}")
+
+    if graficar and encontrados:
+        filas = pd.concat([buscar_estudiante(indice['df'], b, indice) for b in encontrados])
+        rutas = graficar_evolucion_curso(calcular_evolucion(filas), directorio_graficos, workers)
+        print(f"✅ {len(rutas)} gráficos guardados en: {directorio_graficos}")
+
+def main():
+    """Función principal del programa"""
+    parser = argparse.ArgumentParser(description="HU02 - Evolución individual del estudiante")
+    parser.add_argument('--ids', help="IDs separados por comas para consultar en lote (sin interacción)")
+    parser.add_argument('--graficar', action='store_true',
+                        help="En modo --ids, guarda un gráfico por estudiante en ../outputs")
+    parser.add_argument('--graficos-dir', metavar='DIRECTORIO',
+                        help="Renderiza en paralelo el gráfico de evolución de todos los estudiantes")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos para renderizar gráficos (default: número de CPUs)")
+    parser.add_argument('--dpi', type=int, default=None, help="Resolución de los gráficos (default: 300)")
+    parser.add_argument('--formato', choices=['png', 'svg'], default='png',
+                        help="Formato de los gráficos (default: png)")
+    parser.add_argument('--sin-grafico', action='store_true',
+                        help="En modo interactivo, solo muestra las tablas")
+    parser.add_argument('--exportar', metavar='RUTA_CSV',
+                        help="Guarda la evolución de todos los estudiantes en un solo CSV")
+    parser.add_argument('--exportar-dir', metavar='DIRECTORIO',
+                        help="Guarda un CSV de evolución por estudiante en el directorio")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+    configurar(dpi=args.dpi, formato=args.formato)
+
+    print("\n" + "="*80)
+    print("HU02 - EVOLUCIÓN INDIVIDUAL DEL ESTUDIANTE".center(80))
+    print("="*80)
+
+    # Cargar datos
+    df = cargar_datos()
+    if df is None:
+        return
+
+    # Exportación de todo el curso en una sola pasada
+    if args.exportar or args.exportar_dir or args.graficos_dir:
+        with etapa('calculo', len(df), hu='HU02'):
+            df_evolucion = calcular_evolucion(df)
+        with etapa('guardado', len(df_evolucion), paso='exportar'):
+            if args.exportar:
+                exportar_evolucion(df_evolucion, args.exportar)
+            if args.exportar_dir:
+                exportar_evolucion_por_estudiante(df_evolucion, args.exportar_dir)
+        if args.graficos_dir:
+            rutas = graficar_evolucion_curso(df_evolucion, args.graficos_dir, args.workers)
+            print(f"\n✅ {len(rutas)} gráficos de evolución guardados en: {args.graficos_dir}")
+        return
+
+    # Índice de búsqueda: se construye una vez y atiende todas las consultas
+    indice = construir_indice(df)
+
+    if args.ids:
+        ids = [i.strip() for i in args.ids.split(',') if i.strip()]
+        consultar_lote(indice, ids, graficar=args.graficar, workers=args.workers)
+    else:
+        sesion_interactiva(indice, graficar=not args.sin_grafico)
 
     print("\n✅ Proceso completado exitosamente")
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,162 @@
+"""
+Formato compilado con mapeo en memoria
+Convierte el CSV de notas en un directorio con un arreglo binario de ancho
+fijo por columna (.npy) y tablas de diccionario para los textos:
+
+    <base>.compilado/
+        meta.json                        columnas, tipos, filas y huella del CSV
+        id_estudiante.npy, periodo.npy, nota1.npy, ...
+        nombre.codigos.npy, nombre.categorias.npy
+        asignatura.codigos.npy, asignatura.categorias.npy
+
+Al abrirlo las columnas se mapean en memoria (np.load con mmap_mode='r'):
+no se parsea ni se copia nada, el sistema operativo trae las páginas a
+medida que se leen y varios procesos de análisis que abren el mismo
+archivo comparten la misma caché de páginas.
+
+Uso:
+    python formato_compilado.py --input ../data/data-generada.csv
+"""
+
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# --- Constantes y Configuración ---
+SUFIJO_COMPILADO = '.compilado'
+META = 'meta.json'
+VERSION_COMPILADO = 1
+SUFIJO_CODIGOS = '.codigos.npy'
+SUFIJO_CATEGORIAS = '.categorias.npy'
+
+
+def ruta_compilada(ruta_csv):
+    """Directorio compilado asociado a la ruta de un CSV"""
+    return os.path.splitext(ruta_csv)[0] + SUFIJO_COMPILADO
+
+
+def es_compilado(ruta):
+    """True si la ruta es un directorio escrito por escribir_compilado"""
+    return os.path.isdir(ruta) and os.path.exists(os.path.join(ruta, META))
+
+
+def escribir_compilado(df, directorio, fuente=None):
+    """
+    Escribe el DataFrame en formato compilado.
+
+    Se escribe en un directorio temporal y luego se reemplaza el anterior:
+    los procesos que ya tenían abierto el formato viejo siguen leyendo sus
+    archivos hasta cerrarlos.
+
+    Args:
+        df: Datos de notas con el esquema tipado (textos como categorías)
+        directorio: Directorio de salida
+        fuente: Huella del CSV de origen (para saber si el compilado está vigente)
+
+    Returns:
+        Los metadatos escritos
+    """
+    temporal = directorio + '.tmp'
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    tipos = {}
+    for columna in df.columns:
+        serie = df[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            np.save(os.path.join(temporal, columna + SUFIJO_CODIGOS), serie.cat.codes.to_numpy())
+            np.save(os.path.join(temporal, columna + SUFIJO_CATEGORIAS), serie.cat.categories.to_numpy(dtype=str))
+            tipos[columna] = 'category'
+        else:
+            datos = np.ascontiguousarray(serie.to_numpy())
+            np.save(os.path.join(temporal, f'{columna}.npy'), datos)
+            tipos[columna] = str(datos.dtype)
+
+    meta = {
+        'version': VERSION_COMPILADO,
+        'filas': int(len(df)),
+        'columnas': list(df.columns),
+        'tipos': tipos,
+        'fuente': fuente
+    }
+    with open(os.path.join(temporal, META), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(directorio, ignore_errors=True)
+    os.replace(temporal, directorio)
+    return meta
+
+
+def leer_meta(directorio):
+    """Lee los metadatos de un directorio compilado (None si no es de esta versión)"""
+    with open(os.path.join(directorio, META), encoding='utf-8') as f:
+        meta = json.load(f)
+    return meta if meta.get('version') == VERSION_COMPILADO else None
+
+
+def _mapear(ruta):
+    """Arreglo mapeado en memoria, de solo lectura y sin copiar"""
+    return np.load(ruta, mmap_mode='r').view(np.ndarray)
+
+
+def abrir_compilado(directorio, columnas=None):
+    """
+    Abre el formato compilado sin parsear ni copiar las columnas numéricas.
+
+    Args:
+        directorio: Directorio escrito por escribir_compilado
+        columnas: Columnas a abrir (None = todas)
+
+    Returns:
+        DataFrame respaldado por los archivos mapeados (de solo lectura:
+        las columnas nuevas se pueden agregar, las existentes no se
+        modifican en el lugar)
+
+    Raises:
+        ValueError: Si el directorio es de otra versión del formato
+    """
+    meta = leer_meta(directorio)
+    if meta is None:
+        raise ValueError(f"'{directorio}' es de otra versión del formato compilado; vuelva a convertir el CSV")
+
+    columnas = meta['columnas'] if columnas is None else [c for c in meta['columnas'] if c in columnas]
+    datos = {}
+    for columna in columnas:
+        if meta['tipos'][columna] == 'category':
+            datos[columna] = pd.Categorical.from_codes(
+                _mapear(os.path.join(directorio, columna + SUFIJO_CODIGOS)),
+                categories=np.load(os.path.join(directorio, columna + SUFIJO_CATEGORIAS))
+            )
+        else:
+            datos[columna] = _mapear(os.path.join(directorio, f'{columna}.npy'))
+
+    # copy=False: el DataFrame usa directamente los arreglos mapeados
+    return pd.DataFrame(datos, columns=columnas, copy=False)
+
+
+def main():
+    """Convierte un CSV de notas al formato compilado"""
+    # Importación diferida: carga_datos también importa este módulo
+    from carga_datos import compilar_csv, RUTA_CSV
+
+    parser = argparse.ArgumentParser(description="Convierte el CSV de notas al formato compilado (mapeo en memoria)")
+    parser.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--output', default=None, help="Directorio de salida (default: <input sin extensión>.compilado)")
+    args = parser.parse_args()
+
+    try:
+        destino, meta = compilar_csv(args.input, args.output)
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{args.input}' NO ENCONTRADO.")
+        return
+
+    tamano = sum(e.stat().st_size for e in os.scandir(destino)) / 2 ** 20
+    print(f" {meta['filas']} filas convertidas en '{destino}' ({tamano:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
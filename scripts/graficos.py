@@ -0,0 +1,142 @@
+"""
+Renderizado compartido de gráficos
+Todos los scripts dibujan con un backend no interactivo (Agg), así que nunca
+abren ventanas ni bloquean en servidores sin pantalla. Las figuras se crean a
+partir de plantillas que se reutilizan dentro de cada proceso, y varios
+gráficos se pueden renderizar a la vez con un pool de procesos.
+
+matplotlib se importa la primera vez que se crea una figura: los scripts
+que importan este módulo pero no dibujan (p. ej. con --no-plot) no pagan su
+tiempo de importación.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from carga_datos import importar_script
+from instrumentacion import etapa
+
+# --- Constantes y Configuración ---
+FORMATOS = ('png', 'svg')
+# dpi None = el DPI por defecto de la plantilla; configurar(dpi=...) lo fija para todas
+CONFIGURACION = {
+    'dpi': None,
+    'formato': 'png'
+}
+
+# Tamaño, número de ejes y DPI por defecto de cada tipo de gráfico
+PLANTILLAS = {
+    'barras': {'figsize': (10, 6), 'filas': 1, 'dpi': 100},
+    'evolucion': {'figsize': (12, 8), 'filas': 1, 'dpi': 300},
+    'asignaturas': {'figsize': (14, 10), 'filas': 2, 'dpi': 300},
+    'promedio_general': {'figsize': (10, 6), 'filas': 1, 'dpi': 300},
+    'histograma': {'figsize': (10, 6), 'filas': 1, 'dpi': 100}
+}
+DPI_POR_DEFECTO = 100
+
+# Una figura por plantilla y por proceso: se limpia y se vuelve a usar
+_figuras = {}
+
+
+def configurar(dpi=None, formato=None):
+    """Cambia el DPI (de todas las plantillas) y/o el formato (png o svg) de los gráficos"""
+    if formato is not None:
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato no soportado: {formato!r} (opciones: {', '.join(FORMATOS)})")
+        CONFIGURACION['formato'] = formato
+    if dpi is not None:
+        CONFIGURACION['dpi'] = dpi
+
+
+def _crear_figura(figsize):
+    """Crea una figura nueva (importa matplotlib la primera vez)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
+
+def obtener_figura(plantilla):
+    """
+    Devuelve una figura limpia de la plantilla indicada y sus ejes.
+
+    La figura se reutiliza entre llamadas del mismo proceso, lo que evita
+    crear y destruir una figura por cada gráfico cuando se renderizan muchos.
+
+    Returns:
+        (figura, eje) si la plantilla tiene un eje, o (figura, [ejes]) si tiene varios
+    """
+    config = PLANTILLAS[plantilla]
+    fig = _figuras.get(plantilla)
+    if fig is None:
+        fig = _crear_figura(config['figsize'])
+        _figuras[plantilla] = fig
+    else:
+        fig.clf()
+
+    ejes = fig.subplots(config['filas'], 1)
+    return fig, ejes
+
+
+def guardar_figura(fig, ruta_salida, dpi=None, formato=None, bbox_inches=None):
+    """
+    Guarda la figura con el DPI y formato configurados.
+
+    El DPI es, en orden: el argumento dpi, el de configurar() y el de la
+    plantilla con la que se creó la figura. La extensión de ruta_salida se reemplaza por la del formato elegido.
+
+    Returns:
+        Ruta final del archivo
+    """
+    formato = formato or CONFIGURACION['formato']
+    plantilla = next((nombre for nombre, figura in _figuras.items() if figura is fig), None)
+    dpi = dpi or CONFIGURACION['dpi'] or PLANTILLAS.get(plantilla, {}).get('dpi', DPI_POR_DEFECTO)
+    ruta_salida = os.path.splitext(ruta_salida)[0] + '.' + formato
+
+    directorio = os.path.dirname(ruta_salida)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+
+    # Con Agg el dibujo se hace al guardar, así que esta es la etapa de render
+    with etapa('render', archivo=os.path.basename(ruta_salida)):
+        fig.savefig(ruta_salida, dpi=dpi, format=formato, bbox_inches=bbox_inches)
+    return ruta_salida
+
+
+def tarea(script, funcion, *args, **kwargs):
+    """
+    Describe un gráfico a renderizar: la función `funcion` del script `script`.
+
+    Se guarda el nombre del script y no la función para que cualquier
+    proceso del pool pueda importarla, aunque el script tenga guiones.
+    """
+    return {'script': script, 'funcion': funcion, 'args': args, 'kwargs': kwargs}
+
+
+def _ejecutar_tarea(datos):
+    """Ejecuta una tarea dentro de un proceso del pool"""
+    configurar(datos['dpi'], datos['formato'])
+    funcion = getattr(importar_script(datos['script']), datos['funcion'])
+    return funcion(*datos['args'], **datos['kwargs'])
+
+
+def renderizar_en_paralelo(tareas, workers=None):
+    """
+    Renderiza varios gráficos a la vez con un pool de procesos.
+
+    Args:
+        tareas: Lista de tareas creadas con tarea()
+        workers: Número de procesos (None = número de CPUs, 1 = sin pool)
+
+    Returns:
+        Lista con lo que devuelve cada función (normalmente la ruta guardada)
+    """
+    # La configuración actual viaja con cada tarea para que los procesos la usen
+    tareas = [dict(t, **CONFIGURACION) for t in tareas]
+
+    with etapa('render', paso='renderizar_en_paralelo', graficos=len(tareas), workers=workers):
+        if workers == 1 or len(tareas) <= 1:
+            return [_ejecutar_tarea(t) for t in tareas]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_ejecutar_tarea, tareas, chunksize=max(1, len(tareas) // 64)))
@@ -0,0 +1,166 @@
+"""
+HU03 - Estudiantes en riesgo
+Calcula el promedio acumulado de todos los estudiantes y la nota que necesitan
+en el periodo final para aprobar, sin recorrer estudiante por estudiante: las
+sumas por estudiante salen de np.bincount y los más graves se eligen con una
+selección parcial (np.argpartition) en lugar de ordenar todo el curso.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import cargar_notas, agregar_promedio_fila, COLUMNA_PROMEDIO, COLUMNAS_NOTAS
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+from reporte_general_hu08 import reglas_reporte, calcular_necesita, NOTA_APROBATORIA, PERIODOS_TOTALES
+
+# --- Constantes y Configuración ---
+CSV_FILE = '../data/data-generada.csv'
+OUTPUT_CSV = 'estudiantes_en_riesgo.csv'
+COLUMNAS_LECTURA = ['id_estudiante', 'nombre', 'asignatura', 'periodo'] + COLUMNAS_NOTAS
+
+
+def _primera_fila(codigos, num_grupos):
+    """Posición de la primera fila de cada grupo"""
+    primera = np.empty(num_grupos, dtype=np.int64)
+    # Con índices repetidos numpy asigna el último valor: al recorrer al revés queda la primera fila
+    primera[codigos[::-1]] = np.arange(len(codigos) - 1, -1, -1)
+    return primera
+
+
+def mas_graves(promedios, ids, k=None):
+    """
+    Posiciones de los k promedios más bajos, ordenadas por (promedio, id).
+
+    Con k menor que el total se usa np.argpartition (O(n)) y solo se ordenan
+    los k elegidos. Los empates en el límite se resuelven por id, así el
+    resultado no depende del orden de las filas.
+    """
+    n = len(promedios)
+    if k is not None and k <= 0:
+        return np.array([], dtype=np.int64)
+    if k is None or k >= n:
+        return np.lexsort((ids, promedios))
+
+    limite = promedios[np.argpartition(promedios, k - 1)[k - 1]]
+    seguros = np.flatnonzero(promedios < limite)
+    empatados = np.flatnonzero(promedios == limite)
+    empatados = empatados[np.argsort(ids[empatados], kind='stable')[:k - len(seguros)]]
+    elegidos = np.concatenate([seguros, empatados])
+    return elegidos[np.lexsort((ids[elegidos], promedios[elegidos]))]
+
+
+def calcular_riesgo(df, reglas=None, por_asignatura=False, top=None):
+    """
+    Estudiantes (o estudiante y asignatura) con promedio acumulado bajo la nota aprobatoria.
+
+    Args:
+        df: Datos de notas
+        reglas: Diccionario de reglas_reporte() (None = constantes de HU08)
+        por_asignatura: True para evaluar cada asignatura de cada estudiante por separado
+        top: Solo los `top` casos más graves (None = todos los que están en riesgo)
+
+    Returns:
+        DataFrame ordenado del más grave al menos grave con id_estudiante,
+        nombre, [asignatura,] promedio_actual y necesita_en_periodo4
+    """
+    reglas = reglas or reglas_reporte()
+    agregar_promedio_fila(df)
+
+    codigos_id, ids = pd.factorize(df['id_estudiante'], sort=False)
+    if por_asignatura:
+        codigos_asig, asignaturas = pd.factorize(df['asignatura'], sort=False)
+        codigos = codigos_id.astype(np.int64) * len(asignaturas) + codigos_asig
+        num_grupos = len(ids) * len(asignaturas)
+    else:
+        codigos, num_grupos = codigos_id, len(ids)
+
+    # Con pesos de periodo en la política, cada periodo cuenta según su peso
+    promedios = politica_notas.promedios_por_codigo(codigos, num_grupos, df[COLUMNA_PROMEDIO].to_numpy(dtype='float64'),
+                                                    df['periodo'].to_numpy())
+    promedios = promedios.round(2)
+
+    # Solo los grupos con filas y por debajo de la nota aprobatoria (los NaN quedan fuera)
+    en_riesgo = np.flatnonzero(promedios < reglas['nota_aprobatoria'])
+    id_grupo = np.asarray(ids)[en_riesgo // len(asignaturas) if por_asignatura else en_riesgo]
+    orden = en_riesgo[mas_graves(promedios[en_riesgo], id_grupo, top)]
+
+    primera = _primera_fila(codigos, num_grupos)[orden]
+    resultado = {
+        'id_estudiante': df['id_estudiante'].to_numpy()[primera],
+        'nombre': df['nombre'].iloc[primera].astype(str).to_numpy()
+    }
+    if por_asignatura:
+        resultado['asignatura'] = df['asignatura'].iloc[primera].astype(str).to_numpy()
+    resultado['promedio_actual'] = promedios[orden]
+    resultado['necesita_en_periodo4'] = calcular_necesita(promedios[orden], df['periodo'].max(), reglas)
+    return pd.DataFrame(resultado)
+
+
+def mostrar_riesgo(df_riesgo, reglas=None):
+    """Muestra la lista de estudiantes en riesgo en consola"""
+    reglas = reglas or reglas_reporte()
+    print(f"\nEstudiantes en riesgo (< {reglas['nota_aprobatoria']:.1f}):")
+    if df_riesgo.empty:
+        print(" Ningún estudiante está en riesgo.")
+        return
+
+    con_asignatura = 'asignatura' in df_riesgo.columns
+    for fila in df_riesgo.itertuples(index=False):
+        asignatura = f" - {fila.asignatura}" if con_asignatura else ""
+        necesita = "-" if np.isnan(fila.necesita_en_periodo4) else f"{fila.necesita_en_periodo4:.2f}"
+        print(f"- {fila.nombre} (ID: {fila.id_estudiante}){asignatura} - Promedio: {fila.promedio_actual:.2f}"
+              f" - Necesita: {necesita} en periodo {reglas['periodos_totales']}")
+
+
+def identificar_estudiantes_riesgo(csv_path=CSV_FILE, output_csv=OUTPUT_CSV, reglas=None,
+                                   por_asignatura=False, top=None):
+    """
+    Implementa la HU03: lista y guarda los estudiantes en riesgo.
+    """
+    print(f"---  Identificación de Estudiantes en Riesgo (HU03) ---")
+
+    try:
+        df = cargar_notas(csv_path, columnas=COLUMNAS_LECTURA)
+        print(f" Archivo '{csv_path}' leído exitosamente.")
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{csv_path}' NO ENCONTRADO.")
+        return
+    except Exception as e:
+        print(f" ERROR de lectura de CSV: {e}")
+        return
+
+    with etapa('calculo', len(df), hu='HU03'):
+        df_riesgo = calcular_riesgo(df, reglas, por_asignatura, top)
+    mostrar_riesgo(df_riesgo, reglas)
+
+    with etapa('guardado', len(df_riesgo), archivo=os.path.basename(output_csv)):
+        df_riesgo.to_csv(output_csv, index=False, float_format="%.2f", encoding='utf-8')
+    print(f"\n Lista guardada como: {output_csv}")
+    return df_riesgo
+
+
+def main():
+    """Función principal con los umbrales configurables por línea de comandos"""
+    parser = argparse.ArgumentParser(description="HU03 - Estudiantes en riesgo")
+    parser.add_argument('--input', default=CSV_FILE, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--output', default=OUTPUT_CSV, help="CSV de salida (default: %(default)s)")
+    parser.add_argument('--nota-aprobatoria', type=float, help=f"default: {NOTA_APROBATORIA}")
+    parser.add_argument('--periodos-totales', type=int, help=f"default: {PERIODOS_TOTALES}")
+    parser.add_argument('--top', type=int, default=None, help="Solo los N casos más graves")
+    parser.add_argument('--por-asignatura', action='store_true', help="Evalúa cada asignatura por separado")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+
+    reglas = reglas_reporte(nota_aprobatoria=args.nota_aprobatoria, periodos_totales=args.periodos_totales)
+    identificar_estudiantes_riesgo(args.input, args.output, reglas, args.por_asignatura, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+HU04 - Mejores estudiantes
+Ranking de los N mejores promedios del curso, de cada asignatura y de cada
+periodo en una sola pasada por bloques. Cada grupo guarda un heap acotado
+de tamaño N (heapq), así la memoria es O(grupos × N) y el costo O(n log N):
+nunca se ordena la tabla completa.
+
+Los empates se resuelven por id: a igual promedio (redondeado a 2
+decimales) va primero el id menor. Al leer por bloques, las filas de cada
+estudiante deben estar juntas en el archivo (como las escribe el generador);
+si no lo están, el ranking se calcula con el archivo completo en memoria.
+"""
+
+import argparse
+import heapq
+import os
+
+import pandas as pd
+
+from carga_datos import (cargar_notas, iterar_bloques, agregar_promedio_fila, verificar_bloques_por_estudiante,
+                         COLUMNA_PROMEDIO)
+from ejecucion_por_bloques import _separar_ultimo_estudiante, crear_control_contiguidad, verificar_contiguidad
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
+# --- Constantes y Configuración ---
+CSV_FILE = '../data/data-generada.csv'
+OUTPUT_CSV = 'mejores_estudiantes.csv'
+TOP_N = 10
+FILAS_POR_BLOQUE = 1_000_000
+CRITERIOS = ('general', 'asignatura', 'periodo')
+
+
+def crear_ranking(top=TOP_N):
+    """
+    Crea un ranking vacío.
+
+    Returns:
+        Diccionario criterio -> {grupo -> heap}. Cada heap guarda tuplas
+        (promedio, -id, nombre) y su raíz es el peor de los N guardados.
+
+    Raises:
+        ValueError: Si top es menor que 1
+    """
+    if top < 1:
+        raise ValueError(f"El ranking necesita al menos 1 estudiante por grupo (top={top})")
+    return {'top': top, 'heaps': {criterio: {} for criterio in CRITERIOS}}
+
+
+def _actualizar_heap(heap, top, promedios, ids, nombres):
+    """
+    Ofrece al heap los candidatos de un grupo.
+
+    Si el heap ya está lleno, primero se descartan por columnas los
+    candidatos que no superan a la raíz; solo los demás pasan por heapq.
+    """
+    if len(heap) == top:
+        peor_promedio, menos_peor_id, _ = heap[0]
+        supera = (promedios > peor_promedio) | ((promedios == peor_promedio) & (ids < -menos_peor_id))
+        promedios, ids = promedios[supera], ids[supera]
+
+    for promedio, id_estudiante in zip(promedios.tolist(), ids.tolist()):
+        if len(heap) < top:
+            heapq.heappush(heap, (promedio, -id_estudiante, nombres[id_estudiante]))
+        elif (promedio, -id_estudiante) > heap[0][:2]:
+            heapq.heapreplace(heap, (promedio, -id_estudiante, nombres[id_estudiante]))
+
+
+def actualizar_ranking(ranking, df):
+    """
+    Agrega al ranking los estudiantes de un bloque (cada estudiante debe estar completo).
+    """
+    if df.empty:
+        return ranking
+    agregar_promedio_fila(df)
+    nombres = df.groupby('id_estudiante', sort=False, observed=True)['nombre'].first().astype(str)
+
+    agrupaciones = {
+        'general': None,
+        'asignatura': 'asignatura',
+        'periodo': 'periodo'
+    }
+    for criterio, columna in agrupaciones.items():
+        claves = ['id_estudiante'] if columna is None else [columna, 'id_estudiante']
+        if columna == 'periodo':
+            promedios = df.groupby(claves, sort=False, observed=True)[COLUMNA_PROMEDIO].mean().round(2)
+        else:
+            # Promedio acumulado: con pesos de periodo en la política cada periodo cuenta según su peso
+            promedios = politica_notas.promedio_por_grupo(df, claves, COLUMNA_PROMEDIO).round(2)
+
+        if columna is None:
+            grupos = [('Curso', promedios)]
+        else:
+            grupos = ((grupo, serie.droplevel(0)) for grupo, serie in promedios.groupby(level=0, observed=True))
+
+        for grupo, serie in grupos:
+            grupo = grupo if isinstance(grupo, str) else int(grupo)
+            heap = ranking['heaps'][criterio].setdefault(grupo, [])
+            _actualizar_heap(heap, ranking['top'], serie.to_numpy(dtype='float64'),
+                             serie.index.to_numpy(), nombres)
+
+    return ranking
+
+
+def ranking_desde_csv(ruta_csv=CSV_FILE, top=TOP_N, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Ranking leyendo el CSV por bloques; el último estudiante de cada bloque
+    se completa con el bloque siguiente.
+
+    Si las filas de algún estudiante no están juntas (archivo desordenado o
+    directorio particionado por periodo), sus promedios quedarían partidos
+    entre bloques: se avisa y el ranking se calcula con el archivo en memoria.
+    """
+    try:
+        verificar_bloques_por_estudiante(ruta_csv)
+    except ValueError as e:
+        print(f" {e}. El ranking se calcula en memoria.")
+        return ranking_en_memoria(ruta_csv, top)
+
+    ranking = crear_ranking(top)
+    control = crear_control_contiguidad()
+    pendiente = None
+    for bloque in iterar_bloques(ruta_csv, filas_por_bloque=filas_por_bloque):
+        try:
+            verificar_contiguidad(control, bloque['id_estudiante'].to_numpy())
+        except ValueError:
+            print(" Las filas de cada estudiante no están juntas en el archivo: el ranking se calcula en memoria.")
+            return ranking_en_memoria(ruta_csv, top)
+        bloque['nombre'] = bloque['nombre'].astype(str)
+        bloque['asignatura'] = bloque['asignatura'].astype(str)
+        if pendiente is not None:
+            bloque = pd.concat([pendiente, bloque], ignore_index=True)
+        completos, pendiente = _separar_ultimo_estudiante(bloque)
+        with etapa('calculo', len(completos), hu='HU04'):
+            actualizar_ranking(ranking, completos)
+
+    if pendiente is not None:
+        actualizar_ranking(ranking, pendiente)
+    return ranking
+
+
+def ranking_en_memoria(ruta_csv=CSV_FILE, top=TOP_N):
+    """Ranking con el archivo completo cargado: no depende del orden de las filas"""
+    ranking = crear_ranking(top)
+    df = cargar_notas(ruta_csv)
+    with etapa('calculo', len(df), hu='HU04'):
+        return actualizar_ranking(ranking, df)
+
+
+def tabla_ranking(ranking):
+    """
+    Convierte el ranking en un DataFrame con criterio, grupo, posicion,
+    id_estudiante, nombre y promedio (del mejor al peor de cada grupo).
+    """
+    filas = []
+    for criterio in CRITERIOS:
+        for grupo in sorted(ranking['heaps'][criterio]):
+            mejores = sorted(ranking['heaps'][criterio][grupo], reverse=True)
+            for posicion, (promedio, menos_id, nombre) in enumerate(mejores, start=1):
+                filas.append((criterio, grupo, posicion, -menos_id, nombre, promedio))
+    return pd.DataFrame(filas, columns=['criterio', 'grupo', 'posicion', 'id_estudiante', 'nombre', 'promedio'])
+
+
+def mostrar_ranking(tabla, mostrar=3):
+    """Muestra el mejor estudiante y los primeros de cada asignatura y periodo"""
+    general = tabla[tabla['criterio'] == 'general']
+    if general.empty:
+        print(" No hay estudiantes para clasificar.")
+        return
+
+    mejor = general.iloc[0]
+    print(f"\nMejor estudiante: {mejor['nombre']} (ID: {mejor['id_estudiante']}) - Promedio: {mejor['promedio']:.2f}")
+
+    for criterio, titulo in (('asignatura', 'Asignatura'), ('periodo', 'Periodo')):
+        print(f"\n--- Mejores por {titulo} ---")
+        for grupo, filas in tabla[tabla['criterio'] == criterio].groupby('grupo', sort=False):
+            print(f" {titulo} {grupo}:")
+            for fila in filas.head(mostrar).itertuples(index=False):
+                print(f"  {fila.posicion}. {fila.nombre} (ID: {fila.id_estudiante}) - Promedio: {fila.promedio:.2f}")
+
+
+def identificar_mejores(csv_path=CSV_FILE, output_csv=OUTPUT_CSV, top=TOP_N, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Implementa la HU04: ranking de mejores estudiantes por curso, asignatura y periodo.
+    """
+    print(f"---  Mejores Estudiantes (HU04) ---")
+
+    try:
+        ranking = ranking_desde_csv(csv_path, top, filas_por_bloque)
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{csv_path}' NO ENCONTRADO.")
+        return
+    except ValueError as e:
+        print(f" ERROR: {e}")
+        return
+
+    tabla = tabla_ranking(ranking)
+    mostrar_ranking(tabla)
+
+    with etapa('guardado', len(tabla), archivo=os.path.basename(output_csv)):
+        tabla.to_csv(output_csv, index=False, float_format="%.2f", encoding='utf-8')
+    print(f"\n Ranking guardado como: {output_csv}")
+    return tabla
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="HU04 - Mejores estudiantes (top N por curso, asignatura y periodo)")
+    parser.add_argument('--input', default=CSV_FILE, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--output', default=OUTPUT_CSV, help="CSV del ranking (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=TOP_N, help="Estudiantes por grupo (default: %(default)s)")
+    parser.add_argument('--filas-por-bloque', type=int, default=FILAS_POR_BLOQUE,
+                        help="Filas leídas por bloque (default: %(default)s)")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+    if args.top < 1:
+        parser.error("--top debe ser al menos 1")
+
+    identificar_mejores(args.input, args.output, args.top, args.filas_por_bloque)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Instrumentación opcional por etapas
+Registra tiempo real, tiempo de CPU, memoria RSS pico y filas de cada etapa
+con nombre (carga, calculo, render, guardado) y al terminar el proceso
+escribe un log JSON y una traza compatible con Chrome (chrome://tracing o
+Perfetto).
+
+La memoria pico de cada etapa (rss_pico_mb) se mide en Linux reiniciando el
+pico del proceso al empezarla (/proc/self/clear_refs) y leyéndolo al final
+(VmHWM); una etapa incluye el pico de las etapas anidadas en ella. En otros
+sistemas queda en None y solo se registra rss_pico_proceso_mb, el pico
+acumulado del proceso desde su inicio (no baja entre etapas).
+
+Se activa con la variable de entorno NOTAS_INSTRUMENTACION (1 o la ruta
+base de los archivos) o con la opción --instrumentar de los scripts que la
+ofrecen. Desactivada, cada etapa cuesta unos pocos microsegundos.
+
+Uso:
+    with etapa('carga', archivo='data-generada.csv') as registro:
+        df = cargar_notas()
+        registro['filas'] = len(df)
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: sin memoria pico
+    resource = None
+
+# --- Constantes y Configuración ---
+VARIABLE_ENTORNO = 'NOTAS_INSTRUMENTACION'
+RUTA_BASE = 'instrumentacion'
+SUFIJO_LOG = '.json'
+SUFIJO_TRAZA = '.trace.json'
+RUTA_REINICIO_PICO = '/proc/self/clear_refs'
+RUTA_ESTADO_PROCESO = '/proc/self/status'
+
+_ESTADO = {
+    'activo': False,
+    'ruta_base': None,
+    'pid': None,
+    'inicio': None,
+    'etapas': [],
+    # Picos de memoria de las etapas abiertas (para las anidadas) y si el sistema permite reiniciar el pico
+    'abiertas': [],
+    'reinicio_pico': None,
+    # Pico del proceso antes del último reinicio: en Linux reiniciar el pico también reinicia ru_maxrss
+    'pico_proceso': 0.0
+}
+
+
+def activar(ruta_base=RUTA_BASE):
+    """Activa la instrumentación; los archivos se escriben al terminar el proceso"""
+    if not _ESTADO['activo']:
+        atexit.register(guardar)
+    _ESTADO.update(activo=True, ruta_base=ruta_base, pid=os.getpid(), inicio=time.perf_counter())
+
+
+def activa():
+    """True si la instrumentación está activa en este proceso"""
+    return _ESTADO['activo'] and _ESTADO['pid'] == os.getpid()
+
+
+def agregar_opcion(parser):
+    """Agrega --instrumentar [RUTA_BASE] a un parser de argparse"""
+    parser.add_argument('--instrumentar', nargs='?', const=RUTA_BASE, default=None, metavar='RUTA_BASE',
+                        help=f"Registra tiempos y memoria por etapa en RUTA_BASE{SUFIJO_LOG} y "
+                             f"RUTA_BASE{SUFIJO_TRAZA} (también con {VARIABLE_ENTORNO}=1)")
+
+
+def activar_desde_args(args):
+    """Activa la instrumentación si se pasó --instrumentar"""
+    if getattr(args, 'instrumentar', None):
+        activar(args.instrumentar)
+
+
+def _rss_pico_proceso_mb():
+    """Memoria RSS pico del proceso desde su inicio, en MB"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux la da en KB y macOS en bytes
+    pico = pico / 2 ** 20 if sys.platform == 'darwin' else pico / 2 ** 10
+    return max(pico, _ESTADO['pico_proceso'])
+
+
+def _pico_desde_reinicio_mb():
+    """Memoria RSS pico desde el último reinicio (VmHWM de Linux), en MB; None si no se puede leer"""
+    try:
+        with open(RUTA_ESTADO_PROCESO, encoding='ascii') as f:
+            for linea in f:
+                if linea.startswith('VmHWM:'):
+                    return int(linea.split()[1]) / 2 ** 10
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reiniciar_pico():
+    """Reinicia el pico de memoria del proceso a la memoria actual; False si el sistema no lo permite"""
+    if _ESTADO['reinicio_pico'] is False:
+        return False
+    _ESTADO['pico_proceso'] = max(_ESTADO['pico_proceso'], _pico_desde_reinicio_mb() or 0.0)
+    try:
+        with open(RUTA_REINICIO_PICO, 'w', encoding='ascii') as f:
+            f.write('5')
+        _ESTADO['reinicio_pico'] = _pico_desde_reinicio_mb() is not None
+    except OSError:
+        _ESTADO['reinicio_pico'] = False
+    return _ESTADO['reinicio_pico']
+
+
+def _acumular_pico(marcos, pico):
+    """Lleva un pico de memoria a las etapas abiertas que lo contienen"""
+    for marco in marcos:
+        marco['pico'] = max(marco['pico'], pico)
+
+
+@contextmanager
+def etapa(nombre, filas=None, **detalles):
+    """
+    Mide una etapa con nombre.
+
+    Args:
+        nombre: carga, calculo, render o guardado
+        filas: Filas procesadas (también se puede asignar con registro['filas'] dentro del bloque)
+        **detalles: Datos extra para el log (hu, archivo, paso, ...)
+
+    Yields:
+        Diccionario del registro de la etapa
+    """
+    registro = {'nombre': nombre, 'filas': filas}
+    registro.update(detalles)
+    if not activa():
+        yield registro
+        return
+
+    # Antes de reiniciar el pico, las etapas que contienen a esta se quedan con el suyo hasta ahora
+    abiertas = _ESTADO['abiertas']
+    if abiertas:
+        _acumular_pico(abiertas, _pico_desde_reinicio_mb() or 0.0)
+    marco = {'pico': 0.0}
+    reiniciado = _reiniciar_pico()
+    abiertas.append(marco)
+
+    cpu = time.process_time()
+    inicio = time.perf_counter()
+    error = None
+    try:
+        yield registro
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        fin = time.perf_counter()
+        abiertas.remove(marco)
+        pico = _pico_desde_reinicio_mb() if reiniciado else None
+        if pico is not None:
+            pico = max(marco['pico'], pico)
+            _acumular_pico(abiertas, pico)
+        registro.update(
+            inicio_s=inicio - _ESTADO['inicio'],
+            segundos=fin - inicio,
+            cpu_segundos=time.process_time() - cpu,
+            rss_pico_mb=pico,
+            rss_pico_proceso_mb=_rss_pico_proceso_mb(),
+            error=error
+        )
+        if registro['filas'] is not None:
+            registro['filas'] = int(registro['filas'])
+        _ESTADO['etapas'].append(registro)
+
+
+def etapas():
+    """Registros de las etapas medidas hasta ahora"""
+    return list(_ESTADO['etapas'])
+
+
+def _nombre_evento(registro):
+    """Nombre visible en la traza: la etapa y su detalle principal"""
+    detalle = registro.get('hu') or registro.get('paso') or registro.get('archivo')
+    return f"{registro['nombre']}: {detalle}" if detalle else registro['nombre']
+
+
+def traza_chrome(registros):
+    """Convierte los registros al formato de eventos de Chrome (fases 'X', tiempos en µs)"""
+    eventos = []
+    for registro in registros:
+        argumentos = {k: v for k, v in registro.items() if k not in ('nombre', 'inicio_s', 'segundos') and v is not None}
+        eventos.append({
+            'name': _nombre_evento(registro),
+            'cat': registro['nombre'],
+            'ph': 'X',
+            'ts': registro['inicio_s'] * 1e6,
+            'dur': registro['segundos'] * 1e6,
+            'pid': _ESTADO['pid'],
+            'tid': 0,
+            'args': argumentos
+        })
+    return {'traceEvents': eventos, 'displayTimeUnit': 'ms'}
+
+
+def guardar(ruta_base=None):
+    """
+    Escribe el log JSON y la traza de Chrome.
+
+    Solo escribe el proceso que activó la instrumentación (no los procesos
+    hijos de un pool, que heredan el estado).
+
+    Returns:
+        (ruta del log, ruta de la traza) o None si no hay nada que guardar
+    """
+    if not activa() or not _ESTADO['etapas']:
+        return None
+    ruta_base = ruta_base or _ESTADO['ruta_base']
+    directorio = os.path.dirname(ruta_base)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+
+    log = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'comando': sys.argv,
+        'pid': _ESTADO['pid'],
+        'etapas': _ESTADO['etapas']
+    }
+    rutas = (ruta_base + SUFIJO_LOG, ruta_base + SUFIJO_TRAZA)
+    for ruta, contenido in zip(rutas, (log, traza_chrome(_ESTADO['etapas']))):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(contenido, f, ensure_ascii=False, indent=1)
+    return rutas
+
+
+# Activación por variable de entorno al importar el módulo
+_valor = os.environ.get(VARIABLE_ENTORNO, '').strip()
+if _valor and _valor.lower() not in ('0', 'false', 'no'):
+    activar(RUTA_BASE if _valor.lower() in ('1', 'true', 'si', 'sí') else _valor)
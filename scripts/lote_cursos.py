@@ -0,0 +1,266 @@
+"""
+Ejecución en lote sobre muchos cursos
+Recibe un directorio o patrones glob con archivos de notas (un archivo por
+curso o grupo) y corre las HU elegidas sobre cada uno con un pool de
+procesos. Cada curso se procesa completo dentro de un proceso (carga,
+cálculo y guardado), así que el rendimiento crece con el número de núcleos.
+
+Salidas en --output:
+    <curso>/                     tablas de cada HU (como ejecutar_todo.py)
+    resumen_cursos.csv           promedio, estudiantes en riesgo y mejor promedio por curso
+    ranking_asignaturas.csv      promedio de cada asignatura en todos los cursos
+
+Uso:
+    python lote_cursos.py ../data/cursos --workers 8
+    python lote_cursos.py '../data/2024-*/*.csv' --hu HU05,HU08
+"""
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import ejecutar_todo
+from carga_datos import cargar_notas, COLUMNA_PROMEDIO
+from esquema_estrella import es_estrella
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
+# --- Constantes y Configuración ---
+DIRECTORIO_SALIDA = os.path.join('..', 'outputs', 'cursos')
+EXTENSIONES = ('.csv',)
+SALIDA_RESUMEN = 'resumen_cursos.csv'
+SALIDA_RANKING = 'ranking_asignaturas.csv'
+# Columnas enteras del resumen (con un curso fallido quedan vacías, no como decimales)
+COLUMNAS_ENTERAS = ('filas', 'estudiantes', 'en_riesgo', 'top', 'cambios_bruscos')
+
+
+def encontrar_archivos(entradas):
+    """
+    Expande directorios (sus .csv y sus cursos en esquema estrella) y patrones
+    glob en una lista ordenada y sin repetidos.
+    """
+    rutas = []
+    for entrada in entradas:
+        if es_estrella(entrada):
+            rutas.append(entrada)
+        elif os.path.isdir(entrada):
+            rutas.extend(os.path.join(entrada, nombre) for nombre in os.listdir(entrada)
+                         if nombre.lower().endswith(EXTENSIONES) or es_estrella(os.path.join(entrada, nombre)))
+        else:
+            rutas.extend(glob.glob(entrada) or ([entrada] if os.path.exists(entrada) else []))
+    return sorted(set(os.path.normpath(r) for r in rutas))
+
+
+def nombres_cursos(rutas):
+    """
+    Nombre de cada curso: el del archivo sin extensión, o la ruta relativa
+    a la carpeta común si dos archivos se llaman igual.
+    """
+    nombres = [os.path.splitext(os.path.basename(r))[0] for r in rutas]
+    if len(set(nombres)) == len(nombres):
+        return nombres
+
+    base = os.path.commonpath([os.path.abspath(os.path.dirname(r)) for r in rutas])
+    return [os.path.splitext(os.path.relpath(os.path.abspath(r), base))[0].replace(os.sep, '_') for r in rutas]
+
+
+def analizar_curso(ruta_csv, curso, directorio_salida, hus=ejecutar_todo.HUS, graficos=False):
+    """
+    Corre las HU sobre un curso y guarda sus tablas en directorio_salida/curso.
+
+    Se ejecuta dentro de los procesos del pool: devuelve solo un resumen
+    pequeño (no los DataFrames), para que viajar de vuelta sea barato.
+
+    Returns:
+        (fila del resumen del curso, filas del ranking de asignaturas)
+    """
+    inicio = time.perf_counter()
+    df = cargar_notas(ruta_csv, columnas=ejecutar_todo.COLUMNAS_LECTURA)
+    resultados = ejecutar_todo.calcular_todo(df, hus)
+
+    directorio = os.path.join(directorio_salida, curso)
+    ejecutar_todo.guardar_resultados(resultados, directorio)
+    if graficos:
+        ejecutar_todo.graficar_resultados(resultados, directorio, workers=1)
+
+    resumen = {
+        'curso': curso,
+        'archivo': ruta_csv,
+        'filas': len(df),
+        'estudiantes': int(df['id_estudiante'].nunique()),
+        'promedio_curso': float(df[COLUMNA_PROMEDIO].mean()) if len(df) else np.nan
+    }
+    if 'promedio_anual' in resultados:
+        resumen['promedio_anual'] = resultados['promedio_anual']
+    if 'reporte' in resultados:
+        reporte = resultados['reporte']
+        resumen['en_riesgo'] = int((reporte['estado'] == 'En riesgo').sum())
+        resumen['porcentaje_riesgo'] = resumen['en_riesgo'] / max(len(reporte), 1) * 100
+        resumen['top'] = int((reporte['estado'] == 'Top').sum())
+        resumen['mejor_promedio'] = float(reporte['promedio_actual'].max()) if len(reporte) else np.nan
+    if 'cambios_bruscos' in resultados:
+        resumen['cambios_bruscos'] = int(resultados['cambios_bruscos']['id_estudiante'].nunique())
+
+    asignaturas = []
+    if 'promedios_asignaturas' in resultados:
+        promedios = resultados['promedios_asignaturas']
+        asignaturas = [
+            {'curso': curso, 'asignatura': str(asignatura), 'promedio': float(fila.Promedio_General),
+             'registros': int(fila.Total_Registros)}
+            for asignatura, fila in zip(promedios.index, promedios.itertuples(index=False))
+        ]
+
+    resumen['segundos'] = time.perf_counter() - inicio
+    return resumen, asignaturas
+
+
+def ranking_asignaturas(filas):
+    """
+    Ranking de asignaturas entre cursos: promedio ponderado por registros, de
+    la más baja a la más alta (como HU05), con el peor y el mejor curso de cada una.
+    """
+    columnas = ['posicion', 'asignatura', 'promedio', 'cursos', 'registros',
+                'peor_curso', 'peor_promedio', 'mejor_curso', 'mejor_promedio']
+    if not filas:
+        return pd.DataFrame(columns=columnas)
+
+    df = pd.DataFrame(filas)
+    df['ponderado'] = df['promedio'] * df['registros']
+    grupos = df.groupby('asignatura')
+    ranking = pd.DataFrame({
+        'promedio': grupos['ponderado'].sum() / grupos['registros'].sum(),
+        'cursos': grupos['curso'].nunique(),
+        'registros': grupos['registros'].sum()
+    })
+
+    peores = df.loc[grupos['promedio'].idxmin()].set_index('asignatura')
+    mejores = df.loc[grupos['promedio'].idxmax()].set_index('asignatura')
+    ranking['peor_curso'], ranking['peor_promedio'] = peores['curso'], peores['promedio']
+    ranking['mejor_curso'], ranking['mejor_promedio'] = mejores['curso'], mejores['promedio']
+
+    ranking = ranking.sort_values('promedio').reset_index()
+    ranking['posicion'] = np.arange(1, len(ranking) + 1)
+    return ranking[columnas]
+
+
+def ejecutar_lote(rutas, directorio_salida=DIRECTORIO_SALIDA, hus=ejecutar_todo.HUS, workers=None, graficos=False):
+    """
+    Procesa todos los cursos y guarda el resumen consolidado.
+
+    Args:
+        rutas: Archivos de notas (uno por curso)
+        directorio_salida: Carpeta de salida (una subcarpeta por curso)
+        hus: HU a calcular en cada curso
+        workers: Procesos del pool (None = número de CPUs, 1 = sin pool)
+        graficos: True para guardar también los gráficos de cada curso
+
+    Returns:
+        (DataFrame resumen por curso, DataFrame ranking de asignaturas)
+    """
+    cursos = nombres_cursos(rutas)
+    resumenes = []
+    asignaturas = []
+
+    def registrar(curso, ruta, resultado=None, error=None):
+        if error is not None:
+            print(f" ERROR en '{ruta}': {error}")
+            resumenes.append({'curso': curso, 'archivo': ruta, 'error': str(error)})
+            return
+        resumen, filas_asignaturas = resultado
+        resumenes.append(resumen)
+        asignaturas.extend(filas_asignaturas)
+        print(f" [{len(resumenes)}/{len(rutas)}] {curso}: {resumen['filas']} filas en {resumen['segundos']:.2f} s")
+
+    with etapa('calculo', paso='lote', cursos=len(rutas), workers=workers):
+        if workers == 1 or len(rutas) <= 1:
+            for ruta, curso in zip(rutas, cursos):
+                try:
+                    registrar(curso, ruta, analizar_curso(ruta, curso, directorio_salida, hus, graficos))
+                except Exception as e:
+                    registrar(curso, ruta, error=e)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pendientes = {
+                    pool.submit(analizar_curso, ruta, curso, directorio_salida, hus, graficos): (curso, ruta)
+                    for ruta, curso in zip(rutas, cursos)
+                }
+                for futuro in as_completed(pendientes):
+                    curso, ruta = pendientes[futuro]
+                    try:
+                        registrar(curso, ruta, futuro.result())
+                    except Exception as e:
+                        registrar(curso, ruta, error=e)
+
+    # Mismo orden que los archivos, sin importar cuál terminó primero
+    orden = {curso: i for i, curso in enumerate(cursos)}
+    resumen = pd.DataFrame(resumenes)
+    resumen = resumen.iloc[resumen['curso'].map(orden).argsort()].reset_index(drop=True)
+    resumen = resumen.astype({c: 'Int64' for c in COLUMNAS_ENTERAS if c in resumen.columns})
+    ranking = ranking_asignaturas(asignaturas)
+
+    os.makedirs(directorio_salida, exist_ok=True)
+    for nombre_archivo, tabla in ((SALIDA_RESUMEN, resumen), (SALIDA_RANKING, ranking)):
+        with etapa('guardado', len(tabla), archivo=nombre_archivo):
+            tabla.to_csv(os.path.join(directorio_salida, nombre_archivo), index=False, float_format="%.2f",
+                         encoding='utf-8')
+    return resumen, ranking
+
+
+def mostrar_resumen(resumen, ranking):
+    """Muestra el resumen consolidado en consola"""
+    correctos = resumen[resumen['error'].isna()] if 'error' in resumen.columns else resumen
+    print(f"\n--- Resumen de {len(correctos)} cursos ---")
+    if correctos.empty:
+        return
+    print(f" Filas procesadas: {int(correctos['filas'].sum())}")
+    mejor = correctos.loc[correctos['promedio_curso'].idxmax()]
+    peor = correctos.loc[correctos['promedio_curso'].idxmin()]
+    print(f" Curso con mejor promedio: {mejor['curso']} ({mejor['promedio_curso']:.2f})")
+    print(f" Curso con peor promedio: {peor['curso']} ({peor['promedio_curso']:.2f})")
+    if 'en_riesgo' in correctos.columns:
+        print(f" Estudiantes en riesgo (todos los cursos): {int(correctos['en_riesgo'].sum())}")
+    if not ranking.empty:
+        print(f" Asignatura más baja: {ranking['asignatura'].iloc[0]} ({ranking['promedio'].iloc[0]:.2f})")
+        print(f" Asignatura más alta: {ranking['asignatura'].iloc[-1]} ({ranking['promedio'].iloc[-1]:.2f})")
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Corre las HU sobre muchos archivos de notas en paralelo")
+    parser.add_argument('entradas', nargs='+', help="Directorios o patrones glob de archivos CSV")
+    parser.add_argument('--output', default=DIRECTORIO_SALIDA, help="Directorio de salida (default: %(default)s)")
+    parser.add_argument('--hu', default=','.join(ejecutar_todo.HUS),
+                        help="HU a calcular, separadas por coma (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos en paralelo (default: número de CPUs)")
+    parser.add_argument('--graficos', action='store_true', help="Guarda también los gráficos de cada curso")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+
+    hus = tuple(h.strip().upper() for h in args.hu.split(',') if h.strip())
+    desconocidas = set(hus) - set(ejecutar_todo.HUS)
+    if desconocidas:
+        parser.error(f"HU no disponibles en lote: {', '.join(sorted(desconocidas))} "
+                     f"(opciones: {', '.join(ejecutar_todo.HUS)})")
+
+    rutas = encontrar_archivos(args.entradas)
+    if not rutas:
+        print(" ERROR: No se encontraron archivos de notas.")
+        return
+
+    print(f"---  Lote de {len(rutas)} cursos ({', '.join(hus)}) ---")
+    resumen, ranking = ejecutar_lote(rutas, args.output, hus, args.workers, args.graficos)
+    mostrar_resumen(resumen, ranking)
+    print(f"\n Resumen guardado en: {os.path.join(args.output, SALIDA_RESUMEN)}")
+    print(f" Ranking de asignaturas guardado en: {os.path.join(args.output, SALIDA_RANKING)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Comando unificado de las HU
+Un solo punto de entrada con un subcomando por HU y opciones comunes
+(--input, --output, --no-plot). Las rutas por defecto se resuelven desde la
+raíz del proyecto, así que el comando funciona desde cualquier directorio
+(por ejemplo, desde un programador de tareas).
+
+Al arrancar solo se importan módulos de la biblioteca estándar: el script
+de la HU se importa cuando se ejecuta su subcomando, y matplotlib solo
+cuando se dibuja un gráfico. `notas.py arranque` mide cuánto tarda en
+arrancar cada subcomando y qué módulos pesados carga.
+
+Uso:
+    python scripts/notas.py hu01
+    python scripts/notas.py hu06 --umbral 1.5 --output outputs/reportes
+    python scripts/notas.py hu07 --no-plot --periodo 3
+    python scripts/notas.py todo --graficos
+    python scripts/notas.py arranque
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+
+# --- Constantes y Configuración ---
+DIRECTORIO_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(DIRECTORIO_SCRIPTS)
+RUTA_CSV = os.path.join(RAIZ, 'data', 'data-generada.csv')
+DIRECTORIO_SALIDA = os.path.join(RAIZ, 'outputs')
+REPETICIONES_ARRANQUE = 5
+# Igual que politica_notas.AYUDA_OPCION (no se importa: arrastraría pandas al arranque)
+AYUDA_POLITICA = ("JSON con la política de calificación (también con NOTAS_POLITICA=RUTA). "
+                  "En memoria se admite cualquiera; --memory-budget no admite pesos_periodos, "
+                  "--tensor solo admite pesos de nota1..nota3 (no de asistencia_%% ni participacion) "
+                  "y --punto-fijo solo la política simple. El histograma de HU07 por bloques "
+                  "(--memory-budget, --streaming) necesita pesos con pocos decimales")
+MODULOS_PESADOS = ('pandas', 'numpy', 'matplotlib')
+
+# Script de cada subcomando (se importa solo al ejecutarlo)
+SCRIPTS = {
+    'hu01': 'analisis_hu01.py',
+    'hu02': 'evolucion-estudiante-HU02.py',
+    'hu03': 'hu03_estudiantes_riesgo.py',
+    'hu04': 'hu04_mejor_estudiante.py',
+    'hu05': 'promedio-asignatura-HU05.py',
+    'hu06': 'cambios-rendimiento-HU06.py',
+    'hu07': 'distribucion-notas-HU07.py',
+    'hu08': 'reporte_general_hu08.py',
+    'todo': 'ejecutar_todo.py'
+}
+
+# Proceso hijo de `arranque`: importa el script de un subcomando y reporta el tiempo
+CODIGO_MEDICION = """
+import json, sys, time
+inicio = time.perf_counter()
+sys.path.insert(0, {directorio!r})
+from carga_datos import importar_script
+importar_script({script!r})
+print(json.dumps({{'importacion': time.perf_counter() - inicio,
+                  'modulos': [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+
+def importar_hu(subcomando):
+    """Importa el script de un subcomando (registrado como etapa de carga)"""
+    with etapa('carga', paso='importar', hu=subcomando):
+        # carga_datos trae pandas y numpy: solo se importa cuando hay que ejecutar una HU
+        from carga_datos import importar_script
+        return importar_script(SCRIPTS[subcomando])
+
+
+def _salida(args, nombre_archivo):
+    """Ruta de un archivo de salida dentro de --output"""
+    os.makedirs(args.output, exist_ok=True)
+    return os.path.join(args.output, os.path.basename(nombre_archivo))
+
+
+def _entero_positivo(texto):
+    """Tipo de argparse para cantidades que deben ser al menos 1"""
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"debe ser al menos 1 (se recibió {valor})")
+    return valor
+
+
+def _reglas(args):
+    """Reglas de HU08 con los umbrales pasados por línea de comandos"""
+    hu08 = importar_hu('hu08')
+    return hu08.reglas_reporte(
+        nota_aprobatoria=getattr(args, 'nota_aprobatoria', None),
+        nota_top=getattr(args, 'nota_top', None),
+        periodos_totales=getattr(args, 'periodos_totales', None)
+    )
+
+
+def ejecutar_hu01(args):
+    hu = importar_hu('hu01')
+    hu.calcular_y_graficar_promedios_hu01(args.input, _salida(args, hu.OUTPUT_IMAGE), graficar=not args.no_plot)
+
+
+def ejecutar_hu02(args):
+    hu = importar_hu('hu02')
+    df = hu.cargar_datos(args.input)
+    if df is None:
+        return
+    indice = hu.construir_indice(df)
+    if args.ids:
+        ids = [i.strip() for i in args.ids.split(',') if i.strip()]
+        hu.consultar_lote(indice, ids, graficar=not args.no_plot, directorio_graficos=args.output)
+    else:
+        hu.sesion_interactiva(indice, graficar=not args.no_plot)
+
+
+def ejecutar_hu03(args):
+    hu = importar_hu('hu03')
+    hu.identificar_estudiantes_riesgo(args.input, _salida(args, hu.OUTPUT_CSV), _reglas(args),
+                                      args.por_asignatura, args.top)
+
+
+def ejecutar_hu04(args):
+    hu = importar_hu('hu04')
+    hu.identificar_mejores(args.input, _salida(args, hu.OUTPUT_CSV), args.top)
+
+
+def ejecutar_hu05(args):
+    hu = importar_hu('hu05')
+    hu.analizar_promedios_asignatura(args.input, _salida(args, 'promedios_asignaturas.png'),
+                                     graficar=not args.no_plot)
+
+
+def ejecutar_hu06(args):
+    hu = importar_hu('hu06')
+    hu.detectar_cambios_bruscos(args.input, args.umbral, args.por_asignatura, _salida(args, hu.OUTPUT_CSV))
+
+
+def ejecutar_hu07(args):
+    hu = importar_hu('hu07')
+    ruta_grafico = _salida(args, hu.OUTPUT_IMAGE)
+    if args.streaming:
+        hu.generar_histograma_streaming([args.input], periodos=args.periodo,
+                                        ruta_grafico=ruta_grafico, graficar=not args.no_plot)
+    else:
+        hu.generar_histograma_notas(args.input, args.periodo, ruta_grafico, graficar=not args.no_plot)
+
+
+def ejecutar_hu08(args):
+    hu = importar_hu('hu08')
+    hu.generar_reporte(args.input, _salida(args, hu.CSV_OUTPUT), _reglas(args))
+
+
+def ejecutar_todo(args):
+    hu = importar_hu('todo')
+    hu.ejecutar(args.input, args.output, graficos=args.graficos and not args.no_plot,
+                workers=args.workers, presupuesto=args.presupuesto, tensor=args.tensor,
+                centesimas=args.punto_fijo)
+
+
+def medir_arranque(subcomandos, repeticiones=REPETICIONES_ARRANQUE):
+    """
+    Mide el arranque de cada subcomando en procesos nuevos: el tiempo total
+    del proceso (intérprete + importaciones) y el de importar su script.
+
+    Returns:
+        Lista de diccionarios con subcomando, segundos_proceso,
+        segundos_importacion y los módulos pesados cargados (mejor de `repeticiones`)
+    """
+    resultados = []
+    for subcomando in subcomandos:
+        codigo = CODIGO_MEDICION.format(directorio=DIRECTORIO_SCRIPTS, script=SCRIPTS[subcomando],
+                                        pesados=MODULOS_PESADOS)
+        mejor = None
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True,
+                                    check=True, cwd=DIRECTORIO_SCRIPTS)
+            total = time.perf_counter() - inicio
+            medicion = json.loads(salida.stdout.strip().splitlines()[-1])
+            if mejor is None or total < mejor['segundos_proceso']:
+                mejor = {
+                    'subcomando': subcomando,
+                    'segundos_proceso': total,
+                    'segundos_importacion': medicion['importacion'],
+                    'modulos': medicion['modulos']
+                }
+        resultados.append(mejor)
+    return resultados
+
+
+def ejecutar_arranque(args):
+    subcomandos = args.subcomandos.split(',') if args.subcomandos else list(SCRIPTS)
+    desconocidos = [s for s in subcomandos if s not in SCRIPTS]
+    if desconocidos:
+        print(f" ERROR: Subcomandos desconocidos: {', '.join(desconocidos)}")
+        return
+
+    resultados = medir_arranque(subcomandos, args.repeticiones)
+    print(f"\n{'Subcomando':<12} {'Proceso ms':>11} {'Importación ms':>15}  Módulos cargados")
+    for r in resultados:
+        print(f"{r['subcomando']:<12} {r['segundos_proceso'] * 1000:>11.0f} "
+              f"{r['segundos_importacion'] * 1000:>15.0f}  {', '.join(r['modulos']) or '-'}")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"\n Mediciones guardadas en: {args.salida}")
+
+
+def crear_parser():
+    """Parser con un subcomando por HU y las opciones comunes"""
+    comunes = argparse.ArgumentParser(add_help=False)
+    comunes.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    comunes.add_argument('--output', default=DIRECTORIO_SALIDA,
+                         help="Directorio de reportes y gráficos (default: %(default)s)")
+    comunes.add_argument('--no-plot', action='store_true', help="No genera gráficos (no importa matplotlib)")
+    agregar_opcion(comunes)
+    # Igual que politica_notas.agregar_opcion, sin importar numpy ni pandas al arrancar
+    comunes.add_argument('--politica', default=None, metavar='RUTA', help=AYUDA_POLITICA)
+
+    parser = argparse.ArgumentParser(description="Análisis de notas: un subcomando por HU")
+    subparsers = parser.add_subparsers(dest='subcomando', required=True)
+
+    def subcomando(nombre, ayuda, funcion):
+        sub = subparsers.add_parser(nombre, parents=[comunes], help=ayuda, description=ayuda)
+        sub.set_defaults(funcion=funcion)
+        return sub
+
+    subcomando('hu01', "Promedio del curso por periodo", ejecutar_hu01)
+
+    sub = subcomando('hu02', "Evolución individual del estudiante", ejecutar_hu02)
+    sub.add_argument('--ids', help="IDs separados por comas (sin interacción)")
+
+    sub = subcomando('hu03', "Estudiantes en riesgo", ejecutar_hu03)
+    sub.add_argument('--top', type=int, default=None, help="Solo los N casos más graves")
+    sub.add_argument('--por-asignatura', action='store_true', help="Evalúa cada asignatura por separado")
+    sub.add_argument('--nota-aprobatoria', type=float)
+    sub.add_argument('--periodos-totales', type=int)
+
+    sub = subcomando('hu04', "Mejores estudiantes", ejecutar_hu04)
+    sub.add_argument('--top', type=_entero_positivo, default=10, help="Estudiantes por grupo (default: %(default)s)")
+
+    subcomando('hu05', "Promedio por asignatura", ejecutar_hu05)
+
+    sub = subcomando('hu06', "Cambios bruscos de rendimiento", ejecutar_hu06)
+    sub.add_argument('--umbral', type=float, default=1.0,
+                     help="Diferencia mínima entre periodos consecutivos (default: %(default)s)")
+    sub.add_argument('--por-asignatura', action='store_true', help="Detecta cambios por estudiante y asignatura")
+
+    sub = subcomando('hu07', "Distribución de notas", ejecutar_hu07)
+    sub.add_argument('--periodo', type=int, action='append', default=None,
+                     help="Solo las notas de este periodo (se puede repetir)")
+    sub.add_argument('--streaming', action='store_true', help="Lee por bloques con memoria constante")
+
+    sub = subcomando('hu08', "Reporte general", ejecutar_hu08)
+    sub.add_argument('--nota-aprobatoria', type=float)
+    sub.add_argument('--nota-top', type=float)
+    sub.add_argument('--periodos-totales', type=int)
+
+    sub = subcomando('todo', "Todas las HU con una sola lectura del archivo", ejecutar_todo)
+    sub.add_argument('--graficos', action='store_true', help="Genera también los gráficos de HU01, HU05 y HU07")
+    sub.add_argument('--workers', type=int, default=None, help="Procesos para renderizar gráficos")
+    sub.add_argument('--memory-budget', '--presupuesto-memoria', dest='presupuesto', default=None,
+                     help="Procesa el archivo por bloques con esta memoria máxima (p. ej. 512M, 2G)")
+    sub.add_argument('--tensor', action='store_true',
+                     help="Calcula las HU sobre el tensor denso estudiantes × asignaturas × periodos")
+    sub.add_argument('--punto-fijo', action='store_true',
+                     help="Guarda las notas en centésimas enteras y agrega sin error de redondeo")
+
+    sub = subparsers.add_parser('arranque', help="Mide el tiempo de arranque de cada subcomando")
+    sub.set_defaults(funcion=ejecutar_arranque)
+    sub.add_argument('--subcomandos', default=None, help="Subcomandos a medir, separados por coma (default: todos)")
+    sub.add_argument('--repeticiones', type=int, default=REPETICIONES_ARRANQUE,
+                     help="Procesos por subcomando; se guarda el más rápido (default: %(default)s)")
+    sub.add_argument('--salida', default=None, help="JSON donde guardar las mediciones")
+
+    return parser
+
+
+def main():
+    """Función principal"""
+    args = crear_parser().parse_args()
+    activar_desde_args(args)
+    if getattr(args, 'politica', None):
+        import politica_notas
+        politica_notas.activar(args.politica)
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
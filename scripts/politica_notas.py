@@ -0,0 +1,359 @@
+"""
+Políticas de calificación configurables
+Una política dice cómo se calcula la nota de cada fila (pesos de nota1..nota3
+y, opcionalmente, de asistencia_% y participacion llevadas a la escala de
+0 a 5), cuánto pesa cada periodo en el promedio acumulado del estudiante y
+las reglas de HU08 (nota aprobatoria, nota top, periodos del año).
+
+Las políticas se leen de un archivo JSON, con una política o una lista en
+"politicas":
+
+    {
+        "nombre": "ponderada",
+        "pesos": {"nota1": 0.3, "nota2": 0.3, "nota3": 0.3, "asistencia_%": 0.1},
+        "pesos_periodos": [0.2, 0.2, 0.3, 0.3],
+        "reglas": {"nota_aprobatoria": 3.0, "nota_top": 4.5}
+    }
+
+Los pesos se normalizan para que sumen 1; sin "pesos_periodos" todos los
+periodos pesan igual y "periodos_totales" sale de las reglas de HU08 o del
+largo de "pesos_periodos". La nota de todas las filas para varias políticas
+a la vez es un solo producto de matrices (filas × componentes) @
+(componentes × políticas).
+
+La política activa la usan todas las HU (a través de agregar_promedio_fila
+y reglas_reporte). Se activa con la variable de entorno NOTAS_POLITICA o
+con la opción --politica de los scripts que la ofrecen; sin activarla se
+usa la política simple (promedio de las 3 notas, periodos iguales).
+
+Uso:
+    python politica_notas.py ../config/politicas-ejemplo.json --input ../data/data-generada.csv
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- Constantes y Configuración ---
+VARIABLE_ENTORNO = 'NOTAS_POLITICA'
+COLUMNAS_NOTAS = ['nota1', 'nota2', 'nota3']
+COMPONENTES = COLUMNAS_NOTAS + ['asistencia_%', 'participacion']
+# Factor que lleva cada componente a la escala de las notas (0 a 5)
+ESCALAS = {'nota1': 1.0, 'nota2': 1.0, 'nota3': 1.0, 'asistencia_%': 5 / 100, 'participacion': 5.0}
+REGLAS = ('nota_aprobatoria', 'nota_maxima', 'nota_top', 'periodos_totales')
+SALIDA_COMPARACION = 'comparacion_politicas.csv'
+# Los modos alternativos de ejecutar_todo no representan todas las políticas
+# (texto de ayuda de argparse: el % va doble)
+AYUDA_OPCION = (f"JSON con la política de calificación (también con {VARIABLE_ENTORNO}=RUTA). "
+                "En memoria se admite cualquiera; --memory-budget no admite pesos_periodos, "
+                "--tensor solo admite pesos de nota1..nota3 (no de asistencia_%% ni participacion) "
+                "y --punto-fijo solo la política simple. El histograma de HU07 por bloques "
+                "(--memory-budget, --streaming) necesita pesos con pocos decimales")
+
+_ESTADO = {
+    'politica': None
+}
+
+
+def politica_simple():
+    """Política por defecto: promedio simple de las 3 notas y todos los periodos con el mismo peso"""
+    return normalizar_politica({'nombre': 'simple', 'pesos': {c: 1.0 for c in COLUMNAS_NOTAS}})
+
+
+def normalizar_politica(config):
+    """
+    Valida una política leída del JSON y normaliza sus pesos.
+
+    Returns:
+        Diccionario con 'nombre', 'pesos' (suman 1), 'escalas',
+        'pesos_periodos' (lista o None) y 'reglas'
+
+    Raises:
+        ValueError: Si hay componentes o reglas desconocidas o pesos inválidos
+    """
+    nombre = str(config.get('nombre', 'politica'))
+    pesos = {c: float(p) for c, p in config.get('pesos', {c: 1.0 for c in COLUMNAS_NOTAS}).items()}
+    desconocidos = set(pesos) - set(COMPONENTES)
+    if desconocidos:
+        raise ValueError(f"Política '{nombre}': componentes desconocidos: {', '.join(sorted(desconocidos))} "
+                         f"(opciones: {', '.join(COMPONENTES)})")
+    if any(p < 0 for p in pesos.values()) or sum(pesos.values()) <= 0:
+        raise ValueError(f"Política '{nombre}': los pesos deben ser positivos y sumar más de 0")
+    total = sum(pesos.values())
+    pesos = {c: pesos[c] / total for c in COMPONENTES if pesos.get(c, 0) > 0}
+
+    escalas = dict(ESCALAS)
+    escalas.update({c: float(e) for c, e in config.get('escalas', {}).items() if c in ESCALAS})
+
+    reglas = dict(config.get('reglas', {}))
+    desconocidas = set(reglas) - set(REGLAS)
+    if desconocidas:
+        raise ValueError(f"Política '{nombre}': reglas desconocidas: {', '.join(sorted(desconocidas))}")
+
+    pesos_periodos = config.get('pesos_periodos')
+    if pesos_periodos is not None:
+        pesos_periodos = [float(p) for p in pesos_periodos]
+        if not pesos_periodos or any(p < 0 for p in pesos_periodos) or sum(pesos_periodos) <= 0:
+            raise ValueError(f"Política '{nombre}': pesos_periodos debe tener pesos positivos")
+        reglas.setdefault('periodos_totales', len(pesos_periodos))
+        if len(pesos_periodos) < reglas['periodos_totales']:
+            raise ValueError(f"Política '{nombre}': pesos_periodos tiene {len(pesos_periodos)} pesos y el año "
+                             f"tiene {reglas['periodos_totales']} periodos")
+
+    return {'nombre': nombre, 'pesos': pesos, 'escalas': escalas, 'pesos_periodos': pesos_periodos, 'reglas': reglas}
+
+
+def cargar_politicas(ruta):
+    """Lee las políticas de un archivo JSON (una política o una lista en "politicas")"""
+    with open(ruta, encoding='utf-8') as f:
+        config = json.load(f)
+    configs = config['politicas'] if isinstance(config, dict) and 'politicas' in config else config
+    if isinstance(configs, dict):
+        configs = [configs]
+    politicas = [normalizar_politica(c) for c in configs]
+    nombres = [p['nombre'] for p in politicas]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError(f"Nombres de política repetidos en '{ruta}'")
+    return politicas
+
+
+def activar(ruta):
+    """
+    Activa la (primera) política del archivo para todas las HU de este proceso.
+
+    También la deja en NOTAS_POLITICA para que los procesos hijos (pools de
+    cálculo o de gráficos) usen la misma.
+    """
+    _ESTADO['politica'] = cargar_politicas(ruta)[0]
+    os.environ[VARIABLE_ENTORNO] = os.path.abspath(ruta)
+    return _ESTADO['politica']
+
+
+def politica_activa():
+    """La política activa (la de NOTAS_POLITICA si está definida, o la simple)"""
+    if _ESTADO['politica'] is None:
+        ruta = os.environ.get(VARIABLE_ENTORNO)
+        _ESTADO['politica'] = cargar_politicas(ruta)[0] if ruta else politica_simple()
+    return _ESTADO['politica']
+
+
+def agregar_opcion(parser):
+    """Agrega --politica RUTA a un parser de argparse"""
+    parser.add_argument('--politica', default=None, metavar='RUTA', help=AYUDA_OPCION)
+
+
+def activar_desde_args(args):
+    """Activa la política si se pasó --politica"""
+    if getattr(args, 'politica', None):
+        activar(args.politica)
+
+
+def es_simple(politica=None):
+    """True si la nota de la fila es el promedio simple de las 3 notas"""
+    pesos = (politica or politica_activa())['pesos']
+    return set(pesos) == set(COLUMNAS_NOTAS) and np.allclose(list(pesos.values()), 1 / len(COLUMNAS_NOTAS))
+
+
+def columnas_politica(politica=None):
+    """Columnas que necesita la política para calcular la nota de cada fila"""
+    return list((politica or politica_activa())['pesos'])
+
+
+def con_columnas_politica(columnas, politica=None):
+    """Agrega a `columnas` las que usa la política (None sigue siendo todas)"""
+    if columnas is None:
+        return None
+    return list(columnas) + [c for c in columnas_politica(politica) if c not in columnas]
+
+
+def calcular_notas_fila(df, politicas):
+    """
+    Nota de cada fila para varias políticas con un solo producto de matrices.
+
+    Returns:
+        Arreglo float64 de forma (filas, políticas)
+
+    Raises:
+        ValueError: Si una política usa una columna que no está en los datos
+    """
+    componentes = [c for c in COMPONENTES if any(c in p['pesos'] for p in politicas)]
+    faltantes = [c for c in componentes if c not in df.columns]
+    if faltantes:
+        raise ValueError(f"La política usa columnas que no están en los datos: {', '.join(faltantes)}")
+
+    # Los valores se escriben con 2 decimales: se redondean para no arrastrar el error de float32
+    valores = np.round(df[componentes].to_numpy(dtype='float64'), 2)
+    # Cada política lleva sus escalas en la matriz de pesos: (componentes × políticas)
+    matriz = np.array([[p['pesos'].get(c, 0.0) * p['escalas'][c] for p in politicas] for c in componentes])
+    return valores @ matriz
+
+
+def promedio_fila(df, politica=None):
+    """Nota de cada fila (float64) con la política indicada o la activa"""
+    politica = politica or politica_activa()
+    if es_simple(politica):
+        return np.round(df[COLUMNAS_NOTAS].to_numpy(dtype='float64'), 2).mean(axis=1)
+    return calcular_notas_fila(df, [politica])[:, 0]
+
+
+def pesos_de_periodos(periodos, politica=None):
+    """
+    Peso de cada periodo según la política (None si todos pesan igual).
+
+    Raises:
+        ValueError: Si un periodo no tiene peso en la política
+    """
+    politica = politica or politica_activa()
+    if politica['pesos_periodos'] is None:
+        return None
+    pesos = np.asarray(politica['pesos_periodos'])
+    periodos = np.asarray(periodos, dtype=np.int64)
+    fuera = periodos[(periodos < 1) | (periodos > len(pesos))]
+    if len(fuera):
+        raise ValueError(f"Política '{politica['nombre']}': sin peso para el periodo {int(fuera[0])}")
+    return pesos[periodos - 1]
+
+
+def promedios_por_codigo(codigos, num_grupos, valores, periodos, politica=None):
+    """
+    Promedio acumulado de cada grupo (códigos 0..num_grupos-1) con los pesos de periodo.
+
+    Sin pesos es el promedio de todas las filas del grupo; con pesos, el
+    promedio de cada periodo ponderado por su peso (solo entre los periodos
+    que tiene el grupo). Todo con np.bincount, sin recorrer grupos.
+    """
+    pesos = pesos_de_periodos(np.unique(periodos), politica) if len(periodos) else None
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if pesos is None:
+            return np.bincount(codigos, weights=valores, minlength=num_grupos) / \
+                np.bincount(codigos, minlength=num_grupos)
+
+        codigo_p, unicos = pd.factorize(periodos, sort=True)
+        celda = codigos.astype(np.int64) * len(unicos) + codigo_p
+        sumas = np.bincount(celda, weights=valores, minlength=num_grupos * len(unicos))
+        conteos = np.bincount(celda, minlength=num_grupos * len(unicos))
+        medias = (sumas / conteos).reshape(num_grupos, len(unicos))
+        presentes = conteos.reshape(num_grupos, len(unicos)) > 0
+        pesos_presentes = np.where(presentes, pesos_de_periodos(unicos, politica), 0.0)
+        return (np.where(presentes, medias, 0.0) * pesos_presentes).sum(axis=1) / pesos_presentes.sum(axis=1)
+
+
+def promedio_por_grupo(df, claves, columna, politica=None, sort=False):
+    """
+    Serie con el promedio acumulado de `columna` por `claves`, con los pesos de periodo de la política.
+
+    Sin pesos de periodo es exactamente df.groupby(claves)[columna].mean().
+    """
+    politica = politica or politica_activa()
+    if politica['pesos_periodos'] is None:
+        return df.groupby(claves, sort=sort, observed=True)[columna].mean()
+
+    por_periodo = df.groupby(list(claves) + ['periodo'], sort=sort, observed=True)[columna].mean()
+    pesos = pd.Series(pesos_de_periodos(por_periodo.index.get_level_values('periodo'), politica),
+                      index=por_periodo.index)
+    niveles = list(range(len(claves)))
+    return (por_periodo * pesos).groupby(level=niveles, sort=sort).sum() / pesos.groupby(level=niveles, sort=sort).sum()
+
+
+def evaluar_politicas(df, politicas):
+    """
+    Reporte de HU08 para varias políticas a la vez.
+
+    La nota de cada fila para todas las políticas sale de un producto de
+    matrices; el promedio de cada estudiante en cada periodo, de un solo
+    groupby con una columna por política.
+
+    Returns:
+        DataFrame con id_estudiante, nombre y, por política,
+        promedio_<nombre>, necesita_<nombre> y estado_<nombre>
+    """
+    from carga_datos import importar_script
+    hu08 = importar_script('reporte_general_hu08.py')
+
+    notas = calcular_notas_fila(df, politicas)
+    nombres = [p['nombre'] for p in politicas]
+    claves = [df['id_estudiante'].to_numpy(), df['periodo'].to_numpy()]
+    por_periodo = pd.DataFrame(notas, columns=nombres).groupby(claves, sort=True).agg(['mean', 'count'])
+    periodos = por_periodo.index.get_level_values(1)
+
+    # Peso de cada (estudiante, periodo) por política: el de la política o,
+    # sin pesos de periodo, el número de filas (promedio de todas las filas)
+    pesos = np.column_stack([
+        pesos_de_periodos(periodos, p) if p['pesos_periodos'] is not None else
+        por_periodo[(p['nombre'], 'count')].to_numpy(dtype='float64')
+        for p in politicas
+    ])
+    medias = np.column_stack([por_periodo[(n, 'mean')].to_numpy() for n in nombres])
+    ids = por_periodo.index.get_level_values(0)
+    ponderados = pd.DataFrame(medias * pesos, index=ids).groupby(level=0).sum()
+    promedios = (ponderados / pd.DataFrame(pesos, index=ids).groupby(level=0).sum()).round(2)
+
+    reporte = pd.DataFrame({'id_estudiante': promedios.index.to_numpy()})
+    if 'nombre' in df.columns:
+        reporte['nombre'] = df.groupby('id_estudiante', sort=True, observed=True)['nombre'].first().to_numpy()
+    periodos_actuales = df['periodo'].max()
+    for i, politica in enumerate(politicas):
+        reglas = hu08.reglas_reporte(politica=politica)
+        valores = promedios[i].to_numpy()
+        reporte[f"promedio_{politica['nombre']}"] = valores
+        reporte[f"necesita_{politica['nombre']}"] = hu08.calcular_necesita(valores, periodos_actuales, reglas)
+        reporte[f"estado_{politica['nombre']}"] = hu08.clasificar_estados(valores, reglas)
+    return reporte
+
+
+def resumen_politicas(reporte, politicas):
+    """Promedio del grupo, estudiantes por estado y cambios de estado respecto a la primera política"""
+    base = f"estado_{politicas[0]['nombre']}"
+    filas = []
+    for politica in politicas:
+        nombre = politica['nombre']
+        estados = reporte[f"estado_{nombre}"]
+        filas.append({
+            'politica': nombre,
+            'promedio_grupo': reporte[f"promedio_{nombre}"].mean(),
+            'en_riesgo': int((estados == 'En riesgo').sum()),
+            'aprobados': int((estados == 'Aprobado').sum()),
+            'top': int((estados == 'Top').sum()),
+            'cambian_estado': int((estados != reporte[base]).sum())
+        })
+    return pd.DataFrame(filas)
+
+
+def main():
+    """Función principal"""
+    from carga_datos import cargar_notas, RUTA_CSV
+    from instrumentacion import etapa, agregar_opcion as agregar_instrumentacion, activar_desde_args as instrumentar
+
+    parser = argparse.ArgumentParser(description="Compara varias políticas de calificación sobre el mismo curso")
+    parser.add_argument('archivos', nargs='+', help="JSON de políticas (cada uno con una o varias)")
+    parser.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--output', default=SALIDA_COMPARACION, help="CSV por estudiante (default: %(default)s)")
+    agregar_instrumentacion(parser)
+    args = parser.parse_args()
+    instrumentar(args)
+
+    try:
+        politicas = [p for ruta in args.archivos for p in cargar_politicas(ruta)]
+        columnas = set(c for p in politicas for c in p['pesos'])
+        df = cargar_notas(args.input, columnas=['id_estudiante', 'nombre', 'periodo'] + sorted(columnas))
+        with etapa('calculo', len(df), paso='politicas', politicas=len(politicas)):
+            reporte = evaluar_politicas(df, politicas)
+    except FileNotFoundError as e:
+        print(f" ERROR: Archivo '{e.filename or e}' NO ENCONTRADO.")
+        return
+    except (ValueError, KeyError) as e:
+        print(f" ERROR: {e}")
+        return
+
+    resumen = resumen_politicas(reporte, politicas)
+    print(f"\n--- {len(politicas)} políticas sobre {len(reporte)} estudiantes ---")
+    print(resumen.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    reporte.to_csv(args.output, index=False, float_format="%.2f", encoding='utf-8')
+    print(f"\n Comparación por estudiante guardada en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,34 +4,40 @@ Como profesor, quiero ver los promedios por asignatura,
 para saber en qué materia los estudiantes están teniendo más dificultad.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 
-def cargar_datos():
+from carga_datos import cargar_notas, agregar_promedio_fila, RUTA_CSV, COLUMNA_PROMEDIO, COLUMNAS_NOTAS
+from graficos import obtener_figura, guardar_figura
+from instrumentacion import etapa
+
+COLUMNAS_LECTURA = ['asignatura'] + COLUMNAS_NOTAS
+
+def cargar_datos(ruta_csv=RUTA_CSV):
     """Carga el archivo CSV con los datos"""
-    ruta_csv = os.path.join('..', 'data', 'data-generada.csv')
     try:
-        df = pd.read_csv(ruta_csv)
+        df = cargar_notas(ruta_csv, columnas=COLUMNAS_LECTURA)
         return df
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {ruta_csv}")
         return None
 
 def calcular_promedio_notas(df):
-    """Calcula el promedio de nota1, nota2 y nota3 para cada registro"""
-    df['promedio_notas'] = (df['nota1'] + df['nota2'] + df['nota3']) / 3
-    return df
+    """Calcula el promedio de nota1, nota2 y nota3 para cada registro (columna COLUMNA_PROMEDIO)"""
+    return agregar_promedio_fila(df)
 
 def calcular_promedios_por_asignatura(df):
     """Calcula los promedios agrupados por asignatura"""
     # Calcular promedio de las 3 notas
     df = calcular_promedio_notas(df)
 
+    # Las notas se promedian en float64 desde sus 2 decimales (como promedio_fila),
+    # no desde float32: la media de float32 puede mover el redondeo a 2 decimales
+    df = df.assign(**{nota: np.round(df[nota].to_numpy(dtype='float64'), 2) for nota in COLUMNAS_NOTAS})
+
     # Agrupar por asignatura y calcular estadísticas
-    promedios = df.groupby('asignatura').agg({
-        'promedio_notas': ['mean', 'std', 'count'],
+    promedios = df.groupby('asignatura', observed=True).agg({
+        COLUMNA_PROMEDIO: ['mean', 'std', 'count'],
         'nota1': 'mean',
         'nota2': 'mean',
         'nota3': 'mean'
@@ -50,8 +56,8 @@ def calcular_promedio_general(df):
     """Calcula el promedio general cuando no hay columna de asignatura"""
     df = calcular_promedio_notas(df)
 
-    promedio_general = df['promedio_notas'].mean()
-    desviacion = df['promedio_notas'].std()
+    promedio_general = df[COLUMNA_PROMEDIO].mean()
+    desviacion = df[COLUMNA_PROMEDIO].std()
     total_registros = len(df)
 
     return {
@@ -114,9 +120,9 @@ def mostrar_tabla_general(stats):
 
     print("\n" + "="*80)
 
-def graficar_promedios_asignaturas(promedios_df):
+def graficar_promedios_asignaturas(promedios_df, ruta_salida=None, dpi=None):
     """Crea el gráfico de barras con los promedios por asignatura"""
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+    fig, (ax1, ax2) = obtener_figura('asignaturas')
 
     # Gráfico 1: Barras horizontales ordenadas
     asignaturas = promedios_df.index
@@ -179,18 +185,18 @@ def graficar_promedios_asignaturas(promedios_df):
     ax2.legend()
     ax2.grid(axis='y', alpha=0.3, linestyle='--')
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     # Guardar el gráfico
-    ruta_salida = os.path.join('..', 'outputs', 'promedios_asignaturas.png')
-    plt.savefig(ruta_salida, dpi=300, bbox_inches='tight')
+    if ruta_salida is None:
+        ruta_salida = os.path.join('..', 'outputs', 'promedios_asignaturas.png')
+    ruta_salida = guardar_figura(fig, ruta_salida, dpi=dpi, bbox_inches='tight')
     print(f"\n✅ Gráfico guardado exitosamente en: {ruta_salida}")
+    return ruta_salida
 
-    plt.show()
-
-def graficar_promedio_general(stats):
+def graficar_promedio_general(stats, ruta_salida=None, dpi=None):
     """Crea un gráfico simple para el promedio general"""
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = obtener_figura('promedio_general')
 
     # Gráfico de barra simple
     ax.bar(['Promedio General'], [stats['Promedio_General']],
@@ -218,23 +224,23 @@ def graficar_promedio_general(stats):
             verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5),
             fontsize=10)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     # Guardar el gráfico
-    ruta_salida = os.path.join('..', 'outputs', 'promedios_asignaturas.png')
-    plt.savefig(ruta_salida, dpi=300, bbox_inches='tight')
+    if ruta_salida is None:
+        ruta_salida = os.path.join('..', 'outputs', 'promedios_asignaturas.png')
+    ruta_salida = guardar_figura(fig, ruta_salida, dpi=dpi, bbox_inches='tight')
     print(f"\n✅ Gráfico guardado exitosamente en: {ruta_salida}")
+    return ruta_salida
 
-    plt.show()
-
-def main():
-    """Función principal del programa"""
-    print("\n" + "="*100)
-    print("HU05 - PROMEDIO POR ASIGNATURA".center(100))
-    print("="*100)
+def analizar_promedios_asignatura(ruta_csv=RUTA_CSV, ruta_grafico=None, graficar=True):
+    """
+    Implementa la HU05: tabla de promedios por asignatura y su gráfico.
 
+    Con graficar=False solo muestra las tablas (no importa matplotlib).
+    """
     # Cargar datos
-    df = cargar_datos()
+    df = cargar_datos(ruta_csv)
     if df is None:
         return
 
@@ -245,28 +251,40 @@ def main():
         print("✅ Columna 'asignatura' encontrada. Generando análisis por asignatura...")
 
         # Calcular promedios por asignatura
-        promedios_df = calcular_promedios_por_asignatura(df)
+        with etapa('calculo', len(df), hu='HU05'):
+            promedios_df = calcular_promedios_por_asignatura(df)
 
         # Mostrar tabla
         mostrar_tabla_asignaturas(promedios_df)
 
         # Graficar
-        graficar_promedios_asignaturas(promedios_df)
+        if graficar:
+            graficar_promedios_asignaturas(promedios_df, ruta_grafico)
 
     else:
         print("⚠️  Columna 'asignatura' no encontrada. Calculando promedio general...")
 
         # Calcular promedio general
-        stats = calcular_promedio_general(df)
+        with etapa('calculo', len(df), hu='HU05'):
+            stats = calcular_promedio_general(df)
 
         # Mostrar tabla
         mostrar_tabla_general(stats)
 
         # Graficar
-        graficar_promedio_general(stats)
+        if graficar:
+            graficar_promedio_general(stats, ruta_grafico)
 
     print("\n✅ Proceso completado exitosamente")
 
+def main():
+    """Función principal del programa"""
+    print("\n" + "="*100)
+    print("HU05 - PROMEDIO POR ASIGNATURA".center(100))
+    print("="*100)
+
+    analizar_promedios_asignatura()
+
 if __name__ == "__main__":
     main()
 
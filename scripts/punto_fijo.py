@@ -0,0 +1,459 @@
+"""
+Modo de punto fijo: notas guardadas como centésimas enteras
+Las notas se escriben siempre con 2 decimales en la escala 0-5, así que se
+pueden guardar sin pérdida como enteros: nota1..nota3 y asistencia_% en
+centésimas int16 (hasta 327.67) y participacion en centésimas uint8 (0-1).
+Cada fila guarda además la suma de sus 3 notas en centésimas (int16).
+
+Las agregaciones suman en int64, así los promedios son fracciones exactas
+(suma / (3 * 100 * filas)):
+    - los umbrales (nota aprobatoria, nota top, diferencia de HU06) se
+      comparan con enteros, sin error de redondeo en 3.0 o 4.5
+    - el redondeo a 2 decimales es "mitad hacia arriba" exacto: un promedio
+      de exactamente 2.995 siempre queda en 3.00
+Los valores se pasan a decimales solo al final, para las tablas de salida.
+
+Solo se admite el promedio simple de las 3 notas (una política con pesos
+no da fracciones exactas en centésimas).
+
+Uso:
+    python punto_fijo.py --input ../data/data-generada.csv
+    python punto_fijo.py --input ../data/data-generada.csv --comparar
+    python ejecutar_todo.py --punto-fijo
+"""
+
+import argparse
+import time
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import cargar_notas, importar_script, RUTA_CSV, COLUMNAS_NOTAS, COLUMNA_PROMEDIO
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
+# --- Constantes y Configuración ---
+ESCALA = 100
+# Tipos enteros de cada columna decimal (en centésimas)
+TIPOS_PUNTO_FIJO = {
+    'nota1': 'int16',
+    'nota2': 'int16',
+    'nota3': 'int16',
+    'asistencia_%': 'int16',
+    'participacion': 'uint8'
+}
+# Diferencia máxima con el entero más cercano para aceptar un valor como centésima exacta
+# (las notas leídas en float32 llegan con un error del orden de 1e-5)
+TOLERANCIA = 1e-3
+# Suma de nota1..nota3 de cada fila, en centésimas
+COLUMNA_SUMA = 'suma_centesimas'
+COLUMNAS_LECTURA = ['id_estudiante', 'nombre', 'asignatura', 'periodo'] + COLUMNAS_NOTAS
+PERIODOS_ANALISIS = [1, 2, 3]
+NUM_BINS = 20
+UMBRAL_DIFERENCIA = 1.0
+HUS = ('HU01', 'HU05', 'HU06', 'HU07', 'HU08')
+
+
+def a_centesimas(valores, tipo='int16', columna='valor'):
+    """
+    Convierte valores con hasta 2 decimales a centésimas enteras.
+
+    Raises:
+        ValueError: Si hay valores vacíos, con más de 2 decimales o fuera del rango del tipo
+    """
+    escalados = np.asarray(valores, dtype=np.float64) * ESCALA
+    if np.isnan(escalados).any():
+        raise ValueError(f"La columna '{columna}' tiene valores vacíos; el modo punto fijo los necesita todos")
+    enteros = np.rint(escalados)
+    if (np.abs(escalados - enteros) > TOLERANCIA).any():
+        raise ValueError(f"La columna '{columna}' tiene valores con más de 2 decimales")
+    limites = np.iinfo(tipo)
+    if len(enteros) and (enteros.min() < limites.min or enteros.max() > limites.max):
+        raise ValueError(f"La columna '{columna}' tiene valores fuera del rango de {tipo} en centésimas")
+    return enteros.astype(tipo)
+
+
+def centesimas_escalar(valor, nombre='valor'):
+    """Centésimas enteras de un umbral (3.0 -> 300); ValueError si tiene más de 2 decimales"""
+    return int(a_centesimas([valor], 'int64', nombre)[0])
+
+
+def convertir_a_punto_fijo(df):
+    """
+    Pasa las columnas decimales del df a centésimas enteras (en el mismo df)
+    y agrega COLUMNA_SUMA con la suma de nota1..nota3 de cada fila.
+
+    Las columnas se convierten de a una, así la tabla en float32 y la
+    entera no llegan a estar completas en memoria al mismo tiempo.
+
+    Returns:
+        El mismo DataFrame
+
+    Raises:
+        ValueError: Si algún valor no se puede guardar en centésimas sin pérdida
+    """
+    for columna, tipo in TIPOS_PUNTO_FIJO.items():
+        if columna in df.columns:
+            df[columna] = a_centesimas(df[columna].to_numpy(), tipo, columna)
+    # Máximo 3 * 500: la suma cabe en int16
+    df[COLUMNA_SUMA] = df['nota1'].to_numpy() + df['nota2'].to_numpy() + df['nota3'].to_numpy()
+    return df
+
+
+def verificar_politica(politica=None):
+    """
+    Raises:
+        ValueError: Si la política no es el promedio simple de las notas con periodos sin pesos
+    """
+    politica = politica or politica_notas.politica_activa()
+    if not politica_notas.es_simple(politica) or politica['pesos_periodos'] is not None:
+        raise ValueError(f"El modo punto fijo solo calcula el promedio simple; "
+                         f"la política '{politica['nombre']}' usa pesos")
+
+
+def cargar_punto_fijo(ruta_csv=RUTA_CSV, columnas=COLUMNAS_LECTURA):
+    """
+    Carga el archivo con cargar_notas y lo convierte a centésimas enteras.
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si la política no es la simple o algún valor tiene más de 2 decimales
+    """
+    verificar_politica()
+    df = cargar_notas(ruta_csv, columnas=columnas)
+    with etapa('calculo', len(df), paso='punto_fijo'):
+        return convertir_a_punto_fijo(df)
+
+
+def redondear(numeradores, denominadores):
+    """
+    Redondeo exacto de numeradores / denominadores al entero más cercano,
+    con las mitades alejándose de cero (2.5 -> 3, -2.5 -> -3).
+    """
+    numeradores = np.asarray(numeradores, dtype=np.int64)
+    denominadores = np.asarray(denominadores, dtype=np.int64)
+    magnitudes = (2 * np.abs(numeradores) + denominadores) // (2 * denominadores)
+    return np.sign(numeradores) * magnitudes
+
+
+def a_decimal(centesimas):
+    """Centésimas enteras a decimales (float64) para mostrar o guardar"""
+    return np.asarray(centesimas, dtype=np.float64) / ESCALA
+
+
+def _sumas(df, claves):
+    """Suma (int64) de COLUMNA_SUMA y número de filas por grupo, ordenados por las claves"""
+    return df.groupby(claves, observed=True, sort=True)[COLUMNA_SUMA].agg(['sum', 'count'])
+
+
+def _promedio_centesimas(sumas, conteos):
+    """Promedio de las notas en centésimas redondeadas: suma / (3 * filas)"""
+    return redondear(sumas, len(COLUMNAS_NOTAS) * np.asarray(conteos, dtype=np.int64))
+
+
+def promedios_por_periodo(df, periodos_analisis=PERIODOS_ANALISIS):
+    """
+    HU01: promedio del curso en cada periodo y promedio anual parcial.
+
+    El promedio anual es la media exacta de los promedios exactos de cada
+    periodo (con Fraction: son solo unos pocos valores).
+
+    Returns:
+        (Serie periodo -> promedio, promedio anual o None si falta algún periodo)
+    """
+    grupos = _sumas(df[df['periodo'].isin(periodos_analisis)], 'periodo')
+    exactos = [Fraction(int(s), len(COLUMNAS_NOTAS) * ESCALA * int(n)) for s, n in zip(grupos['sum'], grupos['count'])]
+
+    promedios = pd.Series(a_decimal(_promedio_centesimas(grupos['sum'], grupos['count'])),
+                          index=pd.Index(grupos.index, name='periodo'), name=COLUMNA_PROMEDIO)
+    if len(promedios) != len(periodos_analisis):
+        return promedios, None
+    anual = sum(exactos) / len(exactos) * ESCALA
+    return promedios, float(a_decimal(redondear(anual.numerator, anual.denominator)))
+
+
+def promedios_por_asignatura(df):
+    """
+    HU05: promedio, desviación, registros y promedio de cada nota por asignatura.
+
+    La varianza se calcula con las sumas enteras de la suma de cada fila y
+    de su cuadrado; solo la raíz cuadrada es en punto flotante.
+    """
+    sumas = df[COLUMNA_SUMA].to_numpy().astype(np.int64)
+    grupos = df.assign(**{'_cuadrado': sumas * sumas}).groupby('asignatura', observed=True, sort=True)
+    conteos = grupos[COLUMNA_SUMA].count()
+    totales = grupos[[COLUMNA_SUMA, '_cuadrado'] + COLUMNAS_NOTAS].sum()
+
+    desviaciones = []
+    for total, cuadrados, n in zip(totales[COLUMNA_SUMA], totales['_cuadrado'], conteos):
+        n, total, cuadrados = int(n), int(total), int(cuadrados)
+        varianza = Fraction(n * cuadrados - total * total, n * (n - 1)) if n > 1 else None
+        escala = (len(COLUMNAS_NOTAS) * ESCALA) ** 2
+        desviaciones.append(np.nan if varianza is None else float(np.sqrt(float(varianza / escala))))
+
+    promedios = pd.DataFrame({
+        'Promedio_General': a_decimal(_promedio_centesimas(totales[COLUMNA_SUMA], conteos)),
+        'Desviacion_Std': np.round(desviaciones, 2),
+        'Total_Registros': conteos.to_numpy(dtype=np.int64),
+        'Promedio_Nota1': a_decimal(redondear(totales['nota1'], conteos)),
+        'Promedio_Nota2': a_decimal(redondear(totales['nota2'], conteos)),
+        'Promedio_Nota3': a_decimal(redondear(totales['nota3'], conteos))
+    }, index=pd.Index(np.asarray(conteos.index, dtype=object), name='asignatura'))
+
+    return promedios.sort_values('Promedio_General')
+
+
+def _transiciones(grupos, entidad):
+    """
+    Pares de grupos consecutivos (por periodo) de la misma entidad.
+
+    Returns:
+        (posiciones de origen, numerador y denominador exactos de la
+        diferencia de promedios en centésimas)
+    """
+    claves = grupos.index.to_frame(index=False)
+    misma = np.ones(max(len(grupos) - 1, 0), dtype=bool)
+    for columna in entidad:
+        valores = claves[columna].to_numpy()
+        misma &= valores[1:] == valores[:-1]
+    origen = np.flatnonzero(misma)
+
+    s, n = grupos['sum'].to_numpy(), grupos['count'].to_numpy()
+    # s2 / (3 n2) - s1 / (3 n1), en centésimas
+    numeradores = s[origen + 1] * n[origen] - s[origen] * n[origen + 1]
+    denominadores = len(COLUMNAS_NOTAS) * n[origen] * n[origen + 1]
+    return origen, numeradores, denominadores
+
+
+def cambios_bruscos(df, umbral=UMBRAL_DIFERENCIA, por_asignatura=False):
+    """
+    HU06: transiciones entre periodos consecutivos con |diferencia| > umbral.
+
+    Mismas columnas y orden que calcular_cambios_bruscos de HU06. La
+    comparación con el umbral es entera (|s2 n1 - s1 n2| > 3 * umbral * n1 n2,
+    en centésimas); en el modo por estudiante, `asignatura` es la que más
+    cambió (la primera en orden alfabético si hay empate).
+    """
+    umbral_c = centesimas_escalar(umbral, 'umbral')
+    por_materia = _sumas(df, ['id_estudiante', 'asignatura', 'periodo'])
+    origen_a, num_a, den_a = _transiciones(por_materia, ['id_estudiante', 'asignatura'])
+    claves_a = por_materia.index.to_frame(index=False)
+    promedios_a = _promedio_centesimas(por_materia['sum'], por_materia['count'])
+
+    if por_asignatura:
+        marcadas = np.abs(num_a) > umbral_c * den_a
+        desde = origen_a[marcadas]
+        resultado = {
+            'id_estudiante': claves_a['id_estudiante'].to_numpy()[desde],
+            'asignatura': np.asarray(claves_a['asignatura'].to_numpy()[desde], dtype=object),
+            'periodo_desde': claves_a['periodo'].to_numpy()[desde],
+            'periodo_hasta': claves_a['periodo'].to_numpy()[desde + 1],
+            'promedio_desde': a_decimal(promedios_a[desde]),
+            'promedio_hasta': a_decimal(promedios_a[desde + 1]),
+            'diferencia': a_decimal(redondear(num_a[marcadas], den_a[marcadas]))
+        }
+    else:
+        por_estudiante = _sumas(df, ['id_estudiante', 'periodo'])
+        origen_e, num_e, den_e = _transiciones(por_estudiante, ['id_estudiante'])
+        claves_e = por_estudiante.index.to_frame(index=False)
+        promedios_e = _promedio_centesimas(por_estudiante['sum'], por_estudiante['count'])
+        marcadas = np.abs(num_e) > umbral_c * den_e
+        desde = origen_e[marcadas]
+        ids = claves_e['id_estudiante'].to_numpy()[desde]
+        hasta = claves_e['periodo'].to_numpy()[desde + 1]
+
+        # Asignatura que más cambió al llegar a cada periodo marcado (solo se
+        # miran las transiciones por asignatura de esos periodos). |num / den|
+        # se compara como float (una sola división por valor: fracciones
+        # iguales dan el mismo float) y el orden estable deja primero la alfabética
+        id_t = claves_a['id_estudiante'].to_numpy()[origen_a + 1]
+        hasta_t = claves_a['periodo'].to_numpy()[origen_a + 1]
+        en_marcadas = pd.MultiIndex.from_arrays([id_t, hasta_t]).isin(pd.MultiIndex.from_arrays([ids, hasta]))
+        cambios = pd.DataFrame({
+            'id_estudiante': id_t[en_marcadas],
+            'periodo': hasta_t[en_marcadas],
+            'asignatura': np.asarray(claves_a['asignatura'].to_numpy()[origen_a[en_marcadas] + 1], dtype=object),
+            'cambio': np.abs(num_a[en_marcadas]) / den_a[en_marcadas]
+        }).sort_values('cambio', ascending=False, kind='stable')
+        mayor = cambios.drop_duplicates(['id_estudiante', 'periodo']).set_index(['id_estudiante', 'periodo'])['asignatura']
+        asignaturas = mayor.reindex(pd.MultiIndex.from_arrays([ids, hasta])).to_numpy()
+
+        resultado = {
+            'id_estudiante': ids,
+            'asignatura': np.where(pd.isna(asignaturas), None, asignaturas),
+            'periodo_desde': claves_e['periodo'].to_numpy()[desde],
+            'periodo_hasta': hasta,
+            'promedio_desde': a_decimal(promedios_e[desde]),
+            'promedio_hasta': a_decimal(promedios_e[desde + 1]),
+            'diferencia': a_decimal(redondear(num_e[marcadas], den_e[marcadas]))
+        }
+
+    if 'nombre' in df.columns:
+        nombres = df.drop_duplicates('id_estudiante').set_index('id_estudiante')['nombre']
+        resultado['nombre'] = np.asarray(nombres.reindex(resultado['id_estudiante']).to_numpy(), dtype=object)
+    else:
+        resultado['nombre'] = None
+    columnas = ['id_estudiante', 'nombre', 'asignatura', 'periodo_desde', 'periodo_hasta',
+                'promedio_desde', 'promedio_hasta', 'diferencia']
+    return pd.DataFrame(resultado)[columnas]
+
+
+def estadisticas_notas(df, bins=NUM_BINS):
+    """
+    HU07: media, mediana y conteos del histograma de los promedios de cada fila.
+
+    Cada fila cae en su barra con aritmética entera:
+    barra = (suma - mínimo) * bins // (máximo - mínimo), con el máximo en la última.
+    """
+    sumas = df[COLUMNA_SUMA].to_numpy().astype(np.int64)
+    divisor = len(COLUMNAS_NOTAS) * ESCALA
+    minimo, maximo = int(sumas.min()), int(sumas.max())
+    rango = max(maximo - minimo, 1)
+    barras = np.minimum((sumas - minimo) * bins // rango, bins - 1)
+    if maximo == minimo:
+        # Como np.histogram: un rango vacío se abre medio punto a cada lado
+        bordes = np.linspace(minimo / divisor - 0.5, minimo / divisor + 0.5, bins + 1)
+        barras = np.full(len(sumas), bins // 2)
+    else:
+        bordes = (minimo + np.arange(bins + 1) * (maximo - minimo) / bins) / divisor
+    return {
+        'media': float(sumas.sum() / (divisor * len(sumas))),
+        'mediana': float(np.median(sumas) / divisor),
+        'conteos': np.bincount(barras, minlength=bins),
+        'bordes': bordes
+    }
+
+
+def calcular_reporte(df, reglas=None):
+    """
+    HU08: promedio acumulado de cada estudiante, nota necesaria y estado.
+
+    El promedio se redondea a centésimas de forma exacta y el estado y la
+    nota necesaria se calculan con enteros.
+
+    Returns:
+        DataFrame con id_estudiante, nombre, promedio_actual, necesita_en_periodo4 y estado
+    """
+    hu08 = importar_script('reporte_general_hu08.py')
+    reglas = reglas or hu08.reglas_reporte()
+    if reglas.get('pesos_periodos') is not None:
+        raise ValueError("El modo punto fijo no admite pesos de periodo")
+
+    grupos = _sumas(df, 'id_estudiante')
+    promedios = _promedio_centesimas(grupos['sum'], grupos['count'])
+    aprobatoria = centesimas_escalar(reglas['nota_aprobatoria'], 'nota_aprobatoria')
+    top = centesimas_escalar(reglas['nota_top'], 'nota_top')
+    maxima = centesimas_escalar(reglas['nota_maxima'], 'nota_maxima')
+
+    # Nota necesaria: (aprobatoria * totales - promedio * cursados) / restantes
+    periodos_actuales = int(df['periodo'].max())
+    restantes = reglas['periodos_totales'] - periodos_actuales
+    if restantes > 0:
+        necesita = redondear(aprobatoria * reglas['periodos_totales'] - promedios * periodos_actuales, restantes)
+        necesita = a_decimal(np.clip(necesita, 0, maxima))
+    else:
+        necesita = np.full(len(promedios), np.nan)
+
+    nombres = None
+    if 'nombre' in df.columns:
+        nombres = df.drop_duplicates('id_estudiante').set_index('id_estudiante')['nombre'].reindex(grupos.index)
+    return pd.DataFrame({
+        'id_estudiante': grupos.index.to_numpy(),
+        'nombre': None if nombres is None else nombres.to_numpy(),
+        'promedio_actual': a_decimal(promedios),
+        'necesita_en_periodo4': necesita,
+        'estado': np.select([promedios >= top, promedios < aprobatoria], ["Top", "En riesgo"], default="Aprobado")
+    })
+
+
+def calcular_todo(df, hus=HUS):
+    """
+    Resultados de las HU (o solo de `hus`) sobre un DataFrame ya convertido
+    con convertir_a_punto_fijo, con las mismas claves que ejecutar_todo.calcular_todo.
+    """
+    verificar_politica()
+    filas = len(df)
+    resultados = {}
+    if 'HU01' in hus:
+        with etapa('calculo', filas, hu='HU01', modo='punto_fijo'):
+            resultados['promedios_periodos'], resultados['promedio_anual'] = promedios_por_periodo(df)
+    if 'HU05' in hus:
+        with etapa('calculo', filas, hu='HU05', modo='punto_fijo'):
+            resultados['promedios_asignaturas'] = promedios_por_asignatura(df)
+    if 'HU06' in hus:
+        with etapa('calculo', filas, hu='HU06', modo='punto_fijo'):
+            resultados['cambios_bruscos'] = cambios_bruscos(df)
+    if 'HU07' in hus:
+        with etapa('calculo', filas, hu='HU07', modo='punto_fijo'):
+            resultados['distribucion'] = estadisticas_notas(df)
+    if 'HU08' in hus:
+        with etapa('calculo', filas, hu='HU08', modo='punto_fijo'):
+            resultados['reporte'] = calcular_reporte(df)
+    return resultados
+
+
+def comparar_con_decimales(ruta_csv, columnas=COLUMNAS_LECTURA):
+    """
+    Calcula las HU con la tabla en decimales (ejecutar_todo) y en punto fijo, y
+    muestra la memoria por fila, los tiempos y cuántos valores difieren.
+
+    Las diferencias esperadas son de 0.01 en promedios que caen justo en una
+    mitad (x.xx5): el modo decimal los redondea según su error de punto flotante.
+    """
+    import ejecutar_todo
+
+    df = cargar_notas(ruta_csv, columnas=columnas)
+    inicio = time.perf_counter()
+    decimales = ejecutar_todo.calcular_todo(df)
+    segundos_decimal = time.perf_counter() - inicio
+    bytes_decimal = df.memory_usage(deep=True).sum()
+
+    df = convertir_a_punto_fijo(df.drop(columns=[COLUMNA_PROMEDIO]))
+    inicio = time.perf_counter()
+    enteros = calcular_todo(df)
+    segundos_entero = time.perf_counter() - inicio
+    bytes_entero = df.memory_usage(deep=True).sum()
+
+    print(f"\n Memoria por fila: decimal {bytes_decimal / len(df):.1f} B, punto fijo {bytes_entero / len(df):.1f} B")
+    print(f" Cálculo: decimal {segundos_decimal:.3f} s, punto fijo {segundos_entero:.3f} s")
+
+    reporte_d, reporte_e = decimales['reporte'], enteros['reporte']
+    distintos = np.abs(reporte_d['promedio_actual'].to_numpy(dtype=np.float64) - reporte_e['promedio_actual'].to_numpy()) > 0.005
+    print(f" HU08: {int(distintos.sum())} promedios y "
+          f"{int((reporte_d['estado'] != reporte_e['estado']).sum())} estados distintos de {len(reporte_e)}")
+    print(f" HU06: {len(decimales['cambios_bruscos'])} cambios con decimales, {len(enteros['cambios_bruscos'])} en punto fijo")
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Carga las notas en centésimas enteras y calcula las HU")
+    parser.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--comparar', action='store_true',
+                        help="Calcula también con decimales y compara memoria, tiempos y resultados")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+
+    try:
+        df = cargar_punto_fijo(args.input, columnas=None)
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{args.input}' NO ENCONTRADO.")
+        return
+    except ValueError as e:
+        print(f" ERROR: {e}")
+        return
+
+    print(f" {len(df)} filas en centésimas enteras: {df.memory_usage(deep=True).sum() / len(df):.1f} bytes por fila")
+    for columna, tipo in TIPOS_PUNTO_FIJO.items():
+        if columna in df.columns:
+            print(f"  - {columna}: {tipo}")
+
+    if args.comparar:
+        comparar_con_decimales(args.input)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 import pandas as pd
 import numpy as np
+import argparse
 import os
 import sys
 
+from carga_datos import cargar_notas, agregar_promedio_fila, COLUMNA_PROMEDIO
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
 # --- CONFIGURACIÓN CLAVE ---
 CSV_INPUT = 'data-generada.csv'
 CSV_OUTPUT = 'reporte_general.csv'
@@ -11,67 +16,155 @@ NOTA_MAXIMA = 5.0
 NOTA_TOP = 4.5
 PERIODOS_TOTALES = 4
 COLUMNAS_NOTAS = ['nota1', 'nota2', 'nota3']
+COLUMNAS_LECTURA = ['id_estudiante', 'nombre', 'periodo'] + COLUMNAS_NOTAS
 
 
 # --------------------------
 
-def clasificar_estado(promedio):
+def reglas_reporte(politica=None, **cambios):
+    """
+    Reglas del reporte: las constantes de arriba, con las reglas y los pesos
+    de periodo de la política de calificación (la activa si no se indica) y
+    después los cambios indicados.
+
+    Ejemplo: reglas_reporte(nota_aprobatoria=3.5, periodos_totales=3)
+    """
+    politica = politica or politica_notas.politica_activa()
+    reglas = {
+        'nota_aprobatoria': NOTA_APROBATORIA,
+        'nota_maxima': NOTA_MAXIMA,
+        'nota_top': NOTA_TOP,
+        'periodos_totales': PERIODOS_TOTALES,
+        'pesos_periodos': politica['pesos_periodos']
+    }
+    reglas.update(politica['reglas'])
+    desconocidas = set(cambios) - set(reglas)
+    if desconocidas:
+        raise ValueError(f"Reglas desconocidas: {', '.join(sorted(desconocidas))}")
+    reglas.update({k: v for k, v in cambios.items() if v is not None})
+    return reglas
+
+
+def clasificar_estado(promedio, reglas=None):
+    """Estado de un solo promedio (misma regla que usa calcular_reporte por columnas)"""
+    return str(clasificar_estados(np.array([promedio]), reglas)[0])
+
+
+def clasificar_estados(promedios, reglas=None):
+    """Clasifica un arreglo de promedios en "Top", "En riesgo" o "Aprobado" de una vez"""
+    reglas = reglas or reglas_reporte()
+    promedios = np.asarray(promedios)
+    return np.select(
+        [promedios >= reglas['nota_top'], promedios < reglas['nota_aprobatoria']],
+        ["Top", "En riesgo"],
+        default="Aprobado"
+    )
+
+
+def calcular_necesita(promedios, periodos_actuales, reglas=None):
+    """
+    Nota necesaria en los periodos restantes para llegar a la nota aprobatoria.
+
+    Se limita a [0, nota_maxima]. Si ya no quedan periodos el resultado es NaN.
+    Con pesos de periodo en las reglas, los periodos cursados y los restantes
+    cuentan según su peso en lugar de uno por periodo.
+    """
+    reglas = reglas or reglas_reporte()
+    if len(promedios) == 0:
+        # Sin estudiantes el periodo actual (max de una columna vacía) es NaN
+        return np.zeros(0)
+    pesos = reglas.get('pesos_periodos')
+    if pesos is None:
+        pesos = np.ones(reglas['periodos_totales'])
+    if len(pesos) < reglas['periodos_totales']:
+        raise ValueError(f"Hay {len(pesos)} pesos de periodo para {reglas['periodos_totales']} periodos")
+    pesos = np.asarray(pesos, dtype='float64')[:reglas['periodos_totales']]
+
+    restantes = pesos[periodos_actuales:].sum()
+    if periodos_actuales >= reglas['periodos_totales'] or restantes <= 0:
+        return np.full(len(promedios), np.nan)
+
+    puntaje_acumulado = np.asarray(promedios, dtype='float64') * pesos[:periodos_actuales].sum()
+    puntaje_necesario_total = reglas['nota_aprobatoria'] * pesos.sum()
+    necesita = (puntaje_necesario_total - puntaje_acumulado) / restantes
+    return np.clip(necesita, 0.0, reglas['nota_maxima']).round(2)
+
+
+def calcular_reporte(df, reglas=None):
+    """
+    Calcula el reporte por estudiante: promedio acumulado, nota necesaria en el periodo 4 y estado.
+
+    Todo se calcula por columnas (sin funciones por fila), así que el costo
+    crece de forma lineal con el número de filas.
+
+    Args:
+        df: Datos de notas
+        reglas: Diccionario de reglas_reporte() (None = constantes del módulo)
+
+    Returns:
+        DataFrame con id_estudiante, nombre, promedio_actual, necesita_en_periodo4 y estado
+    """
+    reglas = reglas or reglas_reporte()
 
-    if promedio >= NOTA_TOP:
-        return "Top"
-    elif promedio < NOTA_APROBATORIA:
-        return "En riesgo"
-    else:
-        return "Aprobado"
+    # 2. Promedio ACUMULADO por estudiante (Promedio de todas sus asignaturas/periodos)
+    agregar_promedio_fila(df)
 
+    # Con pesos de periodo en la política, cada periodo cuenta según su peso
+    grupos = df.groupby('id_estudiante', sort=True)
+    df_reporte = pd.DataFrame({
+        'nombre': grupos['nombre'].first(),
+        'promedio_actual': politica_notas.promedio_por_grupo(df, ['id_estudiante'], COLUMNA_PROMEDIO, sort=True).round(2)
+    }).reset_index()
 
-def generar_reporte():
-    # 1. Leer CSV
-    try:
-        df = pd.read_csv(CSV_INPUT, encoding='latin-1')
-    except FileNotFoundError:
-        print(f"ERROR: Archivo '{CSV_INPUT}' no encontrado. Asegúrate de que esté en la misma carpeta.")
-        return
-    except Exception as e:
-        print(f"ERROR de lectura de CSV: {e}")
-        return
-
-    # 2. Promedio ACUMULADO por estudiante (Promedio de todas sus asignaturas/periodos)
-    df['promedio_asignatura_periodo'] = df[COLUMNAS_NOTAS].mean(axis=1)
+    # 3. Calcular 'Necesita en Periodo 4' (limitado entre 0.0 y la nota máxima)
+    periodos_actuales = df['periodo'].max()
+    df_reporte['necesita_en_periodo4'] = calcular_necesita(
+        df_reporte['promedio_actual'].to_numpy(), periodos_actuales, reglas
+    )
 
-    df_reporte = df.groupby(['id_estudiante', 'nombre'], as_index=False)[
-        'promedio_asignatura_periodo'
-    ].mean()
+    # 4. Agregar Columna 'Estado'
+    df_reporte['estado'] = clasificar_estados(df_reporte['promedio_actual'].to_numpy(), reglas)
 
-    df_reporte.rename(columns={'promedio_asignatura_periodo': 'promedio_actual'}, inplace=True)
-    df_reporte['promedio_actual'] = df_reporte['promedio_actual'].round(2)
+    return df_reporte[['id_estudiante', 'nombre', 'promedio_actual', 'necesita_en_periodo4', 'estado']]
 
-    # 3. Calcular 'Necesita en Periodo 4'
-    periodos_actuales = df['periodo'].max()
 
-    puntaje_acumulado = df_reporte['promedio_actual'] * periodos_actuales
-    puntaje_necesario_total = NOTA_APROBATORIA * PERIODOS_TOTALES
+def benchmark_reporte(tamanos=(10_000, 100_000, 1_000_000), filas_por_estudiante=21, semilla=0):
+    """
+    Mide calcular_reporte con datos sintéticos de varios tamaños.
 
-    df_reporte['necesita_en_periodo4'] = (
-                                                 puntaje_necesario_total - puntaje_acumulado
-                                         ) / (PERIODOS_TOTALES - periodos_actuales)
+    Imprime el tiempo por fila de cada tamaño: si el cálculo escala de forma
+    lineal, ese valor se mantiene aproximadamente constante.
+    """
+    import time
 
-    # Limitar el valor (entre 0.0 y 5.0)
-    df_reporte['necesita_en_periodo4'] = df_reporte['necesita_en_periodo4'].apply(
-        lambda x: min(max(x, 0.0), NOTA_MAXIMA)
-    ).round(2)
+    rng = np.random.default_rng(semilla)
+    print(f"\n{'Filas':>12} {'Estudiantes':>12} {'Segundos':>10} {'ns/fila':>10}")
+    resultados = []
+    for filas in tamanos:
+        ids = np.arange(filas) // filas_por_estudiante + 1
+        num_estudiantes = int(ids[-1])
+        df = pd.DataFrame({
+            'id_estudiante': ids,
+            'nombre': pd.Categorical.from_codes(ids - 1, categories=[f"Estudiante {i}" for i in range(1, num_estudiantes + 1)]),
+            'periodo': np.tile([1, 2, 3], filas // 3 + 1)[:filas],
+            'nota1': rng.uniform(0, 5, filas).round(2),
+            'nota2': rng.uniform(0, 5, filas).round(2),
+            'nota3': rng.uniform(0, 5, filas).round(2)
+        })
 
-    # 4. Agregar Columna 'Estado'
-    df_reporte['estado'] = df_reporte['promedio_actual'].apply(clasificar_estado)
+        inicio = time.perf_counter()
+        calcular_reporte(df)
+        segundos = time.perf_counter() - inicio
 
-    # 5. Guardar CSV
-    df_final = df_reporte[['id_estudiante', 'nombre', 'promedio_actual', 'necesita_en_periodo4', 'estado']]
+        resultados.append((filas, segundos))
+        print(f"{filas:>12} {num_estudiantes:>12} {segundos:>10.3f} {segundos / filas * 1e9:>10.1f}")
 
-    df_final.to_csv(CSV_OUTPUT, index=False, float_format="%.2f", encoding='utf-8')
-    print(f"\n Reporte CSV guardado como: {CSV_OUTPUT}")
+    return resultados
 
-    # 6. Mostrar Resumen General
 
+def mostrar_resumen(df_reporte, reglas=None):
+    """Muestra el resumen general del curso en consola"""
+    reglas = reglas or reglas_reporte()
     promedio_grupo = df_reporte['promedio_actual'].mean()
     mejor_estudiante = df_reporte.loc[df_reporte['promedio_actual'].idxmax()]
     estudiantes_en_riesgo = df_reporte[df_reporte['estado'] == 'En riesgo']
@@ -80,10 +173,61 @@ def generar_reporte():
     print("\n--- RESUMEN GENERAL DEL CURSO (HU08) ---")
     print(f"**Promedio General del Grupo (P1-P3):** {promedio_grupo:.2f}")
     print(f"**Mejor Estudiante:** {mejor_estudiante['nombre']} (Promedio: {mejor_estudiante['promedio_actual']:.2f})")
-    print(f"**Porcentaje en Riesgo (< {NOTA_APROBATORIA:.1f}):** {porcentaje_riesgo:.2f}%")
+    print(f"**Porcentaje en Riesgo (< {reglas['nota_aprobatoria']:.1f}):** {porcentaje_riesgo:.2f}%")
     print("------------------------------------------")
 
 
+def generar_reporte(csv_input=CSV_INPUT, csv_output=CSV_OUTPUT, reglas=None):
+    # 1. Leer CSV
+    try:
+        df = cargar_notas(csv_input, columnas=COLUMNAS_LECTURA)
+    except FileNotFoundError:
+        print(f"ERROR: Archivo '{csv_input}' no encontrado. Asegúrate de que esté en la misma carpeta.")
+        return
+    except Exception as e:
+        print(f"ERROR de lectura de CSV: {e}")
+        return
+
+    with etapa('calculo', len(df), hu='HU08'):
+        df_final = calcular_reporte(df, reglas)
+
+    # 5. Guardar CSV
+    with etapa('guardado', len(df_final), archivo=os.path.basename(csv_output)):
+        df_final.to_csv(csv_output, index=False, float_format="%.2f", encoding='utf-8')
+    print(f"\n Reporte CSV guardado como: {csv_output}")
+
+    # 6. Mostrar Resumen General
+    mostrar_resumen(df_final, reglas)
+
+
+def main():
+    """Función principal con las reglas configurables por línea de comandos"""
+    parser = argparse.ArgumentParser(description="HU08 - Reporte general del curso")
+    parser.add_argument('--input', default=CSV_INPUT, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--output', default=CSV_OUTPUT, help="CSV del reporte (default: %(default)s)")
+    parser.add_argument('--nota-aprobatoria', type=float, help=f"default: {NOTA_APROBATORIA}")
+    parser.add_argument('--nota-top', type=float, help=f"default: {NOTA_TOP}")
+    parser.add_argument('--periodos-totales', type=int, help=f"default: {PERIODOS_TOTALES}")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Mide el tiempo del reporte con 10k, 100k y 1M filas sintéticas")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+
+    if args.benchmark:
+        benchmark_reporte()
+        return
+
+    reglas = reglas_reporte(
+        nota_aprobatoria=args.nota_aprobatoria,
+        nota_top=args.nota_top,
+        periodos_totales=args.periodos_totales
+    )
+    generar_reporte(args.input, args.output, reglas)
+
+
 # Ejecutar la función principal
 if __name__ == '__main__':
-    generar_reporte()
\ No newline at end of file
+    main()
\ No newline at end of file
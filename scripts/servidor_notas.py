@@ -0,0 +1,335 @@
+"""
+Servidor local de análisis (HTTP/JSON)
+Carga el archivo de notas una sola vez y responde consultas de las HU sin
+volver a arrancar Python ni a leer el CSV:
+
+    GET /hu02?estudiante=<id o nombre>    evolución de un estudiante
+    GET /hu05                             promedios por asignatura
+    GET /hu06?umbral=1.0&por_asignatura=1 cambios bruscos
+    GET /hu08?nota_aprobatoria=3.0&estado=En riesgo
+                                          reporte general (estado es opcional)
+    GET /estado                           archivo cargado y tamaño de la caché
+
+Atiende varias consultas a la vez (un hilo por conexión). Cada respuesta
+correcta se guarda en caché por ruta y parámetros (las MAX_RESPUESTAS_CACHE
+usadas más recientemente); antes de cada consulta se compara el tamaño y la
+fecha del archivo y, si cambió, se recargan los datos y se vacía la caché.
+
+Uso:
+    python servidor_notas.py --input ../data/data-generada.csv --puerto 8765
+    curl 'http://127.0.0.1:8765/hu08?estado=En%20riesgo'
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from carga_datos import cargar_notas, agregar_promedio_fila, importar_script, RUTA_CSV
+from almacen_columnar import MANIFIESTO
+from formato_compilado import META
+from esquema_estrella import HECHOS
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
+hu02 = importar_script('evolucion-estudiante-HU02.py')
+hu05 = importar_script('promedio-asignatura-HU05.py')
+hu06 = importar_script('cambios-rendimiento-HU06.py')
+hu08 = importar_script('reporte_general_hu08.py')
+
+# --- Constantes y Configuración ---
+HOST = '127.0.0.1'
+PUERTO = 8765
+TIPO_JSON = 'application/json; charset=utf-8'
+MAX_RESPUESTAS_CACHE = 256
+# Decimales de los valores en JSON, como en los CSV de reportes (float_format="%.2f")
+DECIMALES_JSON = 2
+
+
+def huella_dataset(ruta):
+    """Tamaño y fecha de modificación del archivo (o de los metadatos si es un directorio)"""
+    if os.path.isdir(ruta):
+        for nombre in (META, MANIFIESTO, HECHOS):
+            if os.path.exists(os.path.join(ruta, nombre)):
+                ruta = os.path.join(ruta, nombre)
+                break
+    info = os.stat(ruta)
+    return info.st_size, info.st_mtime_ns
+
+
+def cargar_datos(ruta_csv):
+    """
+    Carga el archivo y prepara todo lo que comparten las consultas.
+
+    El promedio por fila y el índice de HU02 se calculan aquí, una vez: así
+    las consultas solo leen el DataFrame y pueden correr en paralelo.
+
+    Returns:
+        Diccionario con 'df', 'indice', 'huella', 'cargado', 'cache' (LRU),
+        'candado_cache' y 'candados' (uno por consulta en curso, para calcular
+        cada respuesta una sola vez)
+    """
+    huella = huella_dataset(ruta_csv)
+    df = agregar_promedio_fila(cargar_notas(ruta_csv))
+    return {
+        'df': df,
+        'indice': hu02.construir_indice(df),
+        'huella': huella,
+        'cargado': time.time(),
+        'cache': OrderedDict(),
+        'candado_cache': threading.Lock(),
+        'candados': {}
+    }
+
+
+def crear_estado(ruta_csv):
+    """Estado del servidor: la ruta, los datos cargados y el candado de recarga"""
+    return {'ruta': ruta_csv, 'datos': cargar_datos(ruta_csv), 'candado': threading.Lock()}
+
+
+def datos_vigentes(estado):
+    """
+    Devuelve los datos cargados, recargándolos si el archivo cambió.
+
+    Las consultas en curso siguen usando los datos (y la caché) que tomaron;
+    las nuevas ven los datos recargados con la caché vacía.
+    """
+    datos = estado['datos']
+    if huella_dataset(estado['ruta']) == datos['huella']:
+        return datos
+
+    with estado['candado']:
+        # Otro hilo pudo recargar mientras se esperaba el candado
+        if huella_dataset(estado['ruta']) != estado['datos']['huella']:
+            print(f" Archivo '{estado['ruta']}' modificado: recargando datos.")
+            estado['datos'] = cargar_datos(estado['ruta'])
+        return estado['datos']
+
+
+def _registros(tabla):
+    """
+    DataFrame como lista de diccionarios aptos para JSON (NaN -> null).
+
+    Las columnas decimales pasan a float64 redondeado: las notas en float32
+    se escribirían con sus dígitos binarios (2.9100000858 en lugar de 2.91).
+    """
+    decimales = tabla.select_dtypes('floating').columns
+    tabla = tabla.astype({c: 'float64' for c in decimales}).round({c: DECIMALES_JSON for c in decimales})
+    return json.loads(tabla.to_json(orient='records', force_ascii=False))
+
+
+def _leer_cache(datos, clave):
+    """Respuesta guardada para la clave (y la marca como usada), o None"""
+    with datos['candado_cache']:
+        respuesta = datos['cache'].get(clave)
+        if respuesta is not None:
+            datos['cache'].move_to_end(clave)
+        return respuesta
+
+
+def _guardar_cache(datos, clave, respuesta):
+    """Guarda una respuesta; si la caché se llena, descarta la usada hace más tiempo"""
+    with datos['candado_cache']:
+        datos['cache'][clave] = respuesta
+        datos['cache'].move_to_end(clave)
+        while len(datos['cache']) > MAX_RESPUESTAS_CACHE:
+            datos['cache'].popitem(last=False)
+
+
+def _decimal(parametros, nombre):
+    """Parámetro decimal opcional"""
+    return float(parametros[nombre]) if nombre in parametros else None
+
+
+def consulta_hu02(datos, parametros):
+    """Evolución de un estudiante: tabla por asignatura y periodo y promedio de cada periodo"""
+    busqueda = parametros.get('estudiante', '').strip()
+    if not busqueda:
+        raise ValueError("Falta el parámetro 'estudiante' (ID o nombre)")
+
+    df_estudiante = hu02.buscar_estudiante(datos['df'], busqueda, datos['indice'])
+    if df_estudiante.empty:
+        raise LookupError(f"No se encontró ningún estudiante con: '{busqueda}'")
+
+    evolucion = hu02.calcular_promedios_por_periodo(df_estudiante)
+    promedios = evolucion.groupby('Periodo')['Promedio'].mean()
+    return {
+        'id_estudiante': int(df_estudiante['id_estudiante'].iloc[0]),
+        'nombre': str(df_estudiante['nombre'].iloc[0]),
+        'promedio_por_periodo': {str(periodo): round(float(valor), DECIMALES_JSON) for periodo, valor in promedios.items()},
+        'evolucion': _registros(evolucion)
+    }
+
+
+def consulta_hu05(datos, parametros):
+    """Promedios por asignatura (de la más baja a la más alta)"""
+    promedios = hu05.calcular_promedios_por_asignatura(datos['df'])
+    return {'asignaturas': _registros(promedios.reset_index())}
+
+
+def consulta_hu06(datos, parametros):
+    """Transiciones entre periodos con cambios mayores al umbral"""
+    umbral = _decimal(parametros, 'umbral')
+    umbral = hu06.UMBRAL_DIFERENCIA if umbral is None else umbral
+    por_asignatura = parametros.get('por_asignatura', '0').lower() in ('1', 'true', 'si', 'sí')
+    cambios = hu06.calcular_cambios_bruscos(datos['df'], umbral, por_asignatura)
+    return {
+        'umbral': umbral,
+        'estudiantes': int(cambios['id_estudiante'].nunique()),
+        'cambios': _registros(cambios)
+    }
+
+
+def consulta_hu08(datos, parametros):
+    """Reporte por estudiante con resumen por estado (opcionalmente filtrado por estado)"""
+    reglas = hu08.reglas_reporte(
+        nota_aprobatoria=_decimal(parametros, 'nota_aprobatoria'),
+        nota_top=_decimal(parametros, 'nota_top'),
+        periodos_totales=int(parametros['periodos_totales']) if 'periodos_totales' in parametros else None
+    )
+    reporte = hu08.calcular_reporte(datos['df'], reglas)
+    conteos = reporte['estado'].value_counts()
+
+    if 'estado' in parametros:
+        reporte = reporte[reporte['estado'] == parametros['estado']]
+    return {
+        'reglas': reglas,
+        'resumen': {
+            'estudiantes': int(conteos.sum()),
+            'promedio_grupo': round(float(datos['df'][hu08.COLUMNA_PROMEDIO].mean()), 2),
+            'por_estado': {estado: int(n) for estado, n in conteos.items()}
+        },
+        'estudiantes': _registros(reporte)
+    }
+
+
+def consulta_estado(datos, parametros, estado):
+    """Archivo cargado, filas y respuestas guardadas en caché"""
+    return {
+        'archivo': estado['ruta'],
+        'filas': len(datos['df']),
+        'cargado': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(datos['cargado'])),
+        'respuestas_en_cache': len(datos['cache'])
+    }
+
+
+CONSULTAS = {
+    '/hu02': ('HU02', consulta_hu02),
+    '/hu05': ('HU05', consulta_hu05),
+    '/hu06': ('HU06', consulta_hu06),
+    '/hu08': ('HU08', consulta_hu08)
+}
+
+
+def responder(estado, url):
+    """
+    Resuelve una consulta GET.
+
+    Returns:
+        (código HTTP, cuerpo JSON en bytes)
+    """
+    partes = urlsplit(url)
+    ruta = partes.path.rstrip('/') or '/'
+    parametros = dict(parse_qsl(partes.query))
+    datos = datos_vigentes(estado)
+
+    if ruta == '/estado':
+        return 200, json.dumps(consulta_estado(datos, parametros, estado), ensure_ascii=False).encode('utf-8')
+    if ruta not in CONSULTAS:
+        disponibles = sorted(CONSULTAS) + ['/estado']
+        return 404, json.dumps({'error': f"Ruta desconocida: {ruta}", 'rutas': disponibles}).encode('utf-8')
+
+    clave = (ruta, tuple(sorted(parametros.items())))
+    respuesta = _leer_cache(datos, clave)
+    if respuesta is not None:
+        return respuesta
+
+    # Si llegan varias consultas iguales a la vez, solo la primera calcula;
+    # las demás esperan su candado y encuentran la respuesta en la caché
+    candado = datos['candados'].setdefault(clave, threading.Lock())
+    with candado:
+        try:
+            respuesta = _leer_cache(datos, clave)
+            if respuesta is not None:
+                return respuesta
+
+            # Las consultas sin resultados (404) o con parámetros inválidos (400) no se guardan en caché
+            hu, consulta = CONSULTAS[ruta]
+            try:
+                with etapa('calculo', len(datos['df']), hu=hu):
+                    cuerpo = consulta(datos, parametros)
+            except LookupError as e:
+                return 404, json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+            except ValueError as e:
+                return 400, json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+
+            respuesta = (200, json.dumps(cuerpo, ensure_ascii=False).encode('utf-8'))
+            _guardar_cache(datos, clave, respuesta)
+            return respuesta
+        finally:
+            # El candado solo hace falta mientras se calcula: las siguientes consultas leen la caché
+            if datos['candados'].get(clave) is candado:
+                del datos['candados'][clave]
+
+
+class ManejadorConsultas(BaseHTTPRequestHandler):
+    """Adaptador de http.server: toda la lógica está en responder()"""
+
+    def do_GET(self):
+        codigo, cuerpo = responder(self.server.estado, self.path)
+        self.send_response(codigo)
+        self.send_header('Content-Type', TIPO_JSON)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+def crear_servidor(ruta_csv=RUTA_CSV, host=HOST, puerto=PUERTO):
+    """
+    Carga los datos y crea el servidor (sin ponerlo a escuchar).
+
+    Returns:
+        ThreadingHTTPServer listo para serve_forever()
+    """
+    estado = crear_estado(ruta_csv)
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorConsultas)
+    servidor.daemon_threads = True
+    servidor.estado = estado
+    return servidor
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Servidor local HTTP/JSON con las consultas de las HU")
+    parser.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--host', default=HOST, help="Dirección de escucha (default: %(default)s)")
+    parser.add_argument('--puerto', type=int, default=PUERTO, help="Puerto (default: %(default)s)")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+
+    try:
+        servidor = crear_servidor(args.input, args.host, args.puerto)
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{args.input}' NO ENCONTRADO.")
+        return
+
+    filas = len(servidor.estado['datos']['df'])
+    print(f" {filas} filas cargadas desde '{args.input}'.")
+    print(f" Escuchando en http://{args.host}:{args.puerto} (Ctrl+C para detener)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n Servidor detenido.")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+"""
+Representación densa de las notas (tensor estudiantes × asignaturas × periodos × notas)
+El generador escribe exactamente 3 notas por estudiante, asignatura y
+periodo; en lugar de una tabla larga con el nombre y la asignatura repetidos
+en cada fila, las notas se guardan en un arreglo NumPy de forma
+(estudiantes, asignaturas, periodos, 3) con una máscara de celdas presentes
+y tablas laterales con los IDs, nombres, asignaturas y periodos.
+
+Cada HU queda como una reducción sobre ejes del tensor:
+    HU01  promedio sobre (estudiantes, asignaturas) de cada periodo
+    HU02  corte de un estudiante y promedio sobre asignaturas
+    HU05  estadísticas sobre (estudiantes, periodos) de cada asignatura
+    HU06  diferencias entre periodos presentes consecutivos
+    HU07  histograma de los promedios de las celdas presentes
+    HU08  promedio sobre (asignaturas, periodos) de cada estudiante
+
+Los resultados tienen el mismo formato que los de las HU originales, así
+ejecutar_todo.py --tensor guarda las mismas tablas.
+
+Uso:
+    python tensor_notas.py --input ../data/data-generada.csv
+    python tensor_notas.py --input ../data/data-generada.csv --comparar
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import cargar_notas, importar_script, RUTA_CSV, COLUMNAS_NOTAS, COLUMNA_PROMEDIO
+from instrumentacion import etapa, agregar_opcion, activar_desde_args
+import politica_notas
+
+# --- Constantes y Configuración ---
+COLUMNAS_LECTURA = ['id_estudiante', 'nombre', 'asignatura', 'periodo'] + COLUMNAS_NOTAS
+PERIODOS_ANALISIS = [1, 2, 3]
+NUM_BINS = 20
+HUS = ('HU01', 'HU05', 'HU06', 'HU07', 'HU08')
+
+
+def construir_tensor(df):
+    """
+    Convierte la tabla larga de notas en el tensor denso.
+
+    Los ejes quedan ordenados: IDs y periodos de menor a mayor y asignaturas
+    en el orden de sus categorías (alfabético si vienen de cargar_notas). Las
+    celdas sin fila quedan en NaN y en False en la máscara.
+
+    Returns:
+        Diccionario con 'notas' (float32, forma E × A × P × 3), 'mascara'
+        (bool, E × A × P), 'ids', 'nombres' (None si el df no trae la
+        columna), 'asignaturas' y 'periodos'
+
+    Raises:
+        ValueError: Si hay dos filas para el mismo estudiante, asignatura y periodo
+    """
+    codigo_e, ids = pd.factorize(df['id_estudiante'], sort=True)
+    codigo_a, asignaturas = pd.factorize(df['asignatura'], sort=True)
+    codigo_p, periodos = pd.factorize(df['periodo'], sort=True)
+    forma = (len(ids), len(asignaturas), len(periodos))
+
+    lineal = (codigo_e.astype(np.int64) * forma[1] + codigo_a) * forma[2] + codigo_p
+    filas_por_celda = np.bincount(lineal, minlength=int(np.prod(forma)))
+    if len(filas_por_celda) and filas_por_celda.max() > 1:
+        raise ValueError(f"Hay {int((filas_por_celda > 1).sum())} combinaciones de estudiante, asignatura "
+                         f"y periodo con más de una fila; no se pueden representar como tensor")
+
+    notas = np.full(forma + (len(COLUMNAS_NOTAS),), np.nan, dtype=np.float32)
+    notas.reshape(-1, len(COLUMNAS_NOTAS))[lineal] = df[COLUMNAS_NOTAS].to_numpy(dtype=np.float32)
+
+    nombres = None
+    if 'nombre' in df.columns:
+        # Nombre de la primera fila de cada estudiante
+        primeras = pd.Series(codigo_e).drop_duplicates()
+        posiciones = np.empty(len(ids), dtype=np.int64)
+        posiciones[primeras.to_numpy()] = primeras.index.to_numpy()
+        nombres = np.asarray(df['nombre'].to_numpy()[posiciones], dtype=object)
+
+    return {
+        'notas': notas,
+        'mascara': filas_por_celda.reshape(forma) > 0,
+        'ids': np.asarray(ids),
+        'nombres': nombres,
+        'asignaturas': np.asarray(asignaturas, dtype=object),
+        'periodos': np.asarray(periodos)
+    }
+
+
+def memoria_tensor(tensor):
+    """Bytes que ocupan los arreglos del tensor (las tablas laterales son pequeñas)"""
+    return sum(valor.nbytes for valor in tensor.values() if isinstance(valor, np.ndarray))
+
+
+def _pesos_notas(politica=None):
+    """
+    Pesos de nota1..nota3 de la política (None si es el promedio simple).
+
+    Raises:
+        ValueError: Si la política usa asistencia o participación (el tensor solo guarda las notas)
+    """
+    politica = politica or politica_notas.politica_activa()
+    if politica_notas.es_simple(politica):
+        return None
+    otras = [c for c in politica['pesos'] if c not in COLUMNAS_NOTAS]
+    if otras:
+        raise ValueError(f"La política '{politica['nombre']}' usa {', '.join(otras)}, que el tensor no guarda")
+    return np.array([politica['pesos'].get(c, 0.0) * politica['escalas'][c] for c in COLUMNAS_NOTAS])
+
+
+def promedios_celda(tensor):
+    """Nota de cada celda según la política de calificación (E × A × P, NaN en las celdas ausentes)"""
+    if 'promedios' not in tensor:
+        _pesos_notas()
+        # Las celdas en una tabla (celdas × notas) pasan por promedio_fila, como en
+        # la ejecución en memoria: mismo redondeo y mismo orden de suma en el producto
+        planas = pd.DataFrame(tensor['notas'].reshape(-1, len(COLUMNAS_NOTAS)), columns=COLUMNAS_NOTAS)
+        tensor['promedios'] = politica_notas.promedio_fila(planas).reshape(tensor['mascara'].shape)
+    return tensor['promedios']
+
+
+def _media(valores, mascara, ejes):
+    """Promedio de las celdas presentes sobre los ejes indicados (NaN si no hay ninguna)"""
+    sumas = np.where(mascara, valores, 0).sum(axis=ejes, dtype=np.float64)
+    conteos = mascara.sum(axis=ejes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sumas / conteos, conteos
+
+
+def _suma_compensada(valores, mascara, ejes):
+    """
+    Suma de las celdas presentes sobre los ejes indicados, una a una con
+    compensación (Kahan) y en el orden de las filas del archivo, igual que
+    groupby().sum() y groupby().mean() de pandas.
+
+    Así el promedio de cada estudiante (pocas celdas) coincide con el de la
+    ejecución en memoria hasta en el último bit, también en los empates al
+    redondear a 2 decimales.
+
+    Returns:
+        (sumas, conteos)
+    """
+    ejes = (ejes,) if isinstance(ejes, int) else tuple(ejes)
+    resto = [eje for eje in range(valores.ndim) if eje not in ejes]
+    forma = [valores.shape[eje] for eje in resto]
+    valores = np.moveaxis(valores, resto + list(ejes), range(valores.ndim)).reshape(forma + [-1])
+    mascara = np.moveaxis(mascara, resto + list(ejes), range(mascara.ndim)).reshape(forma + [-1])
+
+    sumas = np.zeros(forma)
+    compensacion = np.zeros(forma)
+    for k in range(valores.shape[-1]):
+        presente = mascara[..., k]
+        y = np.where(presente, valores[..., k] - compensacion, 0.0)
+        t = sumas + y
+        compensacion = np.where(presente, (t - sumas) - y, compensacion)
+        sumas = t
+    return sumas, mascara.sum(axis=-1)
+
+
+def _media_compensada(valores, mascara, ejes):
+    """Como _media, pero con la suma de _suma_compensada"""
+    sumas, conteos = _suma_compensada(valores, mascara, ejes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sumas / conteos, conteos
+
+
+def _media_por_periodo(celdas, mascara):
+    """
+    Promedio de cada estudiante en cada periodo (E × P) sobre sus asignaturas presentes.
+
+    Suma cada segmento con np.add.reduceat, como _promedios_por_segmento de
+    HU06: reduceat no suma en el mismo orden que sum(), y en una diferencia
+    justo en el umbral ese último bit decide si el cambio se marca.
+    """
+    celdas = np.moveaxis(celdas, 1, 2)
+    presentes = np.moveaxis(mascara, 1, 2)
+    conteos = presentes.sum(axis=-1)
+    planos = conteos.ravel()
+    sumas = np.zeros(len(planos))
+    llenos = planos > 0
+    if llenos.any():
+        inicios = np.cumsum(planos) - planos
+        sumas[llenos] = np.add.reduceat(celdas[presentes], inicios[llenos])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sumas.reshape(conteos.shape) / conteos, conteos
+
+
+def _periodo_anterior(presentes):
+    """
+    Para cada posición del último eje, el índice de la posición presente
+    anterior (-1 si no hay, o si la posición misma no está presente).
+    """
+    anterior = np.full(presentes.shape, -1, dtype=np.intp)
+    ultimo = np.full(presentes.shape[:-1], -1, dtype=np.intp)
+    for p in range(presentes.shape[-1]):
+        anterior[..., p] = ultimo
+        ultimo = np.where(presentes[..., p], p, ultimo)
+    return np.where(presentes, anterior, -1)
+
+
+def promedios_por_periodo(tensor, periodos_analisis=PERIODOS_ANALISIS):
+    """
+    HU01: promedio del curso en cada periodo y promedio anual parcial.
+
+    Returns:
+        (Serie periodo -> promedio, promedio anual o None si falta algún periodo)
+    """
+    celdas = promedios_celda(tensor)
+    medias, conteos = _media(celdas, tensor['mascara'], (0, 1))
+    seleccion = (conteos > 0) & np.isin(tensor['periodos'], periodos_analisis)
+
+    promedios = pd.Series(medias[seleccion].astype(celdas.dtype),
+                          index=pd.Index(tensor['periodos'][seleccion], name='periodo'), name=COLUMNA_PROMEDIO)
+    if len(promedios) != len(periodos_analisis):
+        return promedios, None
+    pesos = politica_notas.pesos_de_periodos(promedios.index)
+    if pesos is None:
+        return promedios, promedios.mean()
+    return promedios, float(np.average(promedios, weights=pesos))
+
+
+def evolucion_estudiante(tensor, id_estudiante):
+    """
+    HU02: notas de un estudiante por asignatura y periodo y su promedio en cada periodo.
+
+    Returns:
+        (DataFrame Asignatura, Periodo, Nota1..Nota3, Promedio, Serie periodo ->
+        promedio de todas sus asignaturas), o (None, None) si el ID no existe
+    """
+    e = np.searchsorted(tensor['ids'], id_estudiante)
+    if e >= len(tensor['ids']) or tensor['ids'][e] != id_estudiante:
+        return None, None
+
+    # Ejes (periodo, asignatura): así las filas salen ordenadas por periodo
+    notas = np.round(tensor['notas'][e].transpose(1, 0, 2).astype(np.float64), 2)
+    mascara = tensor['mascara'][e].T
+    indice_p, indice_a = np.nonzero(mascara)
+    promedio_fila = np.round(promedios_celda(tensor)[e].T, 2)
+
+    tabla = pd.DataFrame({
+        'Asignatura': tensor['asignaturas'][indice_a],
+        'Periodo': tensor['periodos'][indice_p],
+        'Nota1': notas[indice_p, indice_a, 0],
+        'Nota2': notas[indice_p, indice_a, 1],
+        'Nota3': notas[indice_p, indice_a, 2],
+        'Promedio': promedio_fila[indice_p, indice_a]
+    })
+    medias, conteos = _media(promedio_fila, mascara, 1)
+    presentes = conteos > 0
+    por_periodo = pd.Series(medias[presentes].round(2), index=pd.Index(tensor['periodos'][presentes], name='Periodo'),
+                            name='Promedio')
+    return tabla, por_periodo
+
+
+def promedios_por_asignatura(tensor):
+    """HU05: promedio, desviación, registros y promedio de cada nota por asignatura"""
+    celdas = promedios_celda(tensor)
+    mascara = tensor['mascara']
+    medias, conteos = _media(celdas, mascara, (0, 2))
+
+    desvios = np.where(mascara, celdas - medias[None, :, None], 0).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        varianzas = (desvios ** 2).sum(axis=(0, 2)) / (conteos - 1)
+
+    notas, _ = _media(np.round(tensor['notas'].astype(np.float64), 2), mascara[..., None], (0, 2))
+    presentes = conteos > 0
+    promedios = pd.DataFrame({
+        'Promedio_General': medias[presentes].astype(celdas.dtype),
+        'Desviacion_Std': np.sqrt(varianzas[presentes]),
+        'Total_Registros': conteos[presentes].astype(np.int64),
+        'Promedio_Nota1': notas[presentes, 0],
+        'Promedio_Nota2': notas[presentes, 1],
+        'Promedio_Nota3': notas[presentes, 2]
+    }, index=pd.Index(tensor['asignaturas'][presentes], name='asignatura')).round(2)
+
+    return promedios.sort_values('Promedio_General')
+
+
+def cambios_bruscos(tensor, umbral=1.0, por_asignatura=False):
+    """
+    HU06: transiciones entre periodos presentes consecutivos con |diferencia| > umbral.
+
+    Mismas columnas y orden que calcular_cambios_bruscos de HU06; en el modo
+    por estudiante, `asignatura` es la que más cambió en esa transición (la
+    primera en orden alfabético si hay empate).
+    """
+    celdas = promedios_celda(tensor).astype(np.float64)
+    mascara = tensor['mascara']
+    ids, periodos, asignaturas = tensor['ids'], tensor['periodos'], tensor['asignaturas']
+
+    # Transiciones por estudiante y asignatura (se necesitan en ambos modos)
+    anterior_a = _periodo_anterior(mascara)
+    validas_a = anterior_a >= 0
+    dif_a = np.where(validas_a, celdas - np.take_along_axis(celdas, np.maximum(anterior_a, 0), axis=-1), np.nan)
+
+    if por_asignatura:
+        e, a, p = np.nonzero(validas_a & (np.abs(dif_a) > umbral))
+        desde = anterior_a[e, a, p]
+        resultado = {
+            'id_estudiante': ids[e],
+            'asignatura': asignaturas[a],
+            'periodo_desde': periodos[desde],
+            'periodo_hasta': periodos[p],
+            'promedio_desde': celdas[e, a, desde],
+            'promedio_hasta': celdas[e, a, p],
+            'diferencia': dif_a[e, a, p]
+        }
+    else:
+        medias, conteos = _media_por_periodo(celdas, mascara)
+        anterior_e = _periodo_anterior(conteos > 0)
+        dif_e = np.where(anterior_e >= 0, medias - np.take_along_axis(medias, np.maximum(anterior_e, 0), axis=-1),
+                         np.nan)
+        e, p = np.nonzero((anterior_e >= 0) & (np.abs(dif_e) > umbral))
+        desde = anterior_e[e, p]
+
+        # Asignatura que más cambió al llegar a cada periodo: argmax sobre el eje de asignaturas
+        cambio = np.where(validas_a, np.abs(dif_a), -1.0)[e, :, p]
+        mayor = cambio.argmax(axis=1) if len(e) else np.zeros(0, dtype=np.intp)
+        con_asignatura = cambio[np.arange(len(e)), mayor] >= 0 if len(e) else np.zeros(0, dtype=bool)
+
+        resultado = {
+            'id_estudiante': ids[e],
+            'asignatura': np.where(con_asignatura, asignaturas[mayor], None),
+            'periodo_desde': periodos[desde],
+            'periodo_hasta': periodos[p],
+            'promedio_desde': medias[e, desde],
+            'promedio_hasta': medias[e, p],
+            'diferencia': dif_e[e, p]
+        }
+
+    resultado['nombre'] = tensor['nombres'][e] if tensor['nombres'] is not None else None
+    columnas = ['id_estudiante', 'nombre', 'asignatura', 'periodo_desde', 'periodo_hasta',
+                'promedio_desde', 'promedio_hasta', 'diferencia']
+    return pd.DataFrame(resultado)[columnas]
+
+
+def estadisticas_notas(tensor, bins=NUM_BINS):
+    """HU07: media, mediana y conteos del histograma (en la rejilla de HU07) de los promedios de las celdas presentes"""
+    valores = promedios_celda(tensor)[tensor['mascara']]
+    conteos, bordes = importar_script('distribucion-notas-HU07.py').histograma_en_rejilla(valores, bins)
+    return {
+        'media': float(np.mean(valores)),
+        'mediana': float(np.median(valores)),
+        'conteos': conteos,
+        'bordes': bordes
+    }
+
+
+def calcular_reporte(tensor, reglas=None):
+    """
+    HU08: promedio acumulado de cada estudiante, nota necesaria y estado.
+
+    Returns:
+        DataFrame con id_estudiante, nombre, promedio_actual, necesita_en_periodo4 y estado
+    """
+    hu08 = importar_script('reporte_general_hu08.py')
+    reglas = reglas or hu08.reglas_reporte()
+
+    celdas = promedios_celda(tensor)
+    pesos = politica_notas.pesos_de_periodos(tensor['periodos'])
+    if pesos is None:
+        medias, _ = _media_compensada(celdas, tensor['mascara'], (1, 2))
+    else:
+        # Promedio de cada periodo ponderado por su peso, solo entre los periodos presentes
+        por_periodo, conteos = _media_compensada(celdas, tensor['mascara'], 1)
+        presentes = conteos > 0
+        ponderados, _ = _suma_compensada(por_periodo * pesos, presentes, 1)
+        pesos_totales, _ = _suma_compensada(np.broadcast_to(pesos, presentes.shape), presentes, 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            medias = ponderados / pesos_totales
+    promedios = medias.astype(celdas.dtype).round(2)
+
+    periodos_presentes = tensor['periodos'][tensor['mascara'].any(axis=(0, 1))]
+    periodos_actuales = periodos_presentes.max() if len(periodos_presentes) else 0
+    return pd.DataFrame({
+        'id_estudiante': tensor['ids'],
+        'nombre': tensor['nombres'],
+        'promedio_actual': promedios,
+        'necesita_en_periodo4': hu08.calcular_necesita(promedios, periodos_actuales, reglas),
+        'estado': hu08.clasificar_estados(promedios, reglas)
+    })
+
+
+def calcular_todo(tensor, hus=HUS):
+    """
+    Resultados de las HU (o solo de `hus`) sobre el tensor, con las mismas
+    claves que ejecutar_todo.calcular_todo.
+    """
+    celdas = int(tensor['mascara'].sum())
+    with etapa('calculo', celdas, paso='promedio_celda'):
+        promedios_celda(tensor)
+
+    resultados = {}
+    if 'HU01' in hus:
+        with etapa('calculo', celdas, hu='HU01', modo='tensor'):
+            resultados['promedios_periodos'], resultados['promedio_anual'] = promedios_por_periodo(tensor)
+    if 'HU05' in hus:
+        with etapa('calculo', celdas, hu='HU05', modo='tensor'):
+            resultados['promedios_asignaturas'] = promedios_por_asignatura(tensor)
+    if 'HU06' in hus:
+        with etapa('calculo', celdas, hu='HU06', modo='tensor'):
+            resultados['cambios_bruscos'] = cambios_bruscos(tensor)
+    if 'HU07' in hus:
+        with etapa('calculo', celdas, hu='HU07', modo='tensor'):
+            resultados['distribucion'] = estadisticas_notas(tensor)
+    if 'HU08' in hus:
+        with etapa('calculo', celdas, hu='HU08', modo='tensor'):
+            resultados['reporte'] = calcular_reporte(tensor)
+    return resultados
+
+
+def comparar_con_tabla(df, tensor):
+    """
+    Calcula las HU con la tabla larga (ejecutar_todo) y con el tensor, y
+    muestra los tiempos y si las tablas coinciden.
+    """
+    import ejecutar_todo
+
+    inicio = time.perf_counter()
+    tabla = ejecutar_todo.calcular_todo(df.copy())
+    segundos_tabla = time.perf_counter() - inicio
+
+    tensor.pop('promedios', None)
+    inicio = time.perf_counter()
+    densos = calcular_todo(tensor)
+    segundos_tensor = time.perf_counter() - inicio
+
+    print(f"\n Tabla larga: {segundos_tabla:.3f} s   Tensor: {segundos_tensor:.3f} s")
+    comparaciones = {
+        'HU01': (tabla['promedios_periodos'].round(2), densos['promedios_periodos'].round(2)),
+        'HU05': (tabla['promedios_asignaturas'].reset_index(drop=True),
+                 densos['promedios_asignaturas'].reset_index(drop=True)),
+        'HU06': (tabla['cambios_bruscos'].round(2), densos['cambios_bruscos'].round(2)),
+        'HU07': (pd.Series(tabla['distribucion']['conteos']), pd.Series(densos['distribucion']['conteos'])),
+        'HU08': (tabla['reporte'], densos['reporte'])
+    }
+    for hu, (esperado, obtenido) in comparaciones.items():
+        try:
+            pd.testing.assert_frame_equal(pd.DataFrame(esperado), pd.DataFrame(obtenido),
+                                          check_dtype=False, check_categorical=False)
+            print(f" {hu}: coincide")
+        except AssertionError as e:
+            print(f" {hu}: DIFIERE ({str(e).splitlines()[0]})")
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Construye el tensor denso de notas y calcula las HU sobre él")
+    parser.add_argument('--input', default=RUTA_CSV, help="CSV de notas (default: %(default)s)")
+    parser.add_argument('--comparar', action='store_true',
+                        help="Calcula también con la tabla larga y compara tiempos y resultados")
+    agregar_opcion(parser)
+    politica_notas.agregar_opcion(parser)
+    args = parser.parse_args()
+    activar_desde_args(args)
+    politica_notas.activar_desde_args(args)
+
+    try:
+        df = cargar_notas(args.input, columnas=COLUMNAS_LECTURA)
+    except FileNotFoundError:
+        print(f" ERROR: Archivo '{args.input}' NO ENCONTRADO.")
+        return
+
+    try:
+        with etapa('calculo', len(df), paso='construir_tensor'):
+            tensor = construir_tensor(df)
+    except ValueError as e:
+        print(f" ERROR: {e}")
+        return
+
+    estudiantes, asignaturas, periodos = tensor['mascara'].shape
+    ocupacion = tensor['mascara'].mean() * 100 if tensor['mascara'].size else 0.0
+    print(f" Tensor: {estudiantes} estudiantes × {asignaturas} asignaturas × {periodos} periodos × "
+          f"{len(COLUMNAS_NOTAS)} notas ({ocupacion:.1f}% de celdas presentes)")
+    print(f" Memoria: tabla larga {df.memory_usage(deep=True).sum() / 1e6:.1f} MB, "
+          f"tensor {memoria_tensor(tensor) / 1e6:.1f} MB")
+
+    if args.comparar:
+        comparar_con_tabla(df, tensor)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Configuración de pytest: los scripts se importan desde scripts/ como en su ejecución normal"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+DIRECTORIO_SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+sys.path.insert(0, DIRECTORIO_SCRIPTS)
+
+
+def crear_notas(estudiantes=4, asignaturas=('Algoritmos', 'Redes'), periodos=(1, 2, 3), semilla=0):
+    """DataFrame de notas pequeño con el formato y los tipos de cargar_notas, ordenado como el generador"""
+    from carga_datos import ESQUEMA
+
+    rng = np.random.default_rng(semilla)
+    filas = [(e, f"Estudiante {e}", a, p) for e in range(1, estudiantes + 1) for a in asignaturas for p in periodos]
+    df = pd.DataFrame(filas, columns=['id_estudiante', 'nombre', 'asignatura', 'periodo'])
+    for columna in ('nota1', 'nota2', 'nota3'):
+        df[columna] = rng.integers(0, 501, len(df)) / 100
+    df['asistencia_%'] = rng.integers(5000, 10001, len(df)) / 100
+    df['participacion'] = rng.integers(0, 101, len(df)) / 100
+    return df.astype(ESQUEMA)
+
+
+@pytest.fixture
+def notas():
+    return crear_notas()
@@ -0,0 +1,80 @@
+"""Pruebas del almacén incremental cuando el CSV crece o se reescribe"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import agregados_incrementales as agregados
+from conftest import crear_notas
+
+
+def _escribir(df, ruta):
+    df.to_csv(ruta, index=False, float_format="%.2f", encoding='utf-8')
+
+
+def _reporte(directorio):
+    return agregados.promedios_por_estudiante(agregados.cargar_resumenes(directorio))
+
+
+def test_filas_agregadas_se_leen_incrementalmente(tmp_path):
+    df = crear_notas(estudiantes=6)
+    ruta, directorio = tmp_path / 'notas.csv', tmp_path / 'almacen'
+    _escribir(df[df['periodo'] < 3], ruta)
+    agregados.actualizar_agregados(str(ruta), str(directorio))
+    _escribir(pd.concat([df[df['periodo'] < 3], df[df['periodo'] == 3]]), ruta)
+
+    assert agregados.actualizar_agregados(str(ruta), str(directorio)) == (df['periodo'] == 3).sum()
+    agregados.actualizar_agregados(str(ruta), str(tmp_path / 'completo'), reconstruir=True)
+    pd.testing.assert_frame_equal(_reporte(directorio), _reporte(tmp_path / 'completo'))
+
+
+def test_csv_reescrito_mas_grande_se_reconstruye(tmp_path, capsys):
+    ruta, directorio = tmp_path / 'notas.csv', tmp_path / 'almacen'
+    _escribir(crear_notas(estudiantes=3, semilla=1), ruta)
+    agregados.actualizar_agregados(str(ruta), str(directorio))
+
+    # Otro contenido en el mismo archivo, más largo: la posición guardada cae a mitad de una fila
+    nuevo = crear_notas(estudiantes=8, semilla=2)
+    nuevo['nombre'] = nuevo['nombre'].astype(str) + ' Apellido'
+    _escribir(nuevo, ruta)
+
+    assert agregados.actualizar_agregados(str(ruta), str(directorio)) == len(nuevo)
+    assert "se reconstruye" in capsys.readouterr().out
+    agregados.actualizar_agregados(str(ruta), str(tmp_path / 'completo'), reconstruir=True)
+    pd.testing.assert_frame_equal(_reporte(directorio), _reporte(tmp_path / 'completo'))
+
+
+def test_reconstruir_sin_filas_deja_el_almacen_vacio(tmp_path):
+    ruta, directorio = tmp_path / 'notas.csv', tmp_path / 'almacen'
+    df = crear_notas()
+    _escribir(df, ruta)
+    agregados.actualizar_agregados(str(ruta), str(directorio))
+    _escribir(df.iloc[:0], ruta)
+
+    assert agregados.actualizar_agregados(str(ruta), str(directorio)) == 0
+    assert _reporte(directorio).empty
+
+
+def test_lote_interrumpido_antes_del_estado_no_se_cuenta_dos_veces(tmp_path, monkeypatch):
+    df = crear_notas(estudiantes=6)
+    ruta, directorio = tmp_path / 'notas.csv', tmp_path / 'almacen'
+    _escribir(df[df['periodo'] < 3], ruta)
+    agregados.actualizar_agregados(str(ruta), str(directorio))
+    antes = _reporte(directorio)
+    _escribir(pd.concat([df[df['periodo'] < 3], df[df['periodo'] == 3]]), ruta)
+
+    # El proceso muere después de escribir el segmento y los resúmenes, antes de confirmar el lote
+    def interrumpir(*args):
+        raise KeyboardInterrupt
+    with monkeypatch.context() as m:
+        m.setattr(agregados, '_guardar_estado', interrumpir)
+        with pytest.raises(KeyboardInterrupt):
+            agregados.actualizar_agregados(str(ruta), str(directorio))
+    pd.testing.assert_frame_equal(_reporte(directorio), antes)
+
+    assert agregados.actualizar_agregados(str(ruta), str(directorio)) == (df['periodo'] == 3).sum()
+    agregados.actualizar_agregados(str(ruta), str(tmp_path / 'completo'), reconstruir=True)
+    pd.testing.assert_frame_equal(_reporte(directorio), _reporte(tmp_path / 'completo'))
+    assert sorted(os.listdir(directorio)) == ['estado.json', 'resumenes-0002.npz',
+                                              'segmento-0000.npz', 'segmento-0001.npz']
@@ -0,0 +1,43 @@
+"""Pruebas de HU06 (calcular_cambios_bruscos) con entradas sin transiciones entre periodos"""
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import importar_script
+from conftest import crear_notas
+
+hu06 = importar_script('cambios-rendimiento-HU06.py')
+
+COLUMNAS = ['id_estudiante', 'nombre', 'asignatura', 'periodo_desde', 'periodo_hasta',
+            'promedio_desde', 'promedio_hasta', 'diferencia']
+
+
+def test_un_solo_periodo_no_tiene_cambios():
+    df = crear_notas(periodos=(1,))
+    for por_asignatura in (False, True):
+        cambios = hu06.calcular_cambios_bruscos(df.copy(), por_asignatura=por_asignatura)
+        assert cambios.empty
+        assert list(cambios.columns) == COLUMNAS
+
+
+def test_entrada_vacia_no_tiene_cambios(notas):
+    for por_asignatura in (False, True):
+        cambios = hu06.calcular_cambios_bruscos(notas.iloc[:0].copy(), por_asignatura=por_asignatura)
+        assert cambios.empty
+        assert list(cambios.columns) == COLUMNAS
+
+
+def test_transicion_sin_asignatura_comun(notas):
+    # El estudiante 1 cambia de asignatura entre periodos: su transición no
+    # tiene una por asignatura y `asignatura` queda vacía
+    df = notas[~((notas['id_estudiante'] == 1) & (
+        ((notas['periodo'] == 1) & (notas['asignatura'] == 'Redes')) |
+        ((notas['periodo'] == 2) & (notas['asignatura'] == 'Algoritmos'))))].reset_index(drop=True)
+    df.loc[(df['id_estudiante'] == 1) & (df['periodo'] == 1), ['nota1', 'nota2', 'nota3']] = 0.0
+    df.loc[(df['id_estudiante'] == 1) & (df['periodo'] == 2), ['nota1', 'nota2', 'nota3']] = 5.0
+
+    cambios = hu06.calcular_cambios_bruscos(df)
+    fila = cambios[(cambios['id_estudiante'] == 1) & (cambios['periodo_hasta'] == 2)]
+    assert len(fila) == 1
+    assert pd.isna(fila['asignatura'].iloc[0])
+    assert np.isclose(fila['diferencia'].iloc[0], 5.0)
@@ -0,0 +1,56 @@
+"""Pruebas de la caché binaria y de la lectura por bloques de un directorio particionado"""
+
+import os
+import threading
+
+import pytest
+
+from almacen_columnar import escribir_particionado, ruta_particionada
+import carga_datos
+from carga_datos import cargar_notas, iterar_bloques, ruta_cache
+from conftest import crear_notas
+
+
+@pytest.fixture
+def solo_particionado(tmp_path):
+    """Ruta de un CSV que no existe, con su <base>.particionado al lado"""
+    ruta_csv = tmp_path / 'notas.csv'
+    escribir_particionado(crear_notas(), ruta_particionada(str(ruta_csv)))
+    return str(ruta_csv)
+
+
+def test_iterar_bloques_usa_el_directorio_particionado(solo_particionado):
+    bloques = list(iterar_bloques(solo_particionado))
+    assert [int(b['periodo'].iloc[0]) for b in bloques] == [1, 2, 3]
+    assert sum(len(b) for b in bloques) == len(crear_notas())
+
+
+def test_por_estudiante_rechaza_varias_particiones(solo_particionado):
+    with pytest.raises(ValueError, match="particionado por periodo"):
+        next(iterar_bloques(solo_particionado, por_estudiante=True))
+    # Con una sola partición cada estudiante sigue en un solo bloque
+    assert len(list(iterar_bloques(solo_particionado, periodos=[2], por_estudiante=True))) == 1
+
+
+def test_cache_truncada_se_regenera(tmp_path):
+    ruta = str(tmp_path / 'notas.csv')
+    crear_notas().to_csv(ruta, index=False, float_format="%.2f")
+    esperado = cargar_notas(ruta)
+    for tamano in (os.path.getsize(ruta_cache(ruta)) // 2, 10, 0):
+        with open(ruta_cache(ruta), 'r+b') as f:
+            f.truncate(tamano)
+        assert cargar_notas(ruta).equals(esperado)
+    assert carga_datos._leer_cache(ruta).equals(esperado)
+
+
+def test_escrituras_simultaneas_de_la_cache(tmp_path):
+    ruta = str(tmp_path / 'notas.csv')
+    crear_notas(estudiantes=50).to_csv(ruta, index=False, float_format="%.2f")
+    df = carga_datos.leer_csv_tipado(ruta)
+    hilos = [threading.Thread(target=carga_datos._escribir_cache, args=(ruta, df)) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert carga_datos._leer_cache(ruta).equals(df)
+    assert sorted(os.listdir(tmp_path)) == ['notas.csv', os.path.basename(ruta_cache(ruta))]
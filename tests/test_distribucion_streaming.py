@@ -0,0 +1,73 @@
+"""Pruebas del histograma de HU07 en modo streaming y de su rejilla en todos los modos"""
+
+import numpy as np
+import pytest
+
+import distribucion_streaming
+import ejecucion_por_bloques
+import politica_notas
+import punto_fijo
+import tensor_notas
+from carga_datos import cargar_notas, importar_script
+from conftest import crear_notas
+from politica_notas import normalizar_politica, promedio_fila
+
+PONDERADA = {'nombre': 'ponderada', 'pesos': {'nota1': 0.2, 'nota2': 0.3, 'nota3': 0.5}}
+
+
+def test_los_conteos_suman_el_total_con_valores_en_los_bordes():
+    sketch = distribucion_streaming.actualizar_sketch(distribucion_streaming.crear_sketch(), [1.0, 2.0, 3.3])
+    conteos, bordes = distribucion_streaming.histograma(sketch, bins=5)
+    assert conteos.sum() == sketch['total'] == 3
+    assert bordes[0] == 1.0 and bordes[-1] == 3.3
+
+
+def test_histograma_de_promedios_de_fila():
+    promedios = promedio_fila(crear_notas(estudiantes=200))
+    sketch = distribucion_streaming.actualizar_sketch(distribucion_streaming.crear_sketch(), promedios)
+    conteos, bordes = distribucion_streaming.histograma(sketch)
+    assert conteos.sum() == sketch['total'] == len(promedios)
+    assert np.allclose(bordes, np.histogram(promedios, bins=20)[1])
+
+
+def test_un_solo_valor_y_sketch_vacio():
+    sketch = distribucion_streaming.actualizar_sketch(distribucion_streaming.crear_sketch(), [2.0, 2.0])
+    conteos, bordes = distribucion_streaming.histograma(sketch, bins=4)
+    esperado_conteos, esperado_bordes = np.histogram([2.0, 2.0], bins=4)
+    assert np.array_equal(conteos, esperado_conteos) and np.allclose(bordes, esperado_bordes)
+    assert distribucion_streaming.histograma(distribucion_streaming.crear_sketch(), bins=4)[0].sum() == 0
+
+
+def test_resolucion_de_la_politica():
+    assert distribucion_streaming.resolucion_politica(politica_notas.politica_simple()) == 1 / 300
+    assert distribucion_streaming.resolucion_politica(normalizar_politica(PONDERADA)) == pytest.approx(1 / 1000)
+    # Asistencia (0-100 con 2 decimales) × 0.1 × 5/100: múltiplos de 0.00005
+    asistencia = normalizar_politica({'pesos': {'nota1': 0.9, 'asistencia_%': 0.1}})
+    assert distribucion_streaming.resolucion_politica(asistencia) == pytest.approx(0.00005)
+    sin_rejilla = normalizar_politica({'nombre': 'rara', 'pesos': {'nota1': 0.1234567, 'nota2': 0.8765433}})
+    assert distribucion_streaming.resolucion_politica(sin_rejilla) is None
+    with pytest.raises(ValueError, match="rejilla exacta"):
+        distribucion_streaming.crear_sketch_politica(sin_rejilla)
+
+
+@pytest.mark.parametrize('config', [None, PONDERADA])
+def test_histograma_igual_en_todos_los_modos(config, tmp_path, monkeypatch):
+    politica = normalizar_politica(config) if config else politica_notas.politica_simple()
+    monkeypatch.setitem(politica_notas._ESTADO, 'politica', politica)
+    ruta = str(tmp_path / 'notas.csv')
+    crear_notas(estudiantes=2000).to_csv(ruta, index=False, float_format="%.2f")
+
+    hu07 = importar_script('distribucion-notas-HU07.py')
+    en_memoria = hu07.calcular_estadisticas_notas(cargar_notas(ruta))
+    modos = {
+        'tensor': tensor_notas.estadisticas_notas(tensor_notas.construir_tensor(cargar_notas(ruta))),
+        'bloques': ejecucion_por_bloques.calcular_todo_por_bloques(ruta, filas_por_bloque=1000)['distribucion'],
+        'streaming': distribucion_streaming.estadisticas(distribucion_streaming.sketch_desde_csv(ruta, 1000))
+    }
+    if config is None:
+        modos['punto_fijo'] = punto_fijo.estadisticas_notas(punto_fijo.cargar_punto_fijo(ruta))
+
+    for modo, estadisticas in modos.items():
+        assert np.array_equal(estadisticas['conteos'], en_memoria['conteos']), modo
+        assert np.allclose(estadisticas['bordes'], en_memoria['bordes']), modo
+        assert round(estadisticas['mediana'], 2) == round(en_memoria['mediana'], 2), modo
@@ -0,0 +1,50 @@
+"""Pruebas de la ejecución por bloques y de la verificación de contigüidad"""
+
+import numpy as np
+import pytest
+
+import ejecucion_por_bloques
+from conftest import crear_notas
+from reporte_general_hu08 import calcular_reporte
+
+
+def _verificar(*bloques):
+    control = ejecucion_por_bloques.crear_control_contiguidad()
+    for ids in bloques:
+        ejecucion_por_bloques.verificar_contiguidad(control, np.array(ids))
+
+
+def test_contiguidad_entre_bloques():
+    _verificar([1, 1, 2], [2, 3], [3], [3, 7, 5], [], [5, 4])
+    with pytest.raises(ValueError):
+        _verificar([1, 2, 1])
+    with pytest.raises(ValueError):
+        _verificar([1, 1, 2], [3, 1])
+    with pytest.raises(ValueError):
+        _verificar([1, 2], [3], [2])
+
+
+def test_por_bloques_coincide_con_memoria(tmp_path):
+    df = crear_notas(estudiantes=30)
+    ruta = tmp_path / 'notas.csv'
+    df.to_csv(ruta, index=False, float_format="%.2f")
+
+    resultados = ejecucion_por_bloques.calcular_todo_por_bloques(str(ruta), filas_por_bloque=7)
+    esperado = calcular_reporte(df.copy())
+    reporte = resultados['reporte']
+    assert list(reporte['id_estudiante']) == list(esperado['id_estudiante'])
+    # Las sumas parciales de cada bloque pueden mover un empate de redondeo (x.xx5) en un centésimo
+    assert np.allclose(reporte['promedio_actual'], esperado['promedio_actual'], rtol=0, atol=0.0100001)
+    assert list(reporte['nombre']) == list(esperado['nombre'].astype(str))
+
+
+def test_archivo_desordenado_o_vacio(tmp_path):
+    df = crear_notas(estudiantes=30)
+    ruta = tmp_path / 'notas.csv'
+    df.sample(frac=1, random_state=0).to_csv(ruta, index=False, float_format="%.2f")
+    with pytest.raises(ValueError, match="juntas"):
+        ejecucion_por_bloques.calcular_todo_por_bloques(str(ruta), filas_por_bloque=50)
+
+    df.iloc[:0].to_csv(ruta, index=False)
+    with pytest.raises(ValueError, match="no tiene filas"):
+        ejecucion_por_bloques.calcular_todo_por_bloques(str(ruta), filas_por_bloque=50)
@@ -0,0 +1,20 @@
+"""Pruebas de ejecutar_todo y del reporte de HU08 con un archivo sin filas"""
+
+from conftest import crear_notas
+
+import ejecutar_todo
+from reporte_general_hu08 import calcular_reporte
+
+
+def test_reporte_sin_estudiantes_queda_vacio():
+    reporte = calcular_reporte(crear_notas().iloc[:0].copy())
+    assert reporte.empty
+    assert list(reporte.columns) == ['id_estudiante', 'nombre', 'promedio_actual', 'necesita_en_periodo4', 'estado']
+
+
+def test_archivo_vacio_se_informa(tmp_path, capsys):
+    ruta = tmp_path / 'vacio.csv'
+    crear_notas().iloc[:0].to_csv(ruta, index=False)
+    for opciones in ({}, {'tensor': True}, {'centesimas': True}):
+        assert ejecutar_todo.ejecutar(str(ruta), str(tmp_path / 'salida'), **opciones) is None
+        assert "no tiene filas de notas" in capsys.readouterr().out
@@ -0,0 +1,33 @@
+"""Pruebas del DPI por defecto de cada plantilla de gráfico"""
+
+import pytest
+
+pytest.importorskip('matplotlib')
+import matplotlib.image
+
+import graficos
+
+
+def _guardar(plantilla, ruta):
+    fig, _ = graficos.obtener_figura(plantilla)
+    return graficos.guardar_figura(fig, ruta)
+
+
+def _tamano(ruta):
+    alto, ancho = matplotlib.image.imread(ruta).shape[:2]
+    return ancho, alto
+
+
+def test_dpi_por_defecto_de_la_plantilla(monkeypatch, tmp_path):
+    monkeypatch.setitem(graficos.CONFIGURACION, 'dpi', None)
+    # HU05 y HU02 se guardan a 300 DPI como antes; el histograma de HU07 a 100
+    assert _tamano(_guardar('promedio_general', str(tmp_path / 'hu05.png'))) == (3000, 1800)
+    assert _tamano(_guardar('evolucion', str(tmp_path / 'hu02.png'))) == (3600, 2400)
+    assert _tamano(_guardar('histograma', str(tmp_path / 'hu07.png'))) == (1000, 600)
+
+
+def test_configurar_fija_el_dpi_de_todas_las_plantillas(monkeypatch, tmp_path):
+    monkeypatch.setitem(graficos.CONFIGURACION, 'dpi', None)
+    graficos.configurar(dpi=50)
+    assert _tamano(_guardar('promedio_general', str(tmp_path / 'hu05.png'))) == (500, 300)
+    assert _tamano(_guardar('histograma', str(tmp_path / 'hu07.png'))) == (500, 300)
@@ -0,0 +1,36 @@
+"""Pruebas de la memoria pico por etapa de la instrumentación"""
+
+import numpy as np
+import pytest
+
+import instrumentacion
+
+
+@pytest.fixture
+def activa(monkeypatch, tmp_path):
+    monkeypatch.setitem(instrumentacion._ESTADO, 'etapas', [])
+    monkeypatch.setitem(instrumentacion._ESTADO, 'abiertas', [])
+    instrumentacion.activar(str(tmp_path / 'perfil'))
+    yield
+    monkeypatch.setitem(instrumentacion._ESTADO, 'activo', False)
+
+
+def _reservar_mb(mb):
+    arreglo = np.ones(mb * 2 ** 20, dtype=np.uint8)
+    return int(arreglo.sum())
+
+
+def test_pico_por_etapa_y_etapas_anidadas(activa):
+    if not instrumentacion._reiniciar_pico():
+        pytest.skip("El sistema no permite reiniciar el pico de memoria")
+
+    with instrumentacion.etapa('calculo', paso='grande'):
+        _reservar_mb(200)
+    with instrumentacion.etapa('guardado', paso='afuera'):
+        with instrumentacion.etapa('calculo', paso='adentro'):
+            _reservar_mb(100)
+
+    grande, adentro, afuera = instrumentacion.etapas()
+    assert grande['rss_pico_mb'] - afuera['rss_pico_mb'] > 50
+    assert afuera['rss_pico_mb'] >= adentro['rss_pico_mb']
+    assert afuera['rss_pico_proceso_mb'] >= grande['rss_pico_mb']
@@ -0,0 +1,40 @@
+"""Pruebas del ranking de HU04 leído por bloques"""
+
+import pandas as pd
+import pytest
+
+from almacen_columnar import escribir_particionado
+from carga_datos import importar_script
+from conftest import crear_notas
+
+hu04 = importar_script('hu04_mejor_estudiante.py')
+
+
+def _tabla(ruta, filas_por_bloque, top=3):
+    return hu04.tabla_ranking(hu04.ranking_desde_csv(str(ruta), top, filas_por_bloque))
+
+
+def test_archivo_desordenado_da_el_mismo_ranking(tmp_path):
+    df = crear_notas(estudiantes=40)
+    ordenado, desordenado = tmp_path / 'ordenado.csv', tmp_path / 'desordenado.csv'
+    df.to_csv(ordenado, index=False, float_format="%.2f")
+    df.sample(frac=1, random_state=0).to_csv(desordenado, index=False, float_format="%.2f")
+
+    esperado = _tabla(ordenado, filas_por_bloque=10_000)
+    pd.testing.assert_frame_equal(_tabla(ordenado, filas_por_bloque=7), esperado)
+    pd.testing.assert_frame_equal(_tabla(desordenado, filas_por_bloque=7), esperado)
+
+
+def test_top_debe_ser_positivo():
+    with pytest.raises(ValueError):
+        hu04.crear_ranking(0)
+
+
+def test_directorio_particionado_da_el_mismo_ranking(tmp_path):
+    df = crear_notas(estudiantes=40)
+    ruta = tmp_path / 'notas.csv'
+    df.to_csv(ruta, index=False, float_format="%.2f")
+    escribir_particionado(df, str(tmp_path / 'notas.particionado'))
+
+    pd.testing.assert_frame_equal(_tabla(tmp_path / 'notas.particionado', filas_por_bloque=7),
+                                  _tabla(ruta, filas_por_bloque=7))
@@ -0,0 +1,71 @@
+"""Pruebas de la normalización de políticas y de la nota de cada fila"""
+
+import numpy as np
+import pytest
+
+from conftest import crear_notas
+from politica_notas import calcular_notas_fila, normalizar_politica, politica_simple, promedio_fila
+
+
+def test_normalizar_pesos_y_periodos():
+    politica = normalizar_politica({'nombre': 'p', 'pesos': {'nota3': 2, 'nota1': 1, 'nota2': 1, 'participacion': 0},
+                                    'pesos_periodos': [1, 1, 2, 2]})
+    # Suman 1, en el orden de COMPONENTES y sin los de peso 0
+    assert list(politica['pesos']) == ['nota1', 'nota2', 'nota3']
+    assert politica['pesos'] == pytest.approx({'nota1': 0.25, 'nota2': 0.25, 'nota3': 0.5})
+    assert politica['pesos_periodos'] == [1.0, 1.0, 2.0, 2.0]
+    assert politica['reglas']['periodos_totales'] == 4
+
+    simple = politica_simple()
+    assert simple['pesos'] == pytest.approx({c: 1 / 3 for c in ('nota1', 'nota2', 'nota3')})
+    assert simple['pesos_periodos'] is None
+
+    escalada = normalizar_politica({'pesos': {'asistencia_%': 1}, 'escalas': {'asistencia_%': 0.04, 'otra': 9}})
+    assert escalada['escalas']['asistencia_%'] == 0.04 and 'otra' not in escalada['escalas']
+
+
+@pytest.mark.parametrize('config, mensaje', [
+    ({'pesos': {'nota4': 1}}, "componentes desconocidos"),
+    ({'pesos': {'nota1': -1, 'nota2': 2}}, "positivos"),
+    ({'pesos': {'nota1': 0}}, "positivos"),
+    ({'reglas': {'nota_minima': 2}}, "reglas desconocidas"),
+    ({'pesos_periodos': []}, "pesos_periodos"),
+    ({'pesos_periodos': [1, 1], 'reglas': {'periodos_totales': 4}}, "el año tiene 4 periodos")
+])
+def test_politicas_invalidas(config, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        normalizar_politica(config)
+
+
+def test_notas_de_fila_con_varias_politicas():
+    df = crear_notas(estudiantes=20)
+    notas = np.round(df[['nota1', 'nota2', 'nota3']].to_numpy(dtype='float64'), 2)
+    asistencia = np.round(df['asistencia_%'].to_numpy(dtype='float64'), 2)
+    participacion = np.round(df['participacion'].to_numpy(dtype='float64'), 2)
+    politicas = [
+        politica_simple(),
+        normalizar_politica({'nombre': 'ponderada', 'pesos': {'nota1': 0.2, 'nota2': 0.3, 'nota3': 0.5}}),
+        normalizar_politica({'nombre': 'asistencia', 'pesos': {'nota1': 0.3, 'nota2': 0.3, 'nota3': 0.3,
+                                                               'asistencia_%': 0.1}}),
+        normalizar_politica({'nombre': 'participacion', 'pesos': {'nota3': 0.5, 'participacion': 0.5}})
+    ]
+
+    resultado = calcular_notas_fila(df, politicas)
+    assert resultado.shape == (len(df), len(politicas))
+    esperado = np.column_stack([
+        notas.mean(axis=1),
+        notas @ [0.2, 0.3, 0.5],
+        notas @ [0.3, 0.3, 0.3] + asistencia * 0.1 * 5 / 100,
+        notas[:, 2] * 0.5 + participacion * 0.5 * 5
+    ])
+    np.testing.assert_allclose(resultado, esperado, atol=1e-12)
+    # Una política sola da la misma columna que en el grupo
+    for i, politica in enumerate(politicas):
+        np.testing.assert_allclose(promedio_fila(df, politica), resultado[:, i], atol=1e-12)
+
+
+def test_notas_de_fila_sin_la_columna_de_la_politica():
+    df = crear_notas().drop(columns=['asistencia_%'])
+    politica = normalizar_politica({'pesos': {'nota1': 0.9, 'asistencia_%': 0.1}})
+    with pytest.raises(ValueError, match="asistencia_%"):
+        calcular_notas_fila(df, [politica])
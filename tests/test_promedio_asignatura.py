@@ -0,0 +1,43 @@
+"""Pruebas de HU05: los promedios por asignatura coinciden con leer el CSV en float64"""
+
+import os
+
+import pandas as pd
+
+import agregados_incrementales
+from carga_datos import cargar_notas, importar_script
+from conftest import DIRECTORIO_SCRIPTS
+
+hu05 = importar_script('promedio-asignatura-HU05.py')
+
+
+def _esperado(ruta):
+    df = pd.read_csv(ruta)
+    df['promedio'] = df[['nota1', 'nota2', 'nota3']].mean(axis=1)
+    tabla = df.groupby('asignatura').agg({'promedio': ['mean', 'std', 'count'],
+                                          'nota1': 'mean', 'nota2': 'mean', 'nota3': 'mean'}).round(2)
+    tabla.columns = ['Promedio_General', 'Desviacion_Std', 'Total_Registros',
+                     'Promedio_Nota1', 'Promedio_Nota2', 'Promedio_Nota3']
+    return tabla
+
+
+def _comparar(tabla, esperado):
+    """Compara los valores como se escriben (2 decimales), sin tolerancia"""
+    pd.testing.assert_frame_equal(tabla.astype('float64').round(2), esperado.loc[tabla.index].astype('float64'),
+                                  check_exact=True, check_index_type=False, check_categorical=False)
+
+
+# data-generada.csv tiene un empate de redondeo en float32 (Nota3 de Bases de Datos: 3.03, no 3.04)
+RUTA_DATOS = os.path.join(os.path.dirname(DIRECTORIO_SCRIPTS), 'data', 'data-generada.csv')
+
+
+def test_hu05_coincide_con_pandas_en_float64(tmp_path):
+    esperado = _esperado(RUTA_DATOS)
+
+    en_memoria = hu05.calcular_promedios_por_asignatura(cargar_notas(RUTA_DATOS, usar_cache=False))
+    _comparar(en_memoria, esperado)
+
+    agregados_incrementales.actualizar_agregados(RUTA_DATOS, str(tmp_path / 'almacen'))
+    desde_agregados = agregados_incrementales.promedios_por_asignatura(
+        agregados_incrementales.cargar_resumenes(str(tmp_path / 'almacen')))
+    _comparar(desde_agregados, esperado)
@@ -0,0 +1,79 @@
+"""Pruebas del modo punto fijo: redondeo exacto, umbrales y paridad con el modo decimal"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ejecutar_todo
+import politica_notas
+import punto_fijo
+from conftest import crear_notas
+
+
+@pytest.fixture(autouse=True)
+def politica_simple(monkeypatch):
+    monkeypatch.setitem(politica_notas._ESTADO, 'politica', politica_notas.politica_simple())
+
+
+def test_redondear_mitades_exactas():
+    # 1797 / 6 = 299.5 centésimas: un promedio de exactamente 2.995 queda en 3.00
+    assert punto_fijo.redondear([1797], [6])[0] == 300
+    assert list(punto_fijo.redondear([5, -5, 7, -7, 8, 0], [2, 2, 3, 3, 3, 3])) == [3, -3, 2, -2, 3, 0]
+
+
+def test_umbral_aprobatorio_de_3():
+    df = crear_notas(estudiantes=3, asignaturas=('Algoritmos',), periodos=(1, 2))
+    notas = {
+        1: [(3.00, 3.00, 2.99), (3.00, 3.00, 2.98)],   # promedio 2.995 -> 3.00
+        2: [(3.00, 3.00, 3.00), (3.00, 3.00, 3.00)],   # exactamente 3.00
+        3: [(3.00, 3.00, 2.98), (3.00, 3.00, 2.98)]    # 2.9933... -> 2.99
+    }
+    for estudiante, filas in notas.items():
+        df.loc[df['id_estudiante'] == estudiante, ['nota1', 'nota2', 'nota3']] = filas
+
+    reporte = punto_fijo.calcular_reporte(punto_fijo.convertir_a_punto_fijo(df))
+    assert list(reporte['promedio_actual']) == [3.00, 3.00, 2.99]
+    assert list(reporte['estado']) == ['Aprobado', 'Aprobado', 'En riesgo']
+    # Con 2 de 4 periodos: 3.00 no necesita más que 3.00; 2.99 necesita 3.01
+    assert list(reporte['necesita_en_periodo4']) == [3.00, 3.00, 3.01]
+
+
+def _exacto(sumas, divisor):
+    """Redondeo mitad hacia arriba de sumas / divisor, con Decimal"""
+    return [int((Decimal(int(s)) / Decimal(int(d))).quantize(Decimal(1), ROUND_HALF_UP))
+            for s, d in zip(sumas, divisor)]
+
+
+def test_igual_al_modo_decimal_salvo_empates(tmp_path):
+    df = crear_notas(estudiantes=3000, semilla=3)
+    ruta = str(tmp_path / 'notas.csv')
+    df.to_csv(ruta, index=False, float_format="%.2f")
+    decimal = ejecutar_todo.ejecutar(ruta, str(tmp_path / 'decimal'))
+    fijo = ejecutar_todo.ejecutar(ruta, str(tmp_path / 'fijo'), centesimas=True)
+
+    # HU08: punto fijo es el redondeo exacto; el modo decimal solo difiere en promedios x.xx5
+    centesimas = (df[['nota1', 'nota2', 'nota3']].to_numpy(dtype='float64') * 100).round().astype(np.int64)
+    grupos = pd.Series(centesimas.sum(axis=1)).groupby(df['id_estudiante'].to_numpy()).agg(['sum', 'count'])
+    divisor = 3 * grupos['count'].to_numpy()
+    exacto = np.array(_exacto(grupos['sum'], divisor))
+    assert np.array_equal(np.rint(fijo['reporte']['promedio_actual'].to_numpy() * 100), exacto)
+
+    empates = (2 * grupos['sum'].to_numpy()) % divisor == 0
+    assert empates.any()
+    en_decimal = np.rint(decimal['reporte']['promedio_actual'].to_numpy(dtype='float64') * 100)
+    assert np.array_equal(en_decimal[~empates], exacto[~empates])
+    assert np.abs(en_decimal[empates] - exacto[empates]).max() <= 1
+
+    # HU07 y HU01 coinciden
+    assert np.array_equal(decimal['distribucion']['conteos'], fijo['distribucion']['conteos'])
+    np.testing.assert_allclose(decimal['promedios_periodos'].to_numpy(dtype='float64'),
+                               fijo['promedios_periodos'].to_numpy(dtype='float64'), atol=0.0100001)
+
+    # HU06: solo difieren los cambios de exactamente 1.00, el umbral
+    claves = ['id_estudiante', 'periodo_desde', 'periodo_hasta']
+    unidos = decimal['cambios_bruscos'].merge(fijo['cambios_bruscos'], on=claves, how='outer', indicator=True)
+    distintos = unidos[unidos['_merge'] != 'both']
+    diferencias = distintos['diferencia_x'].fillna(distintos['diferencia_y']).to_numpy(dtype='float64')
+    assert np.all(np.isclose(np.abs(diferencias), 1.0))
@@ -0,0 +1,60 @@
+"""Pruebas de las respuestas y la caché del servidor de consultas"""
+
+import json
+import threading
+
+import servidor_notas
+from conftest import crear_notas
+
+
+def _estado(tmp_path):
+    ruta = tmp_path / 'notas.csv'
+    crear_notas(estudiantes=6).to_csv(ruta, index=False, float_format="%.2f")
+    return servidor_notas.crear_estado(str(ruta))
+
+
+def _numeros(valor):
+    if isinstance(valor, dict):
+        return [n for v in valor.values() for n in _numeros(v)]
+    if isinstance(valor, list):
+        return [n for v in valor for n in _numeros(v)]
+    return [valor] if isinstance(valor, float) else []
+
+
+def test_json_sin_artefactos_de_float32(tmp_path):
+    estado = _estado(tmp_path)
+    for url in ('/hu02?estudiante=1', '/hu05', '/hu06?umbral=0', '/hu08'):
+        codigo, cuerpo = servidor_notas.responder(estado, url)
+        assert codigo == 200
+        assert all(round(n, 2) == n for n in _numeros(json.loads(cuerpo)))
+
+
+def test_cache_acotada_sin_404_ni_candados(tmp_path, monkeypatch):
+    monkeypatch.setattr(servidor_notas, 'MAX_RESPUESTAS_CACHE', 2)
+    estado = _estado(tmp_path)
+    assert servidor_notas.responder(estado, '/hu02?estudiante=no-existe')[0] == 404
+    for id_estudiante in (1, 2, 3):
+        servidor_notas.responder(estado, f'/hu02?estudiante={id_estudiante}')
+
+    datos = estado['datos']
+    assert [dict(clave[1])['estudiante'] for clave in datos['cache']] == ['2', '3']
+    assert datos['candados'] == {}
+
+
+def test_consultas_iguales_a_la_vez_calculan_una_vez(tmp_path, monkeypatch):
+    estado = _estado(tmp_path)
+    llamadas = []
+    original = servidor_notas.CONSULTAS['/hu05']
+
+    def contar(datos, parametros):
+        llamadas.append(1)
+        return original[1](datos, parametros)
+
+    monkeypatch.setitem(servidor_notas.CONSULTAS, '/hu05', ('HU05', contar))
+    hilos = [threading.Thread(target=servidor_notas.responder, args=(estado, '/hu05')) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(llamadas) == 1
+    assert estado['datos']['candados'] == {}
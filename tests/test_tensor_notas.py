@@ -0,0 +1,36 @@
+"""Pruebas del modo tensor frente a la ejecución en memoria"""
+
+import os
+
+import pytest
+
+import ejecutar_todo
+import politica_notas
+from conftest import crear_notas
+from politica_notas import normalizar_politica
+
+POLITICAS = {
+    'simple': None,
+    'ponderada': {'nombre': 'ponderada', 'pesos': {'nota1': 0.2, 'nota2': 0.3, 'nota3': 0.5}},
+    'periodos': {'nombre': 'periodos', 'pesos': {'nota1': 0.2, 'nota2': 0.3, 'nota3': 0.5},
+                 'pesos_periodos': [0.2, 0.25, 0.25, 0.3]}
+}
+
+
+@pytest.mark.parametrize('nombre', POLITICAS)
+def test_tensor_igual_a_memoria(nombre, tmp_path, monkeypatch):
+    config = POLITICAS[nombre]
+    politica = normalizar_politica(config) if config else politica_notas.politica_simple()
+    monkeypatch.setitem(politica_notas._ESTADO, 'politica', politica)
+    ruta = str(tmp_path / 'notas.csv')
+    crear_notas(estudiantes=5000, asignaturas=('Algoritmos', 'Bases de Datos', 'Redes'),
+                semilla=7).to_csv(ruta, index=False, float_format="%.2f")
+
+    ejecutar_todo.ejecutar(ruta, str(tmp_path / 'memoria'))
+    ejecutar_todo.ejecutar(ruta, str(tmp_path / 'tensor'), tensor=True)
+
+    archivos = sorted(os.listdir(tmp_path / 'memoria'))
+    assert archivos == sorted(os.listdir(tmp_path / 'tensor'))
+    for archivo in archivos:
+        with open(tmp_path / 'memoria' / archivo, 'rb') as memoria, open(tmp_path / 'tensor' / archivo, 'rb') as tensor:
+            assert memoria.read() == tensor.read(), archivo